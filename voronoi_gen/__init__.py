@@ -0,0 +1,47 @@
+# Voronoi world generation
+# Importing the package does no work, every name below is only imported the first time it's used
+# so that pulling in the config or the seed tree doesn't drag scipy and pillow along with it
+
+# Public name -> module that holds it
+_exports = {
+    "Main": "main",
+    "gen_seed": "main",
+    "get_font": "main",
+    "VoronoiWrapper": "voronoi",
+    "VoronoiRegion": "voronoi",
+    "WorldConfig": "config",
+    "PlateSpec": "config",
+    "SeedTree": "seeds",
+    "Shape": "shapegen",
+    "PlateMembership": "plates",
+    "RockLayerStack": "rock",
+    "Progress": "progress",
+    "generate_mesh": "tiling",
+    "ShardPlan": "tiling",
+    "StencilRunner": "parallel",
+    "World": "world",
+    "SharedWorld": "world",
+    "TileRenderer": "tiles",
+    "TileCache": "tiles",
+    "Heightmap": "heightmap",
+    "StageProfiler": "profiling",
+    "rockDatabase": "rock",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError("module " + repr(__name__) + " has no attribute " + repr(name))
+
+    from importlib import import_module
+    value = getattr(import_module("." + _exports[name], __name__), name)
+
+    # Caching it on the package so we only go through here once
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
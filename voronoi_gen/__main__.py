@@ -0,0 +1,96 @@
+# Entry point, run with python -m voronoi_gen
+import argparse
+import os
+
+from .main import Main, gen_seed
+from .config import WorldConfig
+from .progress import Progress, print_sink
+from .profiling import StageProfiler
+from .world import World
+from .export import export
+from .heightmap import Heightmap
+from .render import ImageWriter, image_formats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="voronoi_gen", description="Generate a voronoi world and draw it to output/")
+    parser.add_argument("--seed", type=int, default=None, help="world seed, random when not given (good seeds: 12345)")
+    parser.add_argument("--width", type=int, default=6800)
+    parser.add_argument("--height", type=int, default=4200)
+    parser.add_argument("--polycount", type=int, default=5000)
+    parser.add_argument("--relaxation", type=int, default=5)
+    parser.add_argument("--shards", type=int, nargs=2, default=(1, 1), metavar=("X", "Y"), help="generate the mesh in an X by Y grid of shards")
+    parser.add_argument("--workers", type=int, default=None, help="processes used by sharded and parallel stages, one per core by default")
+    parser.add_argument("--display", action="store_true", help="show the matplotlib debug display after generating")
+    parser.add_argument("--profile", default=None, metavar="PATH", help="write a per-stage profile to PATH (json) and PATH.speedscope.json")
+    parser.add_argument("--render-scale", type=float, default=1, help="pixels per world unit of the drawn maps, e.g. 0.125 for previews")
+    parser.add_argument("--bbox", type=float, nargs=4, default=None, metavar=("X0", "Y0", "X1", "Y1"), help="only draw this part of the world")
+    parser.add_argument("--image-format", choices=sorted(image_formats), default="png", help="format of the drawn maps, npy and tiff skip compression")
+    parser.add_argument("--compress-level", type=int, default=6, choices=range(0, 10), metavar="0-9", help="png compression, lower is faster and larger")
+    parser.add_argument("--export", action="append", default=[], metavar="PATH", help="also export the world as vectors, .svg or .geojson (repeatable)")
+    parser.add_argument("--save-world", default=None, metavar="DIR", help="also save the world arrays to DIR, for python -m voronoi_gen.server")
+    parser.add_argument("--heightmap", action="append", default=[], metavar="PATH", help="also write a smooth heightmap, .npy (float32) or .png (16-bit) (repeatable)")
+    parser.add_argument("--heightmap-size", type=int, nargs=2, default=None, metavar=("W", "H"), help="heightmap size in pixels, the world size by default")
+    parser.add_argument("--heightmap-tiles", action="store_true", help="write png heightmaps as a directory of 16-bit tiles")
+    parser.add_argument("--quiet", action="store_true", help="don't report progress while generating")
+    args = parser.parse_args(argv)
+
+    # Setting a seed
+    SEED = args.seed if args.seed is not None else gen_seed()
+    progress = Progress() if args.quiet else Progress(print_sink)
+    progress.event("world", "Generating with seed", seed=SEED)
+    profiler = StageProfiler(enabled=args.profile is not None)
+    m = Main(args.width, args.height, args.polycount, args.relaxation, SEED, WorldConfig(shards=tuple(args.shards)), progress=progress, profiler=profiler, workers=args.workers)
+
+    # Generating landscapes
+    m.gen_plates()
+    m.run()
+
+    if args.display:
+        m.v.display()
+
+    if args.save_world is not None:
+        World.from_wrapper(m.v).save(args.save_world)
+        progress.event("world", "Saved world", path=args.save_world)
+
+    for path in args.export:
+        count = export(m, path)
+        progress.event("world", "Exported world", path=path, features=count)
+
+    if args.heightmap:
+        heightmap = Heightmap(World.from_wrapper(m.v))
+        width, height = args.heightmap_size if args.heightmap_size is not None else (m.width, m.height)
+        for path in args.heightmap:
+            written = heightmap.write(path, width, height, tiles=args.heightmap_tiles, compress_level=args.compress_level)
+            progress.event("world", "Wrote heightmap", path=written, width=width, height=height)
+
+    # Every draw saves into output/
+    os.makedirs("output", exist_ok=True)
+    # Images are encoded and written on a pool of threads while the next ones are drawn
+    with ImageWriter(args.image_format, args.compress_level) as writer:
+        m.writer = writer
+        render = {"scale": args.render_scale, "bbox": args.bbox}
+        m.draw(**render)
+        m.border_draw(**render)
+        m.draw_geology(**render)
+        m.draw_region_overlap(**render)
+        m.draw_elevation(1, **render)
+        m.draw_index(**render)
+        m.draw_ocean_set(**render)
+        m.draw_edge_set(**render)
+        m.draw_boundaries(**render)
+        m.draw_temperature_set(**render)
+        m.draw_mountains_set(**render)
+        m.draw_humidity(**render)
+        m.draw_oceanic_wind(**render)
+        m.draw_winds(**render)
+    m.writer = None
+
+    if args.profile is not None:
+        profiler.to_json(args.profile)
+        profiler.to_speedscope(args.profile + ".speedscope.json")
+        progress.event("world", "Wrote profile", path=args.profile)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,231 @@
+# Scaling benchmark
+# Generates worlds of increasing cell counts at a constant density with fixed seeds, records the time and memory of
+# every generation stage and renderer through the stage profiler, and fits how each of them scales with the cell count
+# Run with python -m voronoi_gen.benchmark, results are saved as json so runs of two checkouts can be compared
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import tempfile
+
+import numpy as np
+
+from .main import Main
+from .profiling import StageProfiler
+
+# Sizes the suite runs at by default
+default_sizes = (1000, 10000, 100000, 1000000)
+default_seeds = (12345,)
+
+# The default world has 5000 cells on a 6800x4200 map, every size keeps that density
+base_cells = 5000
+base_width = 6800
+base_height = 4200
+
+# Rendering a 1M cell world at this density would be a ~100k pixel wide image, so renderers stop at this size
+default_render_limit = 100000
+
+# A stage is flagged once its fitted exponent goes past linear by more than this
+superlinear_tolerance = 0.15
+
+# Times below this are mostly timer noise and are left out of the fits
+minimum_fit_time = 0.001
+
+
+# Width and height of a world with the given cell count at the default density
+def world_dimensions(cells):
+    factor = math.sqrt(cells / base_cells)
+    return int(round(base_width * factor)), int(round(base_height * factor))
+
+
+# Generates (and optionally renders) one world, returning the profilers per-stage totals
+def run_world(cells, seed, render=True, memory=False, relaxation_count=5):
+    width, height = world_dimensions(cells)
+    profiler = StageProfiler(memory=memory)
+
+    m = Main(width, height, cells, relaxation_count, seed, profiler=profiler)
+    m.gen_plates()
+    m.run()
+
+    if render:
+        # Every renderer saves into output/, keeping those images out of the way
+        previous = os.getcwd()
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)
+            os.makedirs("output")
+            try:
+                m.draw()
+                m.border_draw()
+                m.draw_geology()
+                m.draw_region_overlap()
+                m.draw_elevation(1)
+                m.draw_index()
+                m.draw_ocean_set()
+                m.draw_edge_set()
+                m.draw_temperature_set()
+                m.draw_mountains_set()
+                m.draw_humidity()
+                m.draw_oceanic_wind()
+                m.draw_winds()
+            finally:
+                os.chdir(previous)
+
+    return profiler.totals()
+
+
+# Fits time = c * cells^k on a log-log scale, returning k (None without two usable sizes)
+def fit_exponent(sizes, times):
+    points = [(math.log(size), math.log(time)) for size, time in zip(sizes, times) if time is not None and time >= minimum_fit_time]
+    if len(points) < 2:
+        return None
+
+    x = np.array([point[0] for point in points])
+    y = np.array([point[1] for point in points])
+    slope, intercept = np.polyfit(x, y, 1)
+    return float(slope)
+
+
+def git_revision():
+    try:
+        output = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+# Runs the full suite, every stage keeps the fastest repeat of every seed, summed over the seeds
+def run_suite(sizes=default_sizes, seeds=default_seeds, repeat=1, render_limit=default_render_limit, memory=False, label=None, progress=None):
+    stages = {}
+    for cells in sizes:
+        for seed in seeds:
+            best = {}
+            for x in range(0, repeat):
+                totals = run_world(cells, seed, render=cells <= render_limit, memory=memory)
+                for stage, total in totals.items():
+                    if stage not in best or total["wall"] < best[stage]["wall"]:
+                        best[stage] = total
+
+            for stage, total in best.items():
+                entry = stages.setdefault(stage, {}).setdefault(str(cells), {"wall": 0.0, "cpu": 0.0, "peak_memory": None})
+                entry["wall"] = entry["wall"] + total["wall"]
+                entry["cpu"] = entry["cpu"] + total["cpu"]
+                if total["peak_memory"] is not None:
+                    entry["peak_memory"] = max(entry["peak_memory"] or 0, total["peak_memory"])
+
+            if progress is not None:
+                progress("cells=" + str(cells) + " seed=" + str(seed) + " run=" + str(round(best["run"]["wall"], 3)) + "s")
+
+    # Fitting every stage over the sizes it ran at
+    exponents = {}
+    for stage, results in stages.items():
+        stage_sizes = sorted(int(cells) for cells in results)
+        exponents[stage] = fit_exponent(stage_sizes, [results[str(cells)]["wall"] for cells in stage_sizes])
+
+    return {
+        "label": label if label is not None else git_revision(),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "sizes": list(sizes),
+        "seeds": list(seeds),
+        "repeat": repeat,
+        "stages": stages,
+        "exponents": exponents,
+        "superlinear": superlinear_stages(exponents),
+    }
+
+
+def superlinear_stages(exponents, tolerance=superlinear_tolerance):
+    return sorted(stage for stage, exponent in exponents.items() if exponent is not None and exponent > 1 + tolerance)
+
+
+def format_time(value):
+    if value is None:
+        return "-"
+    if value < 1:
+        return str(round(value * 1000, 1)) + "ms"
+    return str(round(value, 2)) + "s"
+
+
+def format_exponent(value):
+    return "-" if value is None else "%.2f" % value
+
+
+def format_table(rows):
+    widths = [max(len(row[column]) for row in rows) for column in range(0, len(rows[0]))]
+    lines = []
+    for index, row in enumerate(rows):
+        lines.append("  ".join(cell.ljust(widths[column]) if column == 0 else cell.rjust(widths[column]) for column, cell in enumerate(row)))
+        if index == 0:
+            lines.append("  ".join("-" * width for width in widths))
+    return "\n".join(lines)
+
+
+# Table of a single result, wall time of every stage per size with its fitted exponent
+def result_table(result):
+    sizes = result["sizes"]
+    rows = [["stage"] + [str(cells) for cells in sizes] + ["exponent", ""]]
+    for stage in sorted(result["stages"]):
+        results = result["stages"][stage]
+        exponent = result["exponents"].get(stage)
+        flag = "superlinear" if stage in result["superlinear"] else ""
+        rows.append([stage] + [format_time(results[str(cells)]["wall"]) if str(cells) in results else "-" for cells in sizes] + [format_exponent(exponent), flag])
+    return format_table(rows)
+
+
+# Table comparing two results (two checkouts, or two backends), ratios below 1 mean the second is faster
+def compare_table(before, after):
+    sizes = [cells for cells in before["sizes"] if cells in after["sizes"]]
+    header = ["stage"]
+    for cells in sizes:
+        header = header + [str(cells) + " a", str(cells) + " b", "b/a"]
+    rows = [header + ["exp a", "exp b"]]
+
+    for stage in sorted(set(before["stages"]) | set(after["stages"])):
+        row = [stage]
+        for cells in sizes:
+            a = before["stages"].get(stage, {}).get(str(cells), {}).get("wall")
+            b = after["stages"].get(stage, {}).get(str(cells), {}).get("wall")
+            ratio = "-" if a is None or b is None or a <= 0 else "%.2f" % (b / a)
+            row = row + [format_time(a), format_time(b), ratio]
+        rows.append(row + [format_exponent(before["exponents"].get(stage)), format_exponent(after["exponents"].get(stage))])
+
+    title = "a: " + str(before["label"]) + ", b: " + str(after["label"])
+    return title + "\n" + format_table(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="voronoi_gen.benchmark", description="Scaling benchmark of every generation stage and renderer")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(default_sizes), help="cell counts to run at")
+    parser.add_argument("--seeds", type=int, nargs="+", default=list(default_seeds))
+    parser.add_argument("--repeat", type=int, default=1, help="repeats per world, the fastest is kept")
+    parser.add_argument("--render-limit", type=int, default=default_render_limit, help="largest cell count the renderers run at")
+    parser.add_argument("--memory", action="store_true", help="trace peak memory (slows python heavy stages down)")
+    parser.add_argument("--label", default=None, help="name of this run in comparisons, defaults to the git revision")
+    parser.add_argument("--output", default=None, help="save the result json here")
+    parser.add_argument("--compare", nargs=2, metavar=("A", "B"), default=None, help="compare two saved results instead of running")
+    args = parser.parse_args(argv)
+
+    if args.compare is not None:
+        with open(args.compare[0]) as file:
+            before = json.load(file)
+        with open(args.compare[1]) as file:
+            after = json.load(file)
+        print(compare_table(before, after))
+        return
+
+    result = run_suite(args.sizes, args.seeds, args.repeat, args.render_limit, args.memory, args.label, progress=print)
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(result, file, indent=2)
+
+    print(result_table(result))
+    if result["superlinear"]:
+        print("Superlinear stages: " + ", ".join(result["superlinear"]))
+
+
+if __name__ == "__main__":
+    main()
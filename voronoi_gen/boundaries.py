@@ -0,0 +1,147 @@
+# Boundary polylines of a generated world
+# Every Voronoi ridge separates two regions. The ridges whose two regions differ in some label (land or water, ocean,
+# plate) are the boundaries between them, and chaining those ridges end to end turns them into ordered polylines:
+# coastlines, ocean borders and plate boundaries.
+#
+# The ridges are recovered from the region polygons themselves: two regions share a ridge where both polygons have an
+# edge between the same two vertices. That works for sharded meshes (tiling.py) just as well as for a single Voronoi.
+import numpy as np
+
+# Vertices closer than this are the same vertex
+vertex_tolerance = 1e-6
+
+
+# The ridges between regions
+# cells (m, 2) holds the two regions of every ridge, vertices (m, 2) its two ends as indexes into points
+class RidgeSet:
+
+    def __init__(self, cells, vertices, points):
+        self.cells = cells
+        self.vertices = vertices
+        self.points = points
+
+    def __len__(self):
+        return len(self.cells)
+
+
+# Every ridge shared by two region polygons, from the flat vertex arrays
+def mesh_ridges(offsets, coords):
+    offsets = np.asarray(offsets, dtype=np.int64)
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    counts = np.diff(offsets)
+    owner = np.repeat(np.arange(len(counts)), counts)
+
+    # Numbering the distinct vertices, polygons of neighboring regions share the same coordinates
+    keys = np.round(coords / vertex_tolerance).astype(np.int64)
+    keys, first, vertex = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    vertex = vertex.ravel()
+    points = coords[first]
+
+    # Every polygon edge, from each vertex to the next one around its region (the last wraps back to the first)
+    following = np.arange(1, len(coords) + 1)
+    closing = counts > 0
+    following[offsets[1:][closing] - 1] = offsets[:-1][closing]
+    a = vertex[:len(coords)]
+    b = vertex[following] if len(coords) else a
+    edge = a != b
+
+    low = np.minimum(a, b)[edge]
+    high = np.maximum(a, b)[edge]
+    owner = owner[edge]
+
+    # Edges that two different regions both have are their ridge
+    order = np.lexsort((owner, high, low))
+    low, high, owner = low[order], high[order], owner[order]
+    pair = np.flatnonzero((low[1:] == low[:-1]) & (high[1:] == high[:-1]) & (owner[1:] != owner[:-1]))
+
+    cells = np.column_stack((owner[pair], owner[pair + 1]))
+    vertices = np.column_stack((low[pair], high[pair]))
+    return RidgeSet(cells, vertices, points)
+
+
+# Mask of the ridges whose two regions differ in labels
+# labels is indexed by region, rows of a 2d array (e.g. plate membership words) have to match as a whole
+def differing(ridges, labels):
+    labels = np.asarray(labels)
+    first = labels[ridges.cells[:, 0]]
+    second = labels[ridges.cells[:, 1]]
+    if labels.ndim > 1:
+        return (first != second).any(axis=tuple(range(1, labels.ndim)))
+    return first != second
+
+
+# Chains the selected ridges end to end into polylines, returned as (n, 2) arrays of points
+# Lines run between junctions (or loose ends), loops come back around to their first point
+def chain(ridges, mask):
+    segments = ridges.vertices[np.asarray(mask, dtype=bool)]
+    segment_count = len(segments)
+    if segment_count == 0:
+        return []
+
+    # The segments touching every vertex
+    ends = segments.ravel()
+    order = np.argsort(ends, kind="stable")
+    touching = (order // 2).tolist()
+    starts = np.searchsorted(ends[order], np.arange(len(ridges.points) + 1)).tolist()
+    degree = np.bincount(ends, minlength=len(ridges.points)).tolist()
+    segments = segments.tolist()
+    used = [False] * segment_count
+
+    def walk(node, segment):
+        line = [node]
+        while True:
+            used[segment] = True
+            a, b = segments[segment]
+            node = b if a == node else a
+            line.append(node)
+            if degree[node] != 2:
+                return line
+            following = [other for other in touching[starts[node]:starts[node + 1]] if not used[other]]
+            if not following:
+                return line
+            segment = following[0]
+
+    lines = []
+
+    # Open lines first, walked from every junction or loose end
+    for node in range(0, len(degree)):
+        if degree[node] == 0 or degree[node] == 2:
+            continue
+        for segment in touching[starts[node]:starts[node + 1]]:
+            if not used[segment]:
+                lines.append(walk(node, segment))
+
+    # Whatever is left are closed loops
+    for segment in range(0, segment_count):
+        if not used[segment]:
+            lines.append(walk(segments[segment][0], segment))
+
+    return [ridges.points[line] for line in lines]
+
+
+# The boundaries of a VoronoiWrapper, the ridges are found once and every kind of boundary reuses them
+class Boundaries:
+
+    def __init__(self, wrapper):
+        self.wrapper = wrapper
+        self.ridges = mesh_ridges(wrapper.vertex_offsets, wrapper.vertex_coords)
+
+    # Mask of the ridges between regions of different labels
+    def between(self, labels):
+        return differing(self.ridges, labels)
+
+    def polylines(self, labels):
+        return chain(self.ridges, self.between(labels))
+
+    # Between land and water
+    def coastlines(self):
+        return self.polylines(self.wrapper.land_mask())
+
+    # Between different oceans, and between oceans and land
+    def ocean_borders(self):
+        regions = self.wrapper.voronoi
+        return self.polylines(np.fromiter((region.ocean_index for region in regions), dtype=np.int64, count=len(regions)))
+
+    # Between regions that aren't on the same set of plates
+    def plate_boundaries(self):
+        return self.polylines(self.wrapper.plates.words)
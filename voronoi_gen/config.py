@@ -0,0 +1,155 @@
+# File that holds the configuration of a world
+# A WorldConfig is frozen and hashable, so two differently configured worlds can live in one process and the
+# config itself can be used as a cache key for stage outputs
+from dataclasses import dataclass, asdict, replace
+import hashlib
+import json
+
+
+# Parameters for one group of randomly generated tectonic plates
+@dataclass(frozen=True)
+class PlateSpec:
+    count: int
+    scale: float
+    volatility: float
+    eschew: tuple
+    subdivisions: int
+    final_scale_range: tuple
+    tectonic: int
+
+    # Land plates raise land, water plates carve water back out of it
+    land: bool = True
+
+
+# The default set of plates, large continents, smaller islands, non-tectonic filler and a few water plates
+default_plates = (
+    PlateSpec(10, 3200, 0.8, (5, 10), 5, (1, 5), 1),
+    PlateSpec(6, 600, 0.8, (5, 10), 5, (1, 5), 1),
+    PlateSpec(6, 700, 1.8, (10, 20), 5, (2, 10), 0),
+    PlateSpec(3, 1000, 0.5, (25, 45), 5, (2, 10), 1, land=False),
+)
+
+
+@dataclass(frozen=True)
+class WorldConfig:
+
+    # Tectonic plates to generate, in order
+    plates: tuple = default_plates
+
+    # Grid of shards the mesh is generated in (tiling.py), (1, 1) generates one mesh over the whole map
+    shards: tuple = (1, 1)
+
+    # Halo around every shard in mean cell spacings, 0 picks a few more than the relaxation passes
+    shard_halo: float = 0
+
+    # Variables controlling the land generation passes
+    weathering_count: int = 3
+    height_noise: int = 5
+    erosion_count: int = 2
+    erode_noise: int = 5
+    erode_strength: float = 0.5
+
+    # Variables controlling oceanic generation
+    ocean_reduction_count: int = 50
+    ocean_size_threshold: int = 1
+    ocean_merge_threshold: int = 15
+
+    # Percent value threshold of land neighbors to water tiles to be considered inland sea
+    ocean_percentage_threshold: float = 0.35
+
+    # Variables for controlling elevation generation
+    water_height_limit: int = 15
+
+    # This value controls how powerful the tectonic plate adjustment is
+    # A lower value results in a less powerful heights from tectonic plate collision
+    tectonic_elevation_multiplier: float = 2.5
+    immune_threshold: int = 85
+
+    # Variables controlling mountain ranges
+    mountain_range_count_min: int = 2
+    mountain_range_count_max: int = 6
+    mountain_height_noise: int = 5
+    mountain_range_length_dimension: tuple = (3, 17)
+
+    # Mountain growth variables
+    mountain_offset_angle: int = 20
+    mountain_offset_adjustment_angle: int = 45
+    mountain_strength_decay: float = 0.05
+    mountain_strength_limit: float = 0.1
+    mountain_failure_index: int = 5
+    max_mountain_neighbor: int = 2
+
+    # Value that controls the elevation control of our mountains
+    # Lower value makes mountains not as important
+    mountain_adjustment_strength: float = 0.4
+
+    # Temperature noise, higher number = higher variance on temperature
+    temp_noise: int = 1
+
+    # Percentage based value
+    temp_start_noise: float = 0.05
+
+    # Number of times to iteratively average out the oceanic temperatures
+    oceanic_average_count: int = 10
+
+    # Cycle limits
+    temp_lower_cycle_limit: float = 0.5
+    temp_upper_cycle_limit: float = 1.5
+
+    temp_lower_amplitude: float = 0.6
+    temp_upper_amplitude: float = 1.4
+
+    # This is the temperature base level
+    # Note that we evaluate on a 100-based scale, so this number can, at most, be 100
+    # A lower number means the average temperature of the world is lower, vice versa applies
+    # Range is 0 - 100, lower = cooler planet, higher = hotter
+    temp_base_level: int = 50
+
+    # Modifier that is used to control amplitude
+    # Higher value means a smaller amplitude
+    temp_height_division_factor: int = 16
+
+    # Trending factor that lets us control the temperature of the oceans
+    # Value == 1 is no trend
+    # Greater than 1 is a downward trend
+    # Below 1 is an upward trend
+    ocean_temp_downward_trend: float = 1.1
+
+    # Humidity options
+    humidity_threshold: int = 2
+
+    # Source threshold, used during random number generation
+    # This is an absolute value !!! Check before you change (relative to the random number gen)
+    humidity_source_threshold: int = 15000
+
+    # Fraction defining chance to be a humidity source
+    humidity_source_chance: tuple = (2, 10)
+
+    # Ocean wind variables
+    # Variance in value, in degrees
+    ocean_wind_variance: int = 25
+    ocean_wind_chance: tuple = (1, 10)
+
+    # Degree of tolerance for selecting adjacent wind to blow into
+    wind_range: int = 35
+    wind_loss_strength: int = 15
+    wind_strength_limit: int = 10
+    wind_gen_count: int = 100
+
+    # Factor that the difference between regions has on the new wind strength
+    # It is a numeric percentage
+    wind_difference_factor: float = 1.4
+
+    # Copy of this config with some values changed, e.g. config.but(erosion_count=4)
+    def but(self, **changes):
+        return replace(self, **changes)
+
+    # Stable digest of every value, unlike hash() it is the same across processes and runs
+    def digest(self):
+        encoded = json.dumps(asdict(self), sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    # Key for caching the output of a world generated from this config
+    def cache_key(self, width, height, polycount, relaxation_count, seed):
+        encoded = json.dumps([self.digest(), width, height, polycount, relaxation_count, seed]).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
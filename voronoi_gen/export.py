@@ -0,0 +1,199 @@
+# Vector export of a generated world
+# Cells, oceans, mountain ranges, winds and boundaries are streamed as features out of the region geometry and written one at a
+# time, so nothing but the feature being written is ever held in memory and a million cell world exports as easily as
+# a small one. Features are written as GeoJSON or SVG, picked by the file extension:
+#
+#   export(m, "output/world.geojson")
+#   export(m, "output/world.svg", ["cells", "winds"])
+#
+# Coordinates stay in world units with y growing downward, like the images.
+import json
+import math
+import os
+
+import numpy as np
+
+from .layers import biome_colors
+
+# Decimals kept for every coordinate
+precision = 2
+
+
+# A closed ring of vertices, the way GeoJSON wants polygons
+def ring(vertices):
+    points = [[round(float(x), precision), round(float(y), precision)] for x, y in vertices]
+    if points:
+        points.append(points[0])
+    return points
+
+
+def hex_color(color):
+    return "#%02x%02x%02x" % tuple(int(value) for value in color[:3])
+
+
+# Every region as a polygon, with every column of region_columns as its properties
+def cell_features(m):
+    v = m.v
+    columns = v.region_columns()
+    names = list(columns)
+    values = [columns[name].tolist() for name in names]
+    colors = biome_colors[columns["biome"]].tolist()
+    offsets = v.vertex_offsets.tolist()
+
+    for index in range(0, len(offsets) - 1):
+        vertices = v.vertex_coords[offsets[index]:offsets[index + 1]].tolist()
+        if len(vertices) < 3:
+            continue
+        properties = {"index": index}
+        for name, column in zip(names, values):
+            properties[name] = column[index]
+        yield "cells", ("Polygon", [ring(vertices)]), properties, {"fill": hex_color(colors[index])}
+
+
+# Every ocean as the polygons of its regions
+def ocean_features(m):
+    v = m.v
+    for ocean_index in v.ocean_set:
+        ocean = v.ocean_set[ocean_index]
+        polygons = [[ring(region.vertex_list_value)] for region in ocean.region_set if len(region.vertex_list_value) >= 3]
+        if not polygons:
+            continue
+        properties = {
+            "ocean_index": ocean.ocean_index,
+            "regions": len(ocean.region_set),
+            "land_neighbor_count": ocean.land_neighbor_count,
+            "inland_sea": bool(ocean.inland_sea),
+            "fresh_water": bool(ocean.fresh_water),
+        }
+        yield "oceans", ("MultiPolygon", polygons), properties, {"fill": hex_color(ocean.color)}
+
+
+# Every mountain range as the polygons of its mountains
+def mountain_features(m):
+    v = m.v
+    for range_index in v.mountain_set:
+        mountain_range = v.mountain_set[range_index]
+        mountains = list(mountain_range.mountains.values())
+        polygons = [[ring(mountain.region.vertex_list_value)] for mountain in mountains if len(mountain.region.vertex_list_value) >= 3]
+        if not polygons:
+            continue
+        properties = {
+            "range_index": mountain_range.range_index,
+            "growth_angle": mountain_range.base_growth_angle,
+            "mountains": len(mountains),
+            "regions": [mountain.region.index for mountain in mountains],
+        }
+        yield "mountains", ("MultiPolygon", polygons), properties, {"fill": hex_color(mountain_range.color)}
+
+
+# Every wind as an arrow through its region along its direction, 20 units either side like the wind draws
+def wind_features(m):
+    v = m.v
+    for wind_index in v.winds:
+        wind = v.winds[wind_index]
+        rad_degree = wind.direction / 180 * math.pi
+        center_x, center_y = wind.region.center
+        line = [[round(center_x - 20 * math.cos(rad_degree), precision), round(center_y + 20 * math.sin(rad_degree), precision)],
+                [round(center_x + 20 * math.cos(rad_degree), precision), round(center_y - 20 * math.sin(rad_degree), precision)]]
+        properties = {"region": wind.region.index, "direction": float(wind.direction), "strength": float(wind.strength)}
+        yield "winds", ("LineString", line), properties, {"stroke": "red"}
+
+
+# Every boundary polyline of a kind (boundaries.py), loops come out closed
+def boundary_features(kind, stroke):
+    def source(m):
+        for index, line in enumerate(getattr(m.v.boundaries(), kind)()):
+            coordinates = np.round(line, precision).tolist()
+            yield kind, ("LineString", coordinates), {"index": index, "closed": bool((line[0] == line[-1]).all())}, {"stroke": stroke}
+    return source
+
+
+feature_sources = {
+    "cells": cell_features,
+    "oceans": ocean_features,
+    "mountains": mountain_features,
+    "winds": wind_features,
+    "coastlines": boundary_features("coastlines", "black"),
+    "ocean_borders": boundary_features("ocean_borders", "blue"),
+    "plate_boundaries": boundary_features("plate_boundaries", "red"),
+}
+
+# Kinds drawn as lines rather than filled shapes
+line_kinds = {"winds": 4, "coastlines": 2, "ocean_borders": 2, "plate_boundaries": 2}
+
+
+# Every feature of the given kinds, kind after kind
+# A feature is (kind, geometry, properties, style), the geometry is GeoJSON style (type, coordinates) and the style
+# holds the SVG fill or stroke of the feature
+def features(m, kinds=None):
+    for kind in (kinds if kinds is not None else feature_sources):
+        if kind not in feature_sources:
+            raise KeyError("Unknown feature kind " + str(kind) + ", expected one of " + ", ".join(sorted(feature_sources)))
+        yield from feature_sources[kind](m)
+
+
+# numpy scalars turn up in the properties, json only knows python numbers
+def json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError("Can't export " + repr(value))
+
+
+def write_geojson(file, features):
+    file.write('{"type": "FeatureCollection", "features": [\n')
+    count = 0
+    for kind, (geometry_type, coordinates), properties, style in features:
+        if count:
+            file.write(",\n")
+        properties = dict(properties, kind=kind)
+        file.write(json.dumps({"type": "Feature", "geometry": {"type": geometry_type, "coordinates": coordinates}, "properties": properties},
+                              default=json_default, separators=(",", ":")))
+        count += 1
+    file.write("\n]}\n")
+    return count
+
+
+def svg_path(geometry_type, coordinates):
+    if geometry_type == "LineString":
+        return "M" + " L".join(str(x) + " " + str(y) for x, y in coordinates)
+    polygons = [coordinates] if geometry_type == "Polygon" else coordinates
+    return " ".join("M" + " L".join(str(x) + " " + str(y) for x, y in points[:-1]) + " Z" for polygon in polygons for points in polygon)
+
+
+# Every kind of feature goes into its own group, in the order they come
+def write_svg(file, features, width, height):
+    file.write('<svg xmlns="http://www.w3.org/2000/svg" width="' + str(width) + '" height="' + str(height) +
+               '" viewBox="0 0 ' + str(width) + " " + str(height) + '">\n')
+    count = 0
+    group = None
+    for kind, (geometry_type, coordinates), properties, style in features:
+        if kind != group:
+            if group is not None:
+                file.write("</g>\n")
+            stroke = ' fill="none" stroke-width="' + str(line_kinds[kind]) + '"' if kind in line_kinds else ' stroke="none"'
+            file.write('<g id="' + kind + '"' + stroke + ">\n")
+            group = kind
+        attributes = "".join(" " + name + '="' + value + '"' for name, value in style.items())
+        file.write('<path d="' + svg_path(geometry_type, coordinates) + '"' + attributes + "/>\n")
+        count += 1
+    if group is not None:
+        file.write("</g>\n")
+    file.write("</svg>\n")
+    return count
+
+
+export_formats = {".geojson": "geojson", ".json": "geojson", ".svg": "svg"}
+
+
+# Exports the features of the given kinds (all of them by default), returning how many were written
+def export(m, path, kinds=None, format=None):
+    if format is None:
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in export_formats:
+            raise ValueError("Can't tell the export format of " + path + ", expected one of " + ", ".join(sorted(export_formats)))
+        format = export_formats[extension]
+
+    with open(path, "w") as file:
+        if format == "svg":
+            return write_svg(file, features(m, kinds), m.width, m.height)
+        return write_geojson(file, features(m, kinds))
@@ -0,0 +1,134 @@
+# Smooth heightmaps of a generated world
+# draw_elevation shades every region flat, which is no use as a heightmap. Here the elevation is interpolated linearly
+# over the Delaunay triangulation of the region centers instead: every pixel is the barycentric blend of the three
+# regions around it, and past the hull of the centers (the very corners of the map) it takes the nearest region.
+#
+# Every pixel finds its triangle through the triangulation and is evaluated on that triangles plane, in square chunks
+# at any resolution, so memory only ever holds a chunk at a time:
+#
+#   heightmap = Heightmap(World.from_wrapper(m.v))
+#   heightmap.write("output/heightmap.npy", 8192, 8192)
+#   heightmap.write("output/heightmap.png", 8192, 8192, tiles=True)
+#
+# .npy files hold float32 elevations, .png files 16-bit heights spread over the elevation range of the world, which is
+# saved next to them as .json.
+import json
+import os
+
+from PIL import Image
+import numpy as np
+from scipy.spatial import Delaunay, cKDTree
+
+default_chunk_size = 1024
+
+heightmap_formats = (".npy", ".png")
+
+
+class Heightmap:
+
+    def __init__(self, world, column="elevation"):
+        self.world = world
+        centers = np.asarray(world["centers"], dtype=np.float64)
+        self.values = np.asarray(world.columns[column], dtype=np.float64)
+        self.low = float(self.values.min())
+        self.high = float(self.values.max())
+        self.centers = centers
+        self.tree = None
+
+        self.triangulation = Delaunay(centers)
+
+        # Every triangle is a plane, height = a * x + b * y + c
+        # Barycentric weights are linear in the position, the transform gives the first two from the offset to the third corner
+        transform = self.triangulation.transform
+        values = self.values[self.triangulation.simplices]
+        rise = values[:, :2] - values[:, 2:]
+        self.a = rise[:, 0] * transform[:, 0, 0] + rise[:, 1] * transform[:, 1, 0]
+        self.b = rise[:, 0] * transform[:, 0, 1] + rise[:, 1] * transform[:, 1, 1]
+        self.c = values[:, 2] - self.a * transform[:, 2, 0] - self.b * transform[:, 2, 1]
+
+        # Degenerate triangles (centers clamped onto the same border line) have no plane, their pixels take the nearest region
+        self.flat = ~(np.isfinite(self.a) & np.isfinite(self.b) & np.isfinite(self.c))
+
+    # Heights of a chunk of an image width by height pixels over the whole world, as float32 rows
+    # The chunk covers pixels x0 to x1 and y0 to y1, the center of every pixel is sampled
+    def chunk(self, width, height, x0, y0, x1, y1):
+        scale_x = width / self.world.width
+        scale_y = height / self.world.height
+
+        # World position of every pixel
+        xs = ((np.arange(x0, x1) + 0.5) / scale_x)[None, :]
+        ys = ((np.arange(y0, y1) + 0.5) / scale_y)[:, None]
+
+        # Triangle under every pixel, -1 past the hull
+        # Pixels are looked up row by row, so every walk through the triangulation starts next to where the last one ended
+        positions = np.empty((y1 - y0, x1 - x0, 2), dtype=np.float64)
+        positions[:, :, 0] = xs
+        positions[:, :, 1] = ys
+        found = self.triangulation.find_simplex(positions.reshape(-1, 2)).reshape(y1 - y0, x1 - x0)
+
+        ids = np.maximum(found, 0)
+        heights = self.a[ids] * xs + self.b[ids] * ys + self.c[ids]
+
+        # Pixels past the hull or on a degenerate triangle take the nearest region
+        outside = (found < 0) | self.flat[ids]
+        if outside.any():
+            if self.tree is None:
+                self.tree = cKDTree(self.centers)
+            rows, columns = np.nonzero(outside)
+            positions = np.column_stack((xs[0, columns], ys[rows, 0]))
+            heights[rows, columns] = self.values[self.tree.query(positions)[1]]
+
+        return heights.astype(np.float32)
+
+    # Every chunk of an image width by height pixels, as (x0, y0, x1, y1)
+    def chunks(self, width, height, chunk_size=default_chunk_size):
+        for y0 in range(0, height, chunk_size):
+            for x0 in range(0, width, chunk_size):
+                yield x0, y0, min(width, x0 + chunk_size), min(height, y0 + chunk_size)
+
+    # Heights in 16-bit, low to high elevation spread over the whole range
+    def to_uint16(self, heights):
+        if self.high <= self.low:
+            return np.zeros(heights.shape, dtype=np.uint16)
+        return np.clip(np.round((heights - self.low) / (self.high - self.low) * 65535), 0, 65535).astype(np.uint16)
+
+    # Writes a heightmap width by height pixels, by its extension:
+    # .npy is a float32 array written chunk by chunk through a memory map
+    # .png is a 16-bit image, or with tiles a directory (the path without its extension) of one 16-bit png per chunk,
+    # named <column>_<row>.png. A single png is assembled whole, only tiles keep memory to a chunk.
+    # compress_level is the png compression, lower is faster and larger. Returns the path written
+    def write(self, path, width, height, chunk_size=default_chunk_size, tiles=False, compress_level=6):
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in heightmap_formats:
+            raise ValueError("Can't write a heightmap to " + path + ", expected one of " + ", ".join(heightmap_formats))
+        if width <= 0 or height <= 0:
+            raise ValueError("Heightmap size must be positive, got " + str(width) + "x" + str(height))
+
+        if extension == ".npy":
+            heights = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(height, width))
+            for x0, y0, x1, y1 in self.chunks(width, height, chunk_size):
+                heights[y0:y1, x0:x1] = self.chunk(width, height, x0, y0, x1, y1)
+            heights.flush()
+            del heights
+            return path
+
+        base = os.path.splitext(path)[0]
+        if tiles:
+            os.makedirs(base, exist_ok=True)
+            for x0, y0, x1, y1 in self.chunks(width, height, chunk_size):
+                name = str(x0 // chunk_size) + "_" + str(y0 // chunk_size) + ".png"
+                Image.fromarray(self.to_uint16(self.chunk(width, height, x0, y0, x1, y1))).save(os.path.join(base, name), compress_level=compress_level)
+            path = base
+        else:
+            image = np.empty((height, width), dtype=np.uint16)
+            for x0, y0, x1, y1 in self.chunks(width, height, chunk_size):
+                image[y0:y1, x0:x1] = self.to_uint16(self.chunk(width, height, x0, y0, x1, y1))
+            Image.fromarray(image).save(path, compress_level=compress_level)
+
+        # The elevation range the 16-bit heights cover
+        meta = {"width": width, "height": height, "low": self.low, "high": self.high}
+        if tiles:
+            meta["chunk_size"] = chunk_size
+        with open(base + ".json", "w") as file:
+            json.dump(meta, file, indent=2)
+        return path
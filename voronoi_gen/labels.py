@@ -0,0 +1,75 @@
+# Labels of the annotated draws
+# Drawing text is the slow part of the annotated draws, so every label string is rasterized once into a glyph mask
+# that is pasted wherever the same string shows up again. Labels that would overlap one already placed, or whose cell
+# is too small on screen to read them, are skipped altogether.
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+import numpy as np
+
+
+# Fonts are loaded the first time a draw asks for them, not when the module is imported
+@lru_cache(maxsize=None)
+def get_font(size):
+    try:
+        return ImageFont.truetype("arial.ttf", size)
+    except OSError:
+        # Arial isn't installed everywhere, falling back to pillows own font
+        return ImageFont.load_default(size)
+
+
+# The mask of a string in the font of a size, along with its offset from the position it is drawn at
+@lru_cache(maxsize=65536)
+def glyph(text, size):
+    font = get_font(size)
+    left, top, right, bottom = font.getbbox(text)
+    mask = Image.new("L", (max(1, right - left), max(1, bottom - top)), 0)
+    ImageDraw.Draw(mask).text((-left, -top), text, font=font, fill=255)
+    return mask, left, top
+
+
+# Places the labels of one image
+# min_cell is the smallest on-screen cell (in pixels) that still gets a label, overlapping labels are dropped unless
+# cull_overlaps is off, placed labels are tracked on a grid of grid pixel blocks
+class Labeler:
+
+    def __init__(self, im, min_cell=8, cull_overlaps=True, grid=4):
+        self.im = im
+        self.min_cell = min_cell
+        self.cull_overlaps = cull_overlaps
+        self.grid = grid
+
+        width, height = im.size
+        self.occupied = np.zeros(((height + grid - 1) // grid, (width + grid - 1) // grid), dtype=bool)
+        self.placed = 0
+        self.skipped = 0
+
+    # Draws a label at position like ImageDraw.text would, cell is the on-screen size of the labelled cell
+    # Returns whether the label was placed
+    def add(self, position, text, size, fill="white", cell=None):
+        if cell is not None and cell < self.min_cell:
+            self.skipped += 1
+            return False
+
+        mask, left, top = glyph(text, size)
+        x = int(round(position[0])) + left
+        y = int(round(position[1])) + top
+        width, height = mask.size
+
+        # Labels entirely off the image are never drawn
+        image_width, image_height = self.im.size
+        if x >= image_width or y >= image_height or x + width <= 0 or y + height <= 0:
+            self.skipped += 1
+            return False
+
+        if self.cull_overlaps:
+            gx0, gy0 = max(0, x // self.grid), max(0, y // self.grid)
+            gx1, gy1 = (x + width - 1) // self.grid + 1, (y + height - 1) // self.grid + 1
+            if self.occupied[gy0:gy1, gx0:gx1].any():
+                self.skipped += 1
+                return False
+            self.occupied[gy0:gy1, gx0:gx1] = True
+
+        self.im.paste(fill, (x, y), mask)
+        self.placed += 1
+        return True
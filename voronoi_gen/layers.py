@@ -0,0 +1,82 @@
+# Color layers of a generated world
+# Every layer turns the columns of a World into one RGB color per region, along with the background drawn behind the
+# regions. They follow the Main.draw_* renders, minus the labels, so tiles and whole-map renders of a layer agree.
+from PIL import ImageColor
+import numpy as np
+
+from .biome import biomeDatabase
+from .rock import rockDatabase
+
+# Colors of every biome, indexed by biome index
+biome_colors = np.array([ImageColor.getrgb(entry.biome_color) for entry in biomeDatabase.db], dtype=np.uint8)
+
+
+# Grey of a value on a 0 to 100 scale, the way the draw functions normalize elevation and temperature
+def grey(values):
+    shade = np.clip(np.round(np.asarray(values, dtype=np.float64) / 100 * 255), 0, 255).astype(np.uint8)
+    return np.repeat(shade[:, None], 3, axis=1)
+
+
+def biome_layer(world):
+    return biome_colors[world.columns["biome"]]
+
+
+def geology_layer(world):
+    return rockDatabase.colors[world.columns["rock"]]
+
+
+def elevation_layer(world):
+    return grey(world.columns["elevation"])
+
+
+# Elevation with the water left black
+def land_elevation_layer(world):
+    return grey(np.where(world.columns["land"], world.columns["elevation"], 0))
+
+
+def temperature_layer(world):
+    return grey(world.columns["temperature"])
+
+
+def humidity_layer(world):
+    return grey(world.columns["humidity"])
+
+
+def edge_layer(world):
+    return np.where(world.columns["edge"][:, None], np.array(ImageColor.getrgb("blue"), dtype=np.uint8), np.zeros(3, dtype=np.uint8)).astype(np.uint8)
+
+
+# Biomes with every wind region shaded by its strength
+def wind_layer(world):
+    colors = biome_layer(world).copy()
+    strength = world.columns["wind_strength"]
+    wind = strength >= 0
+    colors[wind] = grey(strength[wind])
+    return colors
+
+
+class Layer:
+
+    def __init__(self, name, colors, background):
+        self.name = name
+        self.colors = colors
+        self.background = ImageColor.getrgb(background)
+
+
+# Every layer by name
+layers = {layer.name: layer for layer in (
+    Layer("biome", biome_layer, "white"),
+    Layer("geology", geology_layer, "#6A6A6B"),
+    Layer("elevation", elevation_layer, "#6A6A6B"),
+    Layer("land_elevation", land_elevation_layer, "#6A6A6B"),
+    Layer("temperature", temperature_layer, "black"),
+    Layer("humidity", humidity_layer, "black"),
+    Layer("edge", edge_layer, "black"),
+    Layer("wind", wind_layer, "white"),
+)}
+
+
+def get_layer(name):
+    if name not in layers:
+        raise KeyError("Unknown layer " + str(name) + ", expected one of " + ", ".join(sorted(layers)))
+    return layers[name]
@@ -0,0 +1,757 @@
+# Base imports
+from PIL import Image, ImageColor, ImageDraw
+from concurrent.futures import ThreadPoolExecutor
+
+# Importing voronoi
+from .voronoi import VoronoiWrapper
+import random
+from .shapegen import Shape
+from .seeds import SeedTree
+from .config import WorldConfig
+from .progress import Progress
+from .profiling import StageProfiler, profiled
+from .tiling import generate_mesh
+from .tiles import RegionIndex
+from .render import RenderView, render_layers
+from .layers import layers, get_layer
+from .world import World
+from .labels import Labeler, get_font
+from .rock import rockDatabase
+import math
+import os
+import numpy as np
+
+debug = 0
+
+# Every generation variable lives within the WorldConfig (config.py)
+
+# Class that does all of the processing
+class Main:
+
+    def __init__(self, width, height, polycount, relaxation_count, SEED, config=None, progress=None, profiler=None, workers=None):
+        # Setting up local sizes
+        # Every generation variable comes from the config, the defaults are used when none is given
+        self.config = config if config is not None else WorldConfig()
+
+        self.width = width
+        self.height = height
+        self.polycount = polycount
+        self.relaxation_count = relaxation_count
+
+        # Every stage and every plate draws from its own stream within the worlds seed tree
+        self.seed = SEED
+        self.seeds = SeedTree(SEED)
+
+        # Every stage reports through the progress object, which is silent unless given a sink
+        self.progress = progress if progress is not None else Progress()
+
+        # Stages, draws and their counters are recorded by the profiler, which is disabled unless given one
+        self.profiler = profiler if profiler is not None else StageProfiler(enabled=False)
+
+        # Number of processes sharded stages may use, None for one per core
+        self.workers = workers
+
+        # Draws save straight away unless given an ImageWriter, which encodes them on a pool of threads
+        self.writer = None
+
+        # Labels are skipped on cells smaller than label_min_cell pixels on screen, and where they would overlap
+        # another label unless cull_labels is off
+        self.label_min_cell = 8
+        self.cull_labels = True
+
+        # Output spaces of the draws, by scale and bounding box (render_view)
+        self.render_views = {}
+        self.region_index = None
+
+        # Shape list
+        self.landShapeList = []
+        self.waterShapeList = []
+        self.fullShapeList = []
+
+    def gen_shapes_land(self, numShapes, scale, volatility, eschew, numberSubdivision, finalScaleRange, tectonic):
+        self.progress.event("plates", "Generating land tectonics", count=numShapes)
+
+        # Generating shapes
+        for x in range(0,numShapes):
+            # Setting the shapes index, the shape is generated from the stream of its index
+            shape_index = len(self.landShapeList) + len(self.waterShapeList)
+            self.progress.update("plates", x + 1, numShapes, shape_index=shape_index)
+
+            # Generating shapes
+            newShape = Shape(volatility, scale, eschew, numberSubdivision, finalScaleRange, (self.width, self.height), tectonic, self.seeds.generator("plate", shape_index))
+            newShape.shape_index = shape_index
+
+            self.landShapeList.append(newShape)
+
+        for shape in self.landShapeList:
+            if (debug == 1):
+                shape.draw()
+
+    def gen_shape_water(self, numShapes, scale, volatility, eschew, numberSubdivision, finalScaleRange, tectonic):
+        # Generating shapes
+        self.progress.event("plates", "Generating water tectonics", count=numShapes)
+
+        for x in range(0,numShapes):
+            # Setting the shapes index, the shape is generated from the stream of its index
+            shape_index = len(self.landShapeList) + len(self.waterShapeList)
+            self.progress.update("plates", x + 1, numShapes, shape_index=shape_index)
+
+            # Generating shapes
+            newShape = Shape(volatility, scale, eschew, numberSubdivision, finalScaleRange, (self.width, self.height), tectonic, self.seeds.generator("plate", shape_index))
+            newShape.shape_index = shape_index
+
+            self.waterShapeList.append(newShape)
+
+        for shape in self.waterShapeList:
+            if (debug == 1):
+                shape.draw()
+
+    # Function for generating every group of plates within the config
+    @profiled("plates")
+    def gen_plates(self):
+        for plate in self.config.plates:
+            if plate.land:
+                self.gen_shapes_land(plate.count, plate.scale, plate.volatility, plate.eschew, plate.subdivisions, plate.final_scale_range, plate.tectonic)
+            else:
+                self.gen_shape_water(plate.count, plate.scale, plate.volatility, plate.eschew, plate.subdivisions, plate.final_scale_range, plate.tectonic)
+
+    def gen_tectonic_geology(self):
+        # Generating the tectonic geology
+        rng = self.seeds.generator("geology")
+
+        for shape in self.landShapeList:
+            # Determining what type to make this, first checking if its a tectonic or not...
+            if (shape.tectonic):
+                # Okay its tectonic, lets set the geologic information here...
+                shape.base_rock = rockDatabase.getDefaultLandRock(rng)
+                self.progress.event("geology", "Assigned tectonic geologic information", shape_index=shape.shape_index, rock=rockDatabase.get_entry(shape.base_rock).rock_name)
+
+
+        # Same thing but for oceanic tectonic plates
+        for shape in self.waterShapeList:
+            # Determining what type to make this, first checking if its a tectonic or not...
+            if (shape.tectonic):
+                # Okay its tectonic, lets set the geologic information here...
+                shape.base_rock = rockDatabase.getDefaultOceanRock()
+                self.progress.event("geology", "Assigned tectonic geologic information", shape_index=shape.shape_index, rock=rockDatabase.get_entry(shape.base_rock).rock_name)
+
+    # Function for defining biome parameters
+    # This gives us advanced capabilities for determining how the biomes are generated
+    @profiled("run")
+    def run(self):
+
+        # Making the Voronoi Wrapper
+        # Sharded configs generate the mesh in pieces across processes and stitch it back together
+        with self.profiler.stage("voronoi"):
+            mesh = None
+            if tuple(self.config.shards) != (1, 1):
+                with self.profiler.stage("tiling"):
+                    mesh = generate_mesh(self.width, self.height, self.polycount, self.relaxation_count, self.seeds,
+                                         self.config.shards[0], self.config.shards[1], self.config.shard_halo, self.workers, self.progress)
+
+            self.v = VoronoiWrapper(self.width, self.height, self.polycount, self.relaxation_count, self.seeds, self.config, self.progress, self.profiler, mesh, self.workers)
+            self.render_views = {}
+            self.region_index = None
+
+        # If debug, drawing the voronoi
+        if (debug == 1):
+            self.v.display()
+
+        # Building final shape list because we are good
+        self.fullShapeList = self.landShapeList.copy()
+
+        # Moving over the other shapes
+        for shape in self.waterShapeList:
+            self.fullShapeList.append(shape)
+
+        # Now that we've built our Voronoi Wrapper, lets construct the world from the shapes
+        # This will require us to iterate on every vornoi point, calculate if its within any of the shapes. If it is
+        # then we set the land type to "land"
+        with self.profiler.stage("shape_land"):
+            self.v.gen_shape_land(self.landShapeList)
+        with self.profiler.stage("shape_water"):
+            self.v.gen_shape_water(self.waterShapeList)
+
+        # Experimental landscape weathering, reduces a lot of strange land bridges into water tiles
+        with self.profiler.stage("weathering"):
+            self.v.gen_experimental_weathering(self.config.weathering_count)
+
+        # Generating all of the tectonic plates geologic information
+        # Lets begin building all of the other information that we need to build our world
+        # First and foremost we are going to do calculations of rock type
+        # This is a very defining characteristic of our world and must be used appropriately
+
+        # The generation rules can be seen in the options
+        with self.profiler.stage("geology"):
+            self.gen_tectonic_geology()
+
+            # Some error handling
+            if (debug == 3):
+                self.print_shape_info()
+
+            self.v.genRegionRock(self.fullShapeList)
+
+        # Next lets assign base-level heightmap data from tectonic interactions
+        with self.profiler.stage("base_height"):
+            self.v.gen_voronoi_base_height(self.config.height_noise, len(self.fullShapeList))
+
+        # Building some cool mountain ranges
+        with self.profiler.stage("mountains"):
+            mountain_range_count = int(self.seeds.generator("mountain_range_count").integers(self.config.mountain_range_count_min, self.config.mountain_range_count_max))
+            self.v.gen_mountain_ranges(mountain_range_count, self.config.mountain_height_noise, self.config.mountain_range_length_dimension)
+
+        # Doing erosion
+        # Every pass runs in one go so large worlds only split the regions across processes once
+        with self.profiler.stage("erosion"):
+            self.v.gen_voronoi_erosion(self.config.erode_noise, self.config.erode_strength, self.config.erosion_count)
+
+        # Building the oceanic regions
+        with self.profiler.stage("oceans"):
+            self.v.build_ocean_regions(self.config.ocean_reduction_count)
+
+        # Building the freshwater oceans
+        with self.profiler.stage("freshwater"):
+            self.v.gen_freshwater()
+
+        # Fixing some of the bugs caused by oceanic generation
+        with self.profiler.stage("fix_oceans"):
+            self.v.fix_ocean_gen()
+
+        # Generating oceanic info
+        with self.profiler.stage("ocean_analysis"):
+            self.v.oceanic_land_analysis(self.config.ocean_percentage_threshold)
+
+        # Building the temperature differential
+        with self.profiler.stage("temperature"):
+            self.v.gen_base_temperature(self.config.temp_noise, self.config.temp_start_noise, self.config.oceanic_average_count)
+
+        # Okay...
+        # We now have OCEANS and we also have BASE TEMPERATURE
+        # We can now build the worlds 'base' humidity zones
+        with self.profiler.stage("humidity"):
+            self.v.gen_humidity_source()
+
+        # We can also build the worlds 'base' wind zones
+        with self.profiler.stage("ocean_winds"):
+            self.v.gen_oceanic_wind_sources()
+        with self.profiler.stage("winds"):
+            self.v.gen_winds()
+        with self.profiler.stage("wind_width"):
+            self.v.grow_wind_width()
+
+        # Now that we've built the Voronoi Wrapper, time to begin building the biomes
+
+    ###########
+    ## Debug ##
+    ###########
+
+    def print_shape_info(self):
+
+        for region in self.landShapeList:
+            if (region.tectonic):
+                print(
+                    "Land Tectonic: " + str(region.tectonic) + ", Rock: " + str(region.base_rock) + ", Geology: " + str(
+                        rockDatabase.get_entry(region.base_rock).rock_name) + " Index: " + str(region.shape_index))
+            else:
+                print("Land Tectonic: " + str(region.tectonic) + ", Rock: " + str(region.base_rock) + " Index: " + str(region.shape_index))
+
+        for region in self.waterShapeList:
+            if (region.tectonic):
+                print(
+                    "Water Tectonic: " + str(region.tectonic) + ", Rock: " + str(region.base_rock) + ", Geology: " + str(
+                        rockDatabase.get_entry(region.base_rock).rock_name) + " Index: " + str(region.shape_index))
+            else:
+                print("Water Tectonic: " + str(region.tectonic) + ", Rock: " + str(region.base_rock) + " Index: " + str(region.shape_index))
+
+
+    ####################
+    ## Draw Functions ##
+    ####################
+
+    # Every draw renders at scale pixels per world unit, cropped to bbox (x0, y0, x1, y1) in world units when given
+    # The region geometry is moved into output space once per scale and bbox and shared by every draw (render.py)
+    def render_view(self, scale=1, bbox=None):
+        key = (scale, None if bbox is None else tuple(bbox))
+        if key not in self.render_views:
+            if bbox is not None and self.region_index is None:
+                self.region_index = RegionIndex(self.v.vertex_offsets, self.v.vertex_coords, self.width, self.height)
+            self.render_views[key] = RenderView(self.width, self.height, self.v.vertex_offsets, self.v.vertex_coords, scale, bbox, self.region_index)
+        return self.render_views[key]
+
+    # Saves a drawn image, through the image writer when one is set (render.ImageWriter) so it encodes in the background
+    def save_image(self, im, path):
+        if self.writer is not None:
+            return self.writer.save(im, path)
+        im.save(path)
+        return path
+
+    # Places the labels of an annotated draw (labels.py)
+    def labeler(self, im):
+        return Labeler(im, self.label_min_cell, self.cull_labels)
+
+    # Draws every named layer of layers.py (all of them by default) into output/layers/<name>.png
+    # The regions are walked once for every layer together, threads > 1 draws every layer on its own thread instead
+    @profiled("draw_layers")
+    def draw_layers(self, names=None, scale=1, bbox=None, threads=None):
+        view = self.render_view(scale, bbox)
+        world = World.from_wrapper(self.v)
+
+        selected = [get_layer(name) for name in (names if names is not None else layers)]
+        layer_colors = {layer.name: (layer.background, [tuple(color) for color in layer.colors(world).tolist()]) for layer in selected}
+        images = render_layers(view, layer_colors, threads)
+
+        os.makedirs("output/layers", exist_ok=True)
+        for name, im in images.items():
+            self.save_image(im, "output/layers/" + name + ".png")
+        return images
+
+    @profiled("draw")
+    def draw(self, scale=1, bbox=None):
+        view = self.render_view(scale, bbox)
+
+        # Generating a new picture
+        im = Image.new("RGB", view.size, "white")
+        draw = ImageDraw.Draw(im)
+
+        draw.polygon(view.frame(), fill="white")
+
+
+        # Drawing every region
+        #print("Centers")
+        for region in view.regions(self.v.voronoi):
+            draw.polygon(view.polygon(region.index), fill=region.biome.biome_color)
+
+        self.save_image(im, "output/output.png")
+
+    @profiled("draw_index")
+    def draw_index(self, scale=1, bbox=None):
+        view = self.render_view(scale, bbox)
+
+        # Generating a new picture
+        im = Image.new("RGB", view.size, "#91BFFF")
+        draw = ImageDraw.Draw(im)
+        labels = self.labeler(im)
+
+        draw.polygon(view.frame(), fill="#91BFFF")
+
+
+        # Drawing every region
+        #print("Centers")
+
+        for region in view.regions(self.v.voronoi):
+            draw_vert_list = view.polygon(region.index)
+
+            draw.polygon(draw_vert_list, fill=region.biome.biome_color)
+            labels.add(view.point(region.center), str(region.index), view.length(70), cell=view.cell_size(region.index))
+            draw.line(draw_vert_list, fill="red", width=view.length(9))
+
+        self.save_image(im, "output/indexed_output.png")
+
+    @profiled("border_draw")
+    def border_draw(self, scale=1, bbox=None):
+        view = self.render_view(scale, bbox)
+
+        # Generating a new picture
+        im = Image.new("RGB", view.size, "#91BFFF")
+        draw = ImageDraw.Draw(im)
+
+        draw.polygon(view.frame(), fill="#91BFFF")
+
+
+        # Drawing every region
+        #print("Centers")
+        for region in view.regions(self.v.voronoi):
+            draw_vert_list = view.polygon(region.index)
+
+            draw.polygon(draw_vert_list, fill=region.biome.biome_color)
+            draw.line(draw_vert_list, fill="red", width=view.length(9))
+
+        self.save_image(im, "output/border_output.png")
+
+    @profiled("draw_region_overlap")
+    def draw_region_overlap(self, scale=1, bbox=None):
+        view = self.render_view(scale, bbox)
+
+        # Generating a new picture and filling it with the overlap data we have
+        im = Image.new("RGB", view.size, "#91BFFF")
+        draw = ImageDraw.Draw(im)
+
+        draw.polygon(view.frame(), fill="#6A6A6B")
+
+        overlap_count = self.v.plates.count()
+
+        # Drawing every region
+        # print("Centers")
+        for region in view.regions(self.v.voronoi):
+
+            # Grabbing our number of shapes
+            shape_count = overlap_count[region.index]
+            color_base = 200 * (shape_count / len(self.fullShapeList)) + 55
+            color_base = round(color_base)
+
+            draw.polygon(view.polygon(region.index), fill=(color_base,color_base,color_base))
+
+        self.save_image(im, "output/overlap_output.png")
+
+    # Draws every tectonic plate in red over grey into output/tectonic/tectonic_<plate>_output.png
+    # Every plate only draws its own regions into a palette image of a byte per pixel
+    # threads > 1 draws the plates on a pool of threads, packed writes a single tectonic_plates.npy instead of the
+    # images, one bit per plate for every pixel (bit p % 8 of byte p // 8 marks plate p)
+    @profiled("draw_tectonic")
+    def draw_tectonic(self, scale=1, bbox=None, threads=None, packed=False):
+        view = self.render_view(scale, bbox)
+        os.makedirs("output/tectonic", exist_ok=True)
+
+        # Determining the number of tectonic plates to draw
+        num_tectonic = len(self.fullShapeList)
+
+        if packed:
+            # The membership words are already one bit per plate, with an empty row for the pixels without a region
+            words = self.v.plates.words.astype("<u8")
+            words = np.concatenate((np.zeros((1, words.shape[1]), dtype="<u8"), words))
+            plate_bytes = words.view(np.uint8)[:, :max(1, (num_tectonic + 7) // 8)]
+            np.save("output/tectonic/tectonic_plates.npy", plate_bytes[view.region_raster()])
+            return
+
+        # Plates are two colored, so they are saved as palette images of a byte per pixel
+        palette = list(ImageColor.getrgb("#6A6A6B") + ImageColor.getrgb("red"))
+
+        def draw_plate(x):
+            # Generating a new picture from the regions within this plate, filled and outlined in red
+            im = Image.new("P", view.size, 0)
+            im.putpalette(palette)
+            draw = ImageDraw.Draw(im)
+            width = view.length(9)
+
+            mask = self.v.plates.mask(x)
+            if view.visible is not None:
+                mask = mask & view.visible
+            for index in np.flatnonzero(mask).tolist():
+                polygon = view.polygon(index)
+                draw.polygon(polygon, fill=1)
+                draw.line(polygon, fill=1, width=width)
+
+            self.save_image(im, "output/tectonic/tectonic_"+str(x)+"_output.png")
+
+        if threads is not None and threads > 1:
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                list(pool.map(draw_plate, range(0, num_tectonic)))
+        else:
+            for x in range(0, num_tectonic):
+                draw_plate(x)
+
+    @profiled("draw_geology")
+    def draw_geology(self, scale=1, bbox=None):
+        view = self.render_view(scale, bbox)
+
+        # Generating a new picture and filling it with the geological data that we have
+        im = Image.new("RGB", view.size, "#91BFFF")
+        draw = ImageDraw.Draw(im)
+
+        draw.polygon(view.frame(), fill="#6A6A6B")
+
+        rock_colors = [tuple(color) for color in rockDatabase.colors[self.v.rock_layers.top()].tolist()]
+
+        # Drawing every region
+        # print("Centers")
+        for region in view.regions(self.v.voronoi):
+
+            # Grabbing the color of our top rock
+            rock_color = rock_colors[region.index]
+
+            draw.polygon(view.polygon(region.index), fill=rock_color)
+
+        self.save_image(im, "output/geology_output.png")
+
+    @profiled("draw_elevation")
+    def draw_elevation(self, draw_only_land, scale=1, bbox=None):
+        view = self.render_view(scale, bbox)
+
+        # Generating a new picture and filling it with the geological data that we have
+        im = Image.new("RGB", view.size, "#91BFFF")
+        draw = ImageDraw.Draw(im)
+        labels = self.labeler(im)
+
+        draw.polygon(view.frame(), fill="#6A6A6B")
+
+        # Drawing every region
+        # print("Centers")
+        for region in view.regions(self.v.voronoi):
+
+            # Grabbing our rock layer object
+            if (draw_only_land):
+                if region.biome.land_type == "Water":
+                    color = 0
+                else:
+                    color = region.elevation / 100 * 255
+                    color = round(color)
+            else:
+                color = region.elevation / 100 * 255
+                color = round(color)
+
+            draw.polygon(view.polygon(region.index), fill=(color,color,color))
+            labels.add(view.point(region.center), str(int(round(region.elevation))), view.length(8), "red", view.cell_size(region.index))
+
+        self.save_image(im, "output/heightmap_output.png")
+
+    @profiled("draw_temperature_set")
+    def draw_temperature_set(self, scale=1, bbox=None):
+        view = self.render_view(scale, bbox)
+
+        # Drawing temperature information
+        im = Image.new("RGB", view.size, "black")
+        draw = ImageDraw.Draw(im)
+
+        draw.polygon(view.frame(), fill="black")
+
+        # Drawing every region
+        # print("Centers")
+        for region in view.regions(self.v.voronoi):
+
+            # Grabbing our rock layer object
+            temperature = region.relative_normalized_temperature
+
+            # Normalizing it against 255
+            temperature = int(round(temperature / 100 * 255))
+
+            temp_color = (temperature, temperature, temperature)
+
+            draw.polygon(view.polygon(region.index), fill=temp_color)
+
+        self.save_image(im, "output/temperature_output.png")
+
+    @profiled("draw_edge_set")
+    def draw_edge_set(self, scale=1, bbox=None):
+        view = self.render_view(scale, bbox)
+
+        # Drawing temperature information
+        im = Image.new("RGB", view.size, "black")
+        draw = ImageDraw.Draw(im)
+
+        draw.polygon(view.frame(), fill="black")
+
+        # Drawing every region
+        # print("Centers")
+        for region in view.regions(self.v.voronoi):
+
+            # Grabbing our rock layer object
+            temp_color = "black"
+
+            if region.edge:
+                temp_color = "blue"
+
+            draw.polygon(view.polygon(region.index), fill=temp_color)
+
+        self.save_image(im, "output/edge_output.png")
+
+    # Draws the plate boundaries, ocean borders and coastlines over the land and water (boundaries.py)
+    @profiled("draw_boundaries")
+    def draw_boundaries(self, scale=1, bbox=None):
+        view = self.render_view(scale, bbox)
+
+        im = Image.new("RGB", view.size, "#91BFFF")
+        draw = ImageDraw.Draw(im)
+
+        # Land in grey over the water
+        land = self.v.land_mask().tolist()
+        for index in view.indices():
+            if land[index]:
+                draw.polygon(view.polygon(index), fill="#6A6A6B")
+
+        # Coastlines last so they stay on top of the borders running along them
+        boundaries = self.v.boundaries()
+        for lines, fill, width in ((boundaries.plate_boundaries(), "red", 3), (boundaries.ocean_borders(), "blue", 3), (boundaries.coastlines(), "black", 5)):
+            for line in lines:
+                draw.line(view.line(line), fill=fill, width=view.length(width))
+
+        self.save_image(im, "output/boundaries_output.png")
+
+    @profiled("draw_ocean_set")
+    def draw_ocean_set(self, scale=1, bbox=None):
+        view = self.render_view(scale, bbox)
+
+        # Generating a new picture and filling it with the oceanic data that we have
+        im = Image.new("RGB", view.size, "#91BFFF")
+        draw = ImageDraw.Draw(im)
+        labels = self.labeler(im)
+
+        draw.polygon(view.frame(), fill="#6A6A6B")
+
+        # Drawing every region
+        # print("Centers")
+        for ocean_index in self.v.ocean_set:
+
+            ocean = self.v.ocean_set[ocean_index]
+
+            for region in view.regions(ocean.region_set):
+                draw.polygon(view.polygon(region.index), fill=ocean.color)
+
+        # Drawing ocean centers
+        for ocean_index in self.v.ocean_set:
+            ocean = self.v.ocean_set[ocean_index]
+
+            for region in view.regions([ocean.root_tile]):
+                draw_vert_list = view.polygon(region.index)
+
+                draw.polygon(draw_vert_list, fill="black")
+                labels.add(view.point(region.center), str(ocean.ocean_index) + "|" + str(ocean.land_neighbor_count) + "/" + str(len(ocean.region_set)), view.length(70))
+
+                fill = "red"
+                if ocean.inland_sea:
+                    fill = "blue"
+
+                if ocean.fresh_water:
+                    fill = "green"
+
+                draw.line(draw_vert_list, fill=fill, width=view.length(9))
+
+
+        self.save_image(im, "output/ocean_output.png")
+
+    @profiled("draw_mountains_set")
+    def draw_mountains_set(self, scale=1, bbox=None):
+        view = self.render_view(scale, bbox)
+
+        # Drawing temperature information
+        im = Image.new("RGB", view.size, "black")
+        draw = ImageDraw.Draw(im)
+        labels = self.labeler(im)
+
+        draw.polygon(view.frame(), fill="white")
+
+        # Drawing base level
+        for region in view.regions(self.v.voronoi):
+            draw.polygon(view.polygon(region.index), fill=region.biome.biome_color)
+
+        # Drawing mountains
+        for mountain_range_index in self.v.mountain_set:
+
+            mountain_range = self.v.mountain_set[mountain_range_index]
+            for mountain_tile_index in mountain_range.mountains:
+
+                mountain_tile = mountain_range.mountains[mountain_tile_index]
+                region = mountain_tile.region
+                if not view.regions([region]):
+                    continue
+
+                draw.polygon(view.polygon(region.index), fill=mountain_range.color)
+                display_strength = int(round(mountain_tile.mountain_strength * 100))
+                labels.add(view.point(region.center), str(display_strength) + ", " + str(mountain_tile.growth_angle), view.length(8),
+                           cell=view.cell_size(region.index))
+
+            # Drawing root tiles
+            for region in view.regions([mountain_range.root_tile.region]):
+                labels.add(view.point(region.center), str(mountain_range.range_index) + ", " + str(mountain_range.base_growth_angle), view.length(8), "red")
+
+
+        self.save_image(im, "output/mountain_output.png")
+
+    @profiled("draw_humidity")
+    def draw_humidity(self, scale=1, bbox=None):
+        view = self.render_view(scale, bbox)
+
+        # Generating a new picture
+        im = Image.new("RGB", view.size, "white")
+        draw = ImageDraw.Draw(im)
+        labels = self.labeler(im)
+
+        draw.polygon(view.frame(), fill="white")
+
+
+        # Drawing every region
+        #print("Centers")
+        for region in view.regions(self.v.voronoi):
+
+            # Getting humidity values
+            fill = region.biome.biome_color
+
+            if region.humid_source:
+                fill = "blue"
+
+            draw.polygon(view.polygon(region.index), fill=fill)
+            labels.add(view.point(region.center), str(int(round(region.base_humidity))), view.length(8), "red", view.cell_size(region.index))
+
+        self.save_image(im, "output/humidity_advanced_output.png")
+
+    # Draws every wind of a set over the biomes, as a line along its direction and its strength in grey
+    # The oceanic winds draw an arrow through their center, the full winds only a line
+    def draw_wind_set(self, view, draw, labels, winds, arrow, label):
+        for wind_index in winds:
+            wind = winds[wind_index]
+            if not view.regions([wind.region]):
+                continue
+
+            degree = wind.direction
+            rad_degree = degree / 180 * 3.14159
+
+            # Drawing a line
+            center = wind.region.center
+            center_x = center[0]
+            center_y = center[1]
+
+            left_x = center_x - (20 * math.cos(rad_degree))
+            left_y = center_y + (20 * math.sin(rad_degree))
+
+            right_x = center_x + (20 * math.cos(rad_degree))
+            right_y = center_y - (20 * math.sin(rad_degree))
+
+            if arrow:
+                draw_wind_line = [view.point((left_x, left_y)), view.point((center_x, center_y)), view.point((right_x, right_y))]
+            else:
+                draw_wind_line = [view.point((left_x, left_y)), view.point((right_x, right_y))]
+
+            strength = int(round((wind.strength * 255 / 100)))
+            draw.polygon(view.polygon(wind.region.index), fill=(strength, strength, strength))
+            draw.line(draw_wind_line, fill="red", width=view.length(9))
+            labels.add(view.point(wind.region.center), label(wind), view.length(18), "white", view.cell_size(wind.region.index))
+
+    @profiled("draw_oceanic_wind")
+    def draw_oceanic_wind(self, scale=1, bbox=None):
+        view = self.render_view(scale, bbox)
+
+        # Generating a new picture
+        im = Image.new("RGB", view.size, "white")
+        draw = ImageDraw.Draw(im)
+
+        draw.polygon(view.frame(), fill="white")
+
+
+        # Drawing every region
+        #print("Centers")
+        for region in view.regions(self.v.voronoi):
+
+            # Getting humidity values
+            fill = region.biome.biome_color
+            draw.polygon(view.polygon(region.index), fill=fill)
+
+        self.draw_wind_set(view, draw, self.labeler(im), self.v.ocean_wind_set, True, lambda wind: str(wind.direction) + ", " + str(wind.strength))
+
+        self.save_image(im, "output/oceanic_wind_output.png")
+
+    @profiled("draw_winds")
+    def draw_winds(self, scale=1, bbox=None):
+        view = self.render_view(scale, bbox)
+
+        # Generating a new picture
+        im = Image.new("RGB", view.size, "white")
+        draw = ImageDraw.Draw(im)
+
+        draw.polygon(view.frame(), fill="white")
+
+
+        # Drawing every region
+        #print("Centers")
+        for region in view.regions(self.v.voronoi):
+
+            # Getting humidity values
+            fill = region.biome.biome_color
+            draw.polygon(view.polygon(region.index), fill=fill)
+
+        self.draw_wind_set(view, draw, self.labeler(im), self.v.winds, False, lambda wind: str(int(round(wind.direction))) + ", " + str(int(round(wind.strength))))
+
+        self.save_image(im, "output/wind_output.png")
+
+# Setting a seed
+def gen_seed():
+    # Helper tool for generating a seed
+    return random.randrange(10000, 100000)
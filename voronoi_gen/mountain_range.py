@@ -1,4 +1,4 @@
-import random
+import numpy as np
 
 class Mountain:
 
@@ -24,7 +24,7 @@ class Mountain:
 
 class MountainRange:
 
-    def __init__(self, range_index, input_root_region, growth_angle):
+    def __init__(self, range_index, input_root_region, growth_angle, rng=None):
 
         # Range index is just an indexing value for this mountain range
         self.range_index = range_index
@@ -42,8 +42,11 @@ class MountainRange:
         # Dictionary where the index is the mountain index, also the region index
         self.mountains = {}
 
-        # Setting mountain color
-        self.color = (random.randrange(0,255), random.randrange(0,255), random.randrange(0,255))
+        # Setting mountain color, drawn from the generator of the mountain stage
+        if rng is None:
+            rng = np.random.default_rng()
+
+        self.color = tuple(rng.integers(0, 255, size=3).tolist())
 
         # Appending the base
         self.mountains[self.root_tile.mountain_index] = self.root_tile
\ No newline at end of file
@@ -0,0 +1,308 @@
+# Halo-exchange execution of the neighbor stencils
+# Heightmap averaging, ocean temperature averaging and weathering are all local updates over the region graph.
+# Their kernels are written over a StencilGraph so the same code runs over the whole graph in process, or over
+# spatial partitions of it in a pool of processes.
+#
+# In parallel every partition is a process holding its own regions followed by a halo of the regions around them.
+# The field being updated lives in two shared memory buffers: every pass reads one and writes the other, a barrier
+# separates the passes, and after it each process only reads back its halo from the other partitions.
+#
+# Neighbor sums are added in the order of each regions neighbor set, exactly like the original loops did, so both
+# modes give the same floats as the per-region code.
+import multiprocessing
+import os
+
+import numpy as np
+from scipy import sparse
+
+from .shared import SharedArray, close_all
+
+# Below this many regions starting processes costs more than it saves, the stencils stay in process
+parallel_threshold = 50000
+
+
+# Neighbor lists of the first rows nodes of a graph, flattened in neighbor set order
+# offsets has rows + 1 entries and indexes into flat, the neighbors are indexes into the nodes of the graph
+class StencilGraph:
+
+    def __init__(self, offsets, flat, nodes):
+        self.offsets = offsets
+        self.flat = flat
+        self.nodes = nodes
+        self.rows = len(offsets) - 1
+        self.counts = np.diff(offsets)
+        self.matrix = None
+
+    # Sum over the neighbors of every row, added one neighbor at a time in set order
+    # start is what every sum starts from, the original loops started from 0 or from the regions own value
+    def ordered_sum(self, values, rows=None, start=None):
+        rows = self.rows if rows is None else rows
+        counts = self.counts[:rows]
+        sums = np.zeros(rows, dtype=np.float64) if start is None else np.array(start[:rows], dtype=np.float64)
+
+        starts = self.offsets[:rows]
+        for position in range(0, int(counts.max()) if rows else 0):
+            has = np.flatnonzero(counts > position)
+            sums[has] += values[self.flat[starts[has] + position]]
+        return sums
+
+    # The graph as a square sparse matrix over its nodes, rows past self.rows are empty
+    def adjacency(self):
+        if self.matrix is None:
+            indptr = np.concatenate((self.offsets, np.full(self.nodes - self.rows, self.offsets[-1])))
+            self.matrix = sparse.csr_matrix((np.ones(len(self.flat), dtype=np.int32), self.flat, indptr), shape=(self.nodes, self.nodes))
+            self.matrix.sum_duplicates()
+        return self.matrix
+
+
+#############
+## Kernels ##
+#############
+
+# Every kernel takes the values of the nodes (own regions first), the graph, the number of own regions, the static
+# arrays and this passes arrays over the nodes, and returns the new values of the own regions
+
+
+# One pass of heightmap averaging, the same rules as VoronoiWrapper.gen_voronoi_heightmap_average
+def heightmap_kernel(values, graph, owned, static, current, params):
+    elevation = values[:owned]
+    land = static["land"][:owned]
+    noise = current["noise"][:owned]
+
+    average = graph.ordered_sum(values, owned) / graph.counts[:owned]
+    new = elevation + np.round((average - elevation) * params["strength"])
+
+    # Immune regions only take the noise
+    immune = elevation > params["immune_threshold"]
+    new[immune] = elevation[immune]
+    new = new + noise
+
+    # Water stays below the water limit, land stays above it
+    limit = params["water_height_limit"]
+    new = np.where(~land & (new > limit), limit, new)
+    new = np.where(land & (new <= limit), limit + 1, new)
+    new[elevation <= 0] = 1
+
+    # Immune regions are the only ones that aren't rounded
+    return np.where(immune, new, np.round(new))
+
+
+# One pass of ocean temperature averaging, water regions take the trended average of themselves and their neighbors
+def ocean_temperature_kernel(values, graph, owned, static, current, params):
+    temperature = values[:owned]
+    land = static["land"][:owned]
+
+    total = graph.ordered_sum(values, owned, start=temperature)
+    return np.where(land, temperature, total / (graph.counts[:owned] + params["trend"]))
+
+
+# One pass of weathering, land regions with 2 to 4 water neighbors that don't touch each other become water
+# Needs the neighbors of the neighbors, so partitions carry a halo two regions deep
+def weathering_kernel(values, graph, owned, static, current, params):
+    land = values.astype(bool)
+    adjacency = graph.adjacency()
+    water = (~land).astype(np.int32)
+
+    # Counting how many water tiles are adjacent to every region
+    water_count = adjacency[:owned] @ water
+    candidates = np.flatnonzero(land[:owned] & (water_count >= 2) & (water_count <= 4))
+    new = land[:owned].copy()
+    if len(candidates) <= 0:
+        return new
+
+    # Row i of (A * W) @ (A * W) counts the water-water paths leaving our water neighbors, masking it
+    # with our own water neighbors leaves the number of our water neighbors that touch each other
+    water_adjacency = adjacency @ sparse.diags(water, dtype=np.int32)
+    candidate_water = water_adjacency[candidates]
+    neighbor_count = np.asarray((candidate_water @ water_adjacency).multiply(candidate_water).sum(axis=1)).ravel()
+
+    new[candidates[neighbor_count <= 0]] = False
+    return new
+
+
+kernels = {
+    "heightmap": heightmap_kernel,
+    "ocean_temperature": ocean_temperature_kernel,
+    "weathering": weathering_kernel,
+}
+
+# How many rings of neighbors every kernel reads
+kernel_depth = {
+    "heightmap": 1,
+    "ocean_temperature": 1,
+    "weathering": 2,
+}
+
+
+##################
+## Partitioning ##
+##################
+
+# Splits the regions into parts of (nearly) equal size by recursively cutting along the widest axis
+def partition_regions(centers, parts):
+    labels = np.zeros(len(centers), dtype=np.int64)
+
+    def bisect(indices, first, count):
+        if count <= 1:
+            labels[indices] = first
+            return
+        extent = centers[indices].max(axis=0) - centers[indices].min(axis=0)
+        axis = int(np.argmax(extent))
+        order = indices[np.argsort(centers[indices, axis], kind="stable")]
+        left = count // 2
+        split = len(order) * left // count
+        bisect(order[:split], first, left)
+        bisect(order[split:], first + left, count - left)
+
+    bisect(np.arange(len(centers)), 0, parts)
+    return labels
+
+
+# Positions within flat of the neighbors of every given row, in order
+def neighbor_positions(offsets, rows):
+    lengths = offsets[rows + 1] - offsets[rows]
+    return np.repeat(offsets[rows], lengths) + (np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)), lengths
+
+
+# One partition, its nodes are its own regions followed by its halo ring by ring
+class Partition:
+
+    def __init__(self, nodes, owned, graph):
+        self.nodes = nodes
+        self.owned = owned
+        self.graph = graph
+
+
+# Builds the partition of one label, with a halo depth rings deep
+def build_partition(offsets, flat, labels, label, depth):
+    region_count = len(labels)
+    own = np.flatnonzero(labels == label)
+
+    rings = [own]
+    seen = np.zeros(region_count, dtype=bool)
+    seen[own] = True
+    for x in range(0, depth):
+        neighbors = flat[neighbor_positions(offsets, rings[-1])[0]]
+        ring = np.unique(neighbors[~seen[neighbors]])
+        seen[ring] = True
+        rings.append(ring)
+
+    nodes = np.concatenate(rings)
+    local = np.full(region_count, -1, dtype=np.int64)
+    local[nodes] = np.arange(len(nodes))
+
+    # Rows are kept for every node the kernels read the neighbors of, the own regions and every ring but the last
+    row_nodes = np.concatenate(rings[:depth])
+    positions, lengths = neighbor_positions(offsets, row_nodes)
+    local_offsets = np.concatenate(([0], np.cumsum(lengths)))
+
+    return Partition(nodes, len(own), StencilGraph(local_offsets, local[flat[positions]], len(nodes)))
+
+
+###############
+## Execution ##
+###############
+
+# Process side of a parallel stencil, runs every pass over one partition
+def stencil_worker(partition, kind, passes, params, buffers, static, per_pass, barrier):
+    buffers = [SharedArray.attach(descriptor) for descriptor in buffers]
+    static = {name: SharedArray.attach(descriptor) for name, descriptor in static.items()}
+    per_pass = {name: SharedArray.attach(descriptor) for name, descriptor in per_pass.items()}
+
+    try:
+        nodes = partition.nodes
+        owned = partition.owned
+        kernel = kernels[kind]
+
+        local_static = {name: array.array[nodes] for name, array in static.items()}
+        values = buffers[0].array[nodes]
+
+        for pass_index in range(0, passes):
+            current = {name: array.array[pass_index][nodes] for name, array in per_pass.items()}
+            new = kernel(values, partition.graph, owned, local_static, current, params)
+
+            # Publishing our own regions, then waiting for every partition before reading back the halo
+            target = buffers[(pass_index + 1) % 2].array
+            target[nodes[:owned]] = new
+            barrier.wait()
+
+            values = values.copy()
+            values[:owned] = new
+            values[owned:] = target[nodes[owned:]]
+    except BaseException:
+        # Releasing everyone else from the barrier rather than leaving them waiting on us
+        barrier.abort()
+        raise
+    finally:
+        for array in buffers:
+            array.close()
+        close_all(static)
+        close_all(per_pass)
+
+
+class StencilRunner:
+
+    def __init__(self, offsets, flat, centers, workers=None):
+        self.offsets = offsets
+        self.flat = flat
+        self.centers = centers
+        self.region_count = len(offsets) - 1
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.partitions = {}
+        self.graph = StencilGraph(offsets, flat, self.region_count)
+
+    def parallel(self):
+        return self.workers > 1 and self.region_count >= parallel_threshold
+
+    def partition(self, depth):
+        if depth not in self.partitions:
+            labels = partition_regions(self.centers, self.workers)
+            self.partitions[depth] = [build_partition(self.offsets, self.flat, labels, label, depth) for label in range(0, self.workers)]
+        return self.partitions[depth]
+
+    # Runs passes of a kernel over the values, static arrays are per region, per_pass arrays have a row per pass
+    def run(self, kind, values, passes, static=None, per_pass=None, params=None):
+        static = static if static is not None else {}
+        per_pass = per_pass if per_pass is not None else {}
+        params = params if params is not None else {}
+
+        if not self.parallel():
+            kernel = kernels[kind]
+            for pass_index in range(0, passes):
+                current = {name: array[pass_index] for name, array in per_pass.items()}
+                values = kernel(values, self.graph, self.region_count, static, current, params)
+            return values
+
+        return self.run_parallel(kind, values, passes, static, per_pass, params)
+
+    def run_parallel(self, kind, values, passes, static, per_pass, params):
+        partitions = self.partition(kernel_depth[kind])
+        context = multiprocessing.get_context()
+
+        buffers = [SharedArray.create(values), SharedArray.create(values)]
+        shared_static = {name: SharedArray.create(array) for name, array in static.items()}
+        shared_per_pass = {name: SharedArray.create(array) for name, array in per_pass.items()}
+
+        try:
+            barrier = context.Barrier(len(partitions))
+            processes = [context.Process(target=stencil_worker, args=(
+                partition, kind, passes, params,
+                [buffer.descriptor() for buffer in buffers],
+                {name: array.descriptor() for name, array in shared_static.items()},
+                {name: array.descriptor() for name, array in shared_per_pass.items()},
+                barrier)) for partition in partitions]
+
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+
+            if any(process.exitcode != 0 for process in processes):
+                raise RuntimeError("Parallel " + kind + " stencil failed in a worker process")
+
+            return buffers[passes % 2].array.copy()
+        finally:
+            for buffer in buffers:
+                buffer.close()
+            close_all(shared_static)
+            close_all(shared_per_pass)
@@ -0,0 +1,90 @@
+# File that manages tectonic plate membership
+# Every region keeps a packed bitset of the plates it belongs to, one bit per plate
+import numpy as np
+
+# Number of plates packed into a single word
+WORD_BITS = 64
+
+# Lookup table for counting bits on older versions of numpy
+byte_bit_count = np.array([bin(x).count("1") for x in range(256)], dtype=np.uint8)
+
+
+# Helper function for counting the set bits of every word in a uint64 array
+def popcount(words):
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).astype(np.int64)
+
+    # Counting bits one byte at a time
+    byte_view = np.ascontiguousarray(words).view(np.uint8).reshape(words.shape + (8,))
+    return byte_bit_count[byte_view].sum(axis=-1, dtype=np.int64)
+
+
+class PlateMembership:
+
+    def __init__(self, region_count, plate_count=0):
+        self.region_count = region_count
+        self.plate_count = plate_count
+
+        # Matrix of (regions, words), bit b of word w marks membership of plate w * 64 + b
+        self.words = np.zeros((region_count, self.word_count_for(plate_count)), dtype=np.uint64)
+
+    def word_count_for(self, plate_count):
+        return max(1, (plate_count + WORD_BITS - 1) // WORD_BITS)
+
+    # Function for growing the matrix if a plate does not fit yet
+    def ensure_plate(self, plate):
+        if plate < self.plate_count:
+            return
+
+        self.plate_count = plate + 1
+        word_count = self.word_count_for(self.plate_count)
+        if word_count > self.words.shape[1]:
+            grown = np.zeros((self.region_count, word_count), dtype=np.uint64)
+            grown[:, :self.words.shape[1]] = self.words
+            self.words = grown
+
+    # Function for adding every region in the mask (or index array) to the given plate
+    def add(self, plate, regions):
+        self.ensure_plate(plate)
+        word, bit = divmod(plate, WORD_BITS)
+        self.words[regions, word] |= np.uint64(1 << bit)
+
+    # Boolean array of all the regions belonging to the given plate
+    def mask(self, plate):
+        if plate >= self.plate_count:
+            return np.zeros(self.region_count, dtype=bool)
+
+        word, bit = divmod(plate, WORD_BITS)
+        return (self.words[:, word] & np.uint64(1 << bit)) != 0
+
+    # Converting a boolean array over the plates into a row of words
+    def plate_words(self, plate_mask):
+        plate_mask = np.asarray(plate_mask, dtype=bool)
+        padded = np.zeros(self.words.shape[1] * WORD_BITS, dtype=bool)
+        padded[:min(len(plate_mask), len(padded))] = plate_mask[:len(padded)]
+
+        bits = padded.reshape(-1, WORD_BITS).astype(np.uint64)
+        return (bits << np.arange(WORD_BITS, dtype=np.uint64)).sum(axis=1, dtype=np.uint64)
+
+    # Number of plates every region belongs to, optionally only counting the plates in plate_mask
+    def count(self, plate_mask=None):
+        words = self.words
+        if plate_mask is not None:
+            words = words & self.plate_words(plate_mask)
+
+        return popcount(words).sum(axis=1)
+
+    # Boolean array of all the regions belonging to at least one of the plates in plate_mask
+    def any(self, plate_mask):
+        return (self.words & self.plate_words(plate_mask)).any(axis=1)
+
+    # List of the plates a single region belongs to
+    def plates_of(self, region_index):
+        plates = []
+        for word_index, word in enumerate(self.words[region_index].tolist()):
+            while word:
+                low_bit = word & -word
+                plates.append(word_index * WORD_BITS + low_bit.bit_length() - 1)
+                word = word ^ low_bit
+
+        return plates
@@ -0,0 +1,173 @@
+# Per-stage profiling
+# Every stage of a run can be wrapped in profiler.stage(name), which records its wall time, cpu time,
+# peak traced memory and any counters the stage reports while it runs
+# A disabled profiler does nothing at all, which is what every world uses unless given one
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+import json
+import time
+import tracemalloc
+
+
+class StageProfiler:
+
+    def __init__(self, enabled=True, memory=True):
+        self.enabled = enabled
+
+        # Tracing memory slows python code down quite a bit, so it can be turned off on its own
+        self.memory = memory
+
+        # Finished stage records, in the order they finished
+        self.stages = []
+
+        # Open and close events for the speedscope timeline
+        self.events = []
+        self.frames = []
+        self.frame_index = {}
+
+        # Stack of the stages that are currently open
+        self.stack = []
+        self.origin = time.perf_counter()
+        self.started_tracing = False
+
+    @contextmanager
+    def _stage(self, name):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+
+        # The peak of the parent stage is carried over before resetting it for ours
+        start_memory = 0
+        if self.memory:
+            start_memory, peak = tracemalloc.get_traced_memory()
+            if self.stack:
+                self.stack[-1]["peak"] = max(self.stack[-1]["peak"], peak)
+            tracemalloc.reset_peak()
+
+        record = {
+            "name": name,
+            "path": "/".join([frame["name"] for frame in self.stack] + [name]),
+            "depth": len(self.stack),
+            "counters": {},
+            "peak": start_memory,
+        }
+        self.stack.append(record)
+        self.events.append({"type": "O", "frame": self._frame(name), "at": self._now()})
+
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall"] = time.perf_counter() - start_wall
+            record["cpu"] = time.process_time() - start_cpu
+            self.events.append({"type": "C", "frame": self._frame(name), "at": self._now()})
+            self.stack.pop()
+
+            # Peak memory is relative to what was allocated when the stage started
+            if self.memory:
+                peak = max(record["peak"], tracemalloc.get_traced_memory()[1])
+                tracemalloc.reset_peak()
+                if self.stack:
+                    self.stack[-1]["peak"] = max(self.stack[-1]["peak"], peak)
+                record["peak_memory"] = peak - start_memory
+            else:
+                record["peak_memory"] = None
+            del record["peak"]
+
+            record["start"] = start_wall - self.origin
+            self.stages.append(record)
+
+            if not self.stack and self.started_tracing:
+                tracemalloc.stop()
+                self.started_tracing = False
+
+    # Wraps a stage, returning a shared context that does nothing when disabled
+    def stage(self, name):
+        if not self.enabled:
+            return nullcontext()
+        return self._stage(name)
+
+    # Adds to a counter of the innermost open stage
+    def count(self, name, value=1):
+        if not self.enabled or not self.stack:
+            return
+        counters = self.stack[-1]["counters"]
+        counters[name] = counters.get(name, 0) + value
+
+    # Records one observation of a size (e.g. a wind front), keeping its count, total and maximum
+    def observe(self, name, value):
+        if not self.enabled or not self.stack:
+            return
+        counters = self.stack[-1]["counters"]
+        if name not in counters:
+            counters[name] = {"count": 0, "total": 0, "max": value}
+        observed = counters[name]
+        observed["count"] = observed["count"] + 1
+        observed["total"] = observed["total"] + value
+        observed["max"] = max(observed["max"], value)
+
+    def _now(self):
+        return (time.perf_counter() - self.origin) * 1000
+
+    def _frame(self, name):
+        if name not in self.frame_index:
+            self.frame_index[name] = len(self.frames)
+            self.frames.append({"name": name})
+        return self.frame_index[name]
+
+    # Totals of every stage name, stages that ran several times (erosion passes) are summed
+    def totals(self):
+        totals = {}
+        for record in self.stages:
+            total = totals.setdefault(record["path"], {"calls": 0, "wall": 0.0, "cpu": 0.0, "peak_memory": None})
+            total["calls"] = total["calls"] + 1
+            total["wall"] = total["wall"] + record["wall"]
+            total["cpu"] = total["cpu"] + record["cpu"]
+            if record["peak_memory"] is not None:
+                total["peak_memory"] = max(total["peak_memory"] or 0, record["peak_memory"])
+        return totals
+
+    def report(self):
+        return {"stages": sorted(self.stages, key=lambda record: record["start"]), "totals": self.totals()}
+
+    def to_json(self, path=None):
+        text = json.dumps(self.report(), indent=2)
+        if path is not None:
+            with open(path, "w") as file:
+                file.write(text)
+        return text
+
+    # Speedscope's evented profile format, https://www.speedscope.app/file-format-schema.json
+    def to_speedscope(self, path=None, name="voronoi_gen"):
+        end = self.events[-1]["at"] if self.events else 0
+        profile = {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": self.frames},
+            "profiles": [{
+                "type": "evented",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": self.events[0]["at"] if self.events else 0,
+                "endValue": end,
+                "events": self.events,
+            }],
+            "name": name,
+            "exporter": "voronoi_gen",
+        }
+        text = json.dumps(profile)
+        if path is not None:
+            with open(path, "w") as file:
+                file.write(text)
+        return text
+
+
+# Decorator running a method as a stage of its objects profiler
+def profiled(name):
+    def decorator(function):
+        @wraps(function)
+        def wrapper(self, *args, **kwargs):
+            with self.profiler.stage(name):
+                return function(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,78 @@
+# Progress and event reporting
+# Generation stages report what they're doing through a Progress object instead of printing
+# Without a sink every call returns straight away, so batch runs are completely silent and never wait on stdout
+import logging
+import time
+
+
+class Progress:
+
+    def __init__(self, sink=None, interval=0.5):
+        # The sink is any callable taking a record dictionary, None keeps everything silent
+        self.sink = sink
+
+        # Progress updates of a stage are reported at most once every interval seconds
+        self.interval = interval
+        self.last_update = {}
+
+    def enabled(self):
+        return self.sink is not None
+
+    # One-off events, such as a stage starting or finishing
+    def event(self, stage, message, **fields):
+        if self.sink is None:
+            return
+
+        record = {"kind": "event", "stage": stage, "message": message, "time": time.monotonic()}
+        record.update(fields)
+        self.sink(record)
+
+    # Progress within a stage, safe to call on every iteration of a hot loop
+    # Updates are throttled to the interval, the final update (done >= total) is always reported
+    def update(self, stage, done, total=None, **fields):
+        if self.sink is None:
+            return
+
+        now = time.monotonic()
+        finished = total is not None and done >= total
+        last = self.last_update.get(stage)
+        if not finished and last is not None and now - last < self.interval:
+            return
+        self.last_update[stage] = now
+
+        record = {"kind": "progress", "stage": stage, "done": done, "total": total, "time": now}
+        record.update(fields)
+        self.sink(record)
+
+
+# Formats a record into a single human readable line
+def format_record(record):
+    if record["kind"] == "progress":
+        if record["total"]:
+            line = "[" + record["stage"] + "] " + str(record["done"]) + "/" + str(record["total"]) + " (" + str(int(100 * record["done"] / record["total"])) + "%)"
+        else:
+            line = "[" + record["stage"] + "] " + str(record["done"])
+    else:
+        line = "[" + record["stage"] + "] " + record["message"]
+
+    # Any extra fields are appended at the end
+    extra = [key + "=" + str(value) for key, value in record.items() if key not in ("kind", "stage", "message", "done", "total", "time")]
+    if extra:
+        line = line + " " + ", ".join(extra)
+    return line
+
+
+# Sink that prints every record, used by the command line
+def print_sink(record):
+    print(format_record(record))
+
+
+# Sink that sends every record to a logger, the record itself is attached for structured handlers
+def logging_sink(logger=None, level=logging.INFO):
+    if logger is None:
+        logger = logging.getLogger("voronoi_gen")
+
+    def sink(record):
+        logger.log(level, format_record(record), extra={"progress": record})
+
+    return sink
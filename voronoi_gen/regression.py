@@ -0,0 +1,257 @@
+# Golden output regression harness
+# Generates a fixed set of seeded worlds through Main.run and digests every per-region field, the digests are compared
+# against the golden file checked into the package so any change to the generated worlds shows up
+# Every field keeps a sha256 of its exact values along with its moments and quantiles: identical worlds match on the
+# hash, worlds that drift a little stay within the tolerance on the statistics, anything else fails
+# Every stage also has a time (and optionally memory) budget it must stay within
+# Sharded meshes are checked as well, their adjacency has to match the delaunay triangulation of their points and their
+# region centers and vertices have to be consistent and within the map
+# Run with python -m voronoi_gen.regression, --update rewrites the golden file
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+
+from .benchmark import world_dimensions
+from .main import Main
+from .profiling import StageProfiler
+from .tiling import generate_mesh
+from .voronoi import delaunay_adjacency
+
+golden_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "regression_golden.json")
+
+# Seeded worlds the harness generates, (seed, cells) at the default density
+default_worlds = ((12345, 1000), (777, 2000), (4242, 5000))
+
+# Quantiles kept for every field
+quantiles = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+# Sharded meshes checked against a single triangulation, (width, height, cells, relaxation, seed, shards x, shards y)
+# Relaxed points are never cocircular, so their triangulation is unique and has to match edge for edge
+sharded_meshes = ((6800, 4200, 20000, 5, 99, 3, 2),)
+
+# Statistics may differ by abs + rel * |golden| before a field fails
+default_tolerance = {"abs": 0.5, "rel": 0.02}
+
+# Budgets are written as the measured value times this factor, with a floor so tiny stages don't fail on noise
+budget_factor = 3.0
+minimum_time_budget = 0.5
+minimum_memory_budget = 1 << 20
+
+
+# Digest of one column, a hash of its exact bytes along with its moments and quantiles
+def field_digest(values):
+    values = np.ascontiguousarray(values)
+    numeric = values.astype(np.float64)
+
+    hasher = hashlib.sha256()
+    hasher.update(values.dtype.str.encode())
+    hasher.update(str(values.shape).encode())
+    hasher.update(values.tobytes())
+
+    digest = {"sha256": hasher.hexdigest(), "count": int(len(values))}
+    if len(values) > 0:
+        digest["mean"] = float(numeric.mean())
+        digest["std"] = float(numeric.std())
+        digest["min"] = float(numeric.min())
+        digest["max"] = float(numeric.max())
+        digest["quantiles"] = [float(value) for value in np.quantile(numeric, quantiles)]
+    return digest
+
+
+# Digests of every per-region field of a generated world
+def world_digest(m):
+    return {name: field_digest(values) for name, values in m.v.region_columns().items()}
+
+
+def world_key(seed, cells):
+    return str(seed) + "/" + str(cells)
+
+
+# Generates one world, returning its digests and the per-stage totals of its profile
+def run_world(seed, cells, memory=False):
+    width, height = world_dimensions(cells)
+    profiler = StageProfiler(memory=memory)
+
+    m = Main(width, height, cells, 5, seed, profiler=profiler)
+    m.gen_plates()
+    m.run()
+
+    return world_digest(m), profiler.totals()
+
+
+def generate(worlds=default_worlds, memory=False):
+    results = {}
+    for seed, cells in worlds:
+        fields, totals = run_world(seed, cells, memory)
+        results[world_key(seed, cells)] = {"seed": seed, "cells": cells, "fields": fields, "stages": totals}
+    return results
+
+
+# Golden file contents from freshly generated results, budgets are derived from the measured stages
+def golden_from(results, tolerance=default_tolerance):
+    golden = {"tolerance": dict(tolerance), "worlds": {}}
+    for key, result in results.items():
+        budgets = {}
+        for stage, total in result["stages"].items():
+            budget = {"wall": round(max(minimum_time_budget, total["wall"] * budget_factor), 3)}
+            if total["peak_memory"] is not None:
+                budget["peak_memory"] = int(max(minimum_memory_budget, total["peak_memory"] * budget_factor))
+            budgets[stage] = budget
+        golden["worlds"][key] = {"seed": result["seed"], "cells": result["cells"], "fields": result["fields"], "budgets": budgets}
+    return golden
+
+
+def within(golden, value, tolerance):
+    return abs(value - golden) <= tolerance["abs"] + tolerance["rel"] * abs(golden)
+
+
+# Compares the digests of one field, returning "identical", "drift" (within tolerance) or "fail" with the reason
+def compare_field(golden, digest, tolerance):
+    if golden["sha256"] == digest["sha256"]:
+        return "identical", None
+    if golden["count"] != digest["count"]:
+        return "fail", "count " + str(golden["count"]) + " -> " + str(digest["count"])
+
+    for stat in ("mean", "std", "min", "max"):
+        if stat in golden and not within(golden[stat], digest[stat], tolerance):
+            return "fail", stat + " " + str(golden[stat]) + " -> " + str(digest[stat])
+    for q, a, b in zip(quantiles, golden.get("quantiles", []), digest.get("quantiles", [])):
+        if not within(a, b, tolerance):
+            return "fail", "q" + str(q) + " " + str(a) + " -> " + str(b)
+    return "drift", None
+
+
+# Compares generated results against the golden file, returning a list of (world, name, status, detail)
+def compare(golden, results):
+    report = []
+    tolerance = golden.get("tolerance", default_tolerance)
+
+    for key, expected in golden["worlds"].items():
+        if key not in results:
+            report.append((key, "-", "missing", None))
+            continue
+        result = results[key]
+
+        # Fields
+        for name, expected_digest in expected["fields"].items():
+            field_tolerance = golden.get("field_tolerance", {}).get(name, tolerance)
+            if name not in result["fields"]:
+                report.append((key, name, "fail", "field missing"))
+                continue
+            status, detail = compare_field(expected_digest, result["fields"][name], field_tolerance)
+            report.append((key, name, status, detail))
+
+        # Budgets, only checked when the stage was measured
+        for stage, budget in expected.get("budgets", {}).items():
+            total = result.get("stages", {}).get(stage)
+            if total is None:
+                continue
+            if total["wall"] > budget["wall"]:
+                report.append((key, stage, "fail", "wall " + str(round(total["wall"], 3)) + "s over budget " + str(budget["wall"]) + "s"))
+            if "peak_memory" in budget and total["peak_memory"] is not None and total["peak_memory"] > budget["peak_memory"]:
+                report.append((key, stage, "fail", "peak memory " + str(total["peak_memory"]) + " over budget " + str(budget["peak_memory"])))
+
+    return report
+
+
+# Checks every sharded mesh against what a single mesh of its points would have
+# The adjacency has to match the delaunay triangulation exactly, every region center has to be the mean of its
+# vertices, and every center and vertex has to lie within the map
+def check_sharded_meshes(meshes=sharded_meshes):
+    report = []
+    for width, height, cells, relaxation_count, seed, shards_x, shards_y in meshes:
+        mesh = generate_mesh(width, height, cells, relaxation_count, seed, shards_x, shards_y, workers=1)
+        key = "sharded " + str(seed) + "/" + str(cells) + " " + str(shards_x) + "x" + str(shards_y)
+
+        difference = abs(mesh.adjacency - delaunay_adjacency(mesh.points))
+        difference.eliminate_zeros()
+        if difference.nnz == 0:
+            report.append((key, "adjacency", "identical", None))
+        else:
+            report.append((key, "adjacency", "fail", str(difference.nnz) + " entries differ from the delaunay triangulation"))
+
+        # Vertex offsets have to cover coords region by region, every region with at least one vertex
+        offsets = np.asarray(mesh.offsets)
+        counts = np.diff(offsets)
+        if len(offsets) != cells + 1 or offsets[0] != 0 or offsets[-1] != len(mesh.coords) or (counts < 1).any():
+            report.append((key, "vertex_offsets", "fail", "offsets don't cover the " + str(len(mesh.coords)) + " vertices of " + str(cells) + " regions"))
+        else:
+            report.append((key, "vertex_offsets", "identical", None))
+
+            # Centers are the mean of their regions vertices
+            means = np.add.reduceat(mesh.coords, offsets[:-1], axis=0) / counts[:, None]
+            off = int((np.abs(mesh.centers - means) > 1e-6 * max(width, height)).any(axis=1).sum())
+            if off == 0:
+                report.append((key, "centers", "identical", None))
+            else:
+                report.append((key, "centers", "fail", str(off) + " centers aren't the mean of their vertices"))
+
+        # Everything within the map
+        for name, values in (("centers", mesh.centers), ("vertex_coords", mesh.coords)):
+            outside = int(((values[:, 0] < 0) | (values[:, 0] > width) | (values[:, 1] < 0) | (values[:, 1] > height)).sum())
+            if outside == 0:
+                report.append((key, name + " within map", "identical", None))
+            else:
+                report.append((key, name + " within map", "fail", str(outside) + " outside the map"))
+    return report
+
+
+def failed(report):
+    return [entry for entry in report if entry[2] in ("fail", "missing")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="voronoi_gen.regression", description="Check generated worlds against the golden digests")
+    parser.add_argument("--golden", default=golden_path, help="golden digest file")
+    parser.add_argument("--update", action="store_true", help="regenerate the golden file from the current code")
+    parser.add_argument("--memory", action="store_true", help="trace and check peak memory budgets")
+    parser.add_argument("--output", default=None, help="also save the generated digests here")
+    parser.add_argument("--compare", nargs=2, metavar=("GOLDEN", "RESULTS"), default=None,
+                        help="compare two saved digest files (e.g. two implementations) instead of generating")
+    parser.add_argument("--verbose", action="store_true", help="list identical fields too")
+    args = parser.parse_args(argv)
+
+    if args.compare is not None:
+        with open(args.compare[0]) as file:
+            golden = json.load(file)
+        with open(args.compare[1]) as file:
+            results = json.load(file)
+        if "worlds" in results:
+            results = results["worlds"]
+    else:
+        golden = None
+        if not args.update:
+            with open(args.golden) as file:
+                golden = json.load(file)
+        worlds = default_worlds if golden is None else [(world["seed"], world["cells"]) for world in golden["worlds"].values()]
+        results = generate(worlds, args.memory)
+
+        if args.output is not None:
+            with open(args.output, "w") as file:
+                json.dump(golden_from(results), file, indent=2)
+
+        if args.update:
+            with open(args.golden, "w") as file:
+                json.dump(golden_from(results), file, indent=2)
+            print("Wrote " + args.golden)
+            return 0
+
+    report = compare(golden, results)
+    if args.compare is None:
+        report += check_sharded_meshes()
+    for key, name, status, detail in report:
+        if status != "identical" or args.verbose:
+            print(key + " " + name + ": " + status + ("" if detail is None else " (" + detail + ")"))
+
+    failures = failed(report)
+    drifted = [entry for entry in report if entry[2] == "drift"]
+    print(str(len(report)) + " checks, " + str(len(drifted)) + " drifted within tolerance, " + str(len(failures)) + " failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+# Output space of the draw functions
+# A RenderView maps the world into an image of scale pixels per world unit, cropped to a bounding box of the world.
+# Every regions vertices are moved into output space once per view, the draws then only look their polygons up, and
+# with a bounding box only the regions within it are drawn at all.
+# A scale of 1 without a bounding box is the full world resolution the draws always rendered at.
+from concurrent.futures import ThreadPoolExecutor
+import math
+import os
+import threading
+
+from PIL import Image, ImageDraw
+import numpy as np
+
+from .tiles import RegionIndex, region_boxes
+
+
+class RenderView:
+
+    def __init__(self, width, height, offsets, coords, scale=1, bbox=None, index=None):
+        if scale <= 0:
+            raise ValueError("Render scale must be positive, got " + str(scale))
+
+        # The bounding box is (x0, y0, x1, y1) in world units, the whole world when not given
+        x0, y0, x1, y1 = bbox if bbox is not None else (0, 0, width, height)
+        if x1 <= x0 or y1 <= y0:
+            raise ValueError("Empty render bounding box " + str(bbox))
+        self.origin = (x0, y0)
+        self.scale = scale
+        self.size = (max(1, int(math.ceil((x1 - x0) * scale))), max(1, int(math.ceil((y1 - y0) * scale))))
+
+        # Every regions vertices in output space, as the flat [x0, y0, x1, y1, ...] lists ImageDraw takes
+        flat = ((np.asarray(coords, dtype=np.float64) - self.origin) * scale).ravel().tolist()
+        bounds = (2 * np.asarray(offsets)).tolist()
+        self.polygons = [flat[bounds[region]:bounds[region + 1]] for region in range(0, len(bounds) - 1)]
+
+        self.raster = None
+        self.offsets = offsets
+        self.coords = coords
+        self.cell_sizes = None
+
+        # Without a bounding box every region is visible
+        self.visible = None
+        if bbox is not None:
+            if index is None:
+                index = RegionIndex(offsets, coords, width, height)
+            self.visible = np.zeros(len(self.polygons), dtype=bool)
+            self.visible[index.query(x0, y0, x1, y1)] = True
+
+    # Raster of the view where every pixel holds the index of its region plus one, 0 where no region was drawn
+    # Regions are drawn in order just like the draws fill them, so any per-region color can be looked up through it
+    def region_raster(self):
+        if self.raster is None:
+            im = Image.new("I", self.size, 0)
+            draw = ImageDraw.Draw(im)
+            for index in self.indices():
+                draw.polygon(self.polygon(index), fill=index + 1)
+            self.raster = np.asarray(im)
+        return self.raster
+
+    # On-screen size of a regions cell in pixels, the smaller side of its bounding box
+    def cell_size(self, index):
+        if self.cell_sizes is None:
+            boxes = region_boxes(self.offsets, self.coords)
+            self.cell_sizes = (np.minimum(boxes[:, 2] - boxes[:, 0], boxes[:, 3] - boxes[:, 1]) * self.scale).tolist()
+        return self.cell_sizes[index]
+
+    # The four corners of the image, for filling its background
+    def frame(self):
+        width, height = self.size
+        return ((0, 0), (0, height), (width, height), (width, 0))
+
+    def polygon(self, index):
+        return self.polygons[index]
+
+    # A world position in output space
+    def point(self, position):
+        return ((position[0] - self.origin[0]) * self.scale, (position[1] - self.origin[1]) * self.scale)
+
+    # A polyline of world positions (an (n, 2) array) in output space, as a flat list for ImageDraw.line
+    def line(self, points):
+        return ((np.asarray(points, dtype=np.float64) - self.origin) * self.scale).ravel().tolist()
+
+    # A length in output pixels, line widths and font sizes never drop below one pixel
+    def length(self, value):
+        return max(1, int(round(value * self.scale)))
+
+    # Indexes of every region within the view, in order
+    def indices(self):
+        if self.visible is None:
+            return range(0, len(self.polygons))
+        return np.flatnonzero(self.visible).tolist()
+
+    # The regions of a list that are within the view, in order
+    def regions(self, regions):
+        if self.visible is None:
+            return regions
+        return [region for region in regions if self.visible[region.index]]
+
+
+# Renders several layers over the same view, layers maps every layer name to (background, region colors)
+# Every region is visited once and drawn into every layer, or with threads every layer is drawn by its own thread
+def render_layers(view, layers, threads=None):
+    images = {name: Image.new("RGB", view.size, background) for name, (background, colors) in layers.items()}
+    indices = view.indices()
+
+    if threads is not None and threads > 1 and len(layers) > 1:
+        def render_one(name):
+            draw = ImageDraw.Draw(images[name])
+            colors = layers[name][1]
+            for index in indices:
+                draw.polygon(view.polygon(index), fill=colors[index])
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(render_one, layers))
+        return images
+
+    draws = [(ImageDraw.Draw(images[name]), colors) for name, (background, colors) in layers.items()]
+    for index in indices:
+        polygon = view.polygon(index)
+        for draw, colors in draws:
+            draw.polygon(polygon, fill=colors[index])
+    return images
+
+
+# Output formats of the ImageWriter, by name along with their file extension
+image_formats = {"png": ".png", "tiff": ".tiff", "npy": ".npy"}
+
+
+# Encodes and writes images on a pool of threads, so the next image is drawn while the last ones are encoded
+# Encoding releases the GIL, so several images encode at once. At most max_pending images wait at a time, which keeps
+# full size worlds from piling up in memory: a save blocks until a slot is free.
+#
+#   with ImageWriter("png", compress_level=1) as writer:
+#       writer.save(im, "output/output.png")
+class ImageWriter:
+
+    def __init__(self, format="png", compress_level=6, workers=None, max_pending=None):
+        if format not in image_formats:
+            raise ValueError("Unknown image format " + str(format) + ", expected one of " + ", ".join(sorted(image_formats)))
+        self.format = format
+        self.compress_level = compress_level
+        self.workers = workers if workers is not None else min(8, os.cpu_count() or 1)
+        self.pool = ThreadPoolExecutor(max_workers=self.workers)
+        self.slots = threading.BoundedSemaphore(max_pending if max_pending is not None else self.workers + 1)
+        self.futures = []
+
+    # The path an image is written to, the extension follows the format
+    def path(self, path):
+        return os.path.splitext(path)[0] + image_formats[self.format]
+
+    def write(self, im, path):
+        try:
+            if self.format == "npy":
+                np.save(path, np.asarray(im))
+            elif self.format == "tiff":
+                im.save(path, format="TIFF")
+            else:
+                im.save(path, format="PNG", compress_level=self.compress_level)
+        finally:
+            self.slots.release()
+
+    # Queues an image to be written, returning the path it goes to
+    def save(self, im, path):
+        path = self.path(path)
+        self.slots.acquire()
+        self.futures.append(self.pool.submit(self.write, im, path))
+        return path
+
+    # Waits for every queued image, raising the first error any of them had
+    def wait(self):
+        futures, self.futures = self.futures, []
+        for future in futures:
+            future.result()
+
+    def close(self):
+        try:
+            self.wait()
+        finally:
+            self.pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
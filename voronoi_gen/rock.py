@@ -0,0 +1,130 @@
+import numpy as np
+from PIL import ImageColor
+
+# The rock types, in the order they are layered from the top down
+rock_types = ["Sedimentary", "Igneous", "Metamorphic"]
+
+# Layer positions within a rock layer stack
+SEDIMENTARY_LAYER = 0
+IGNEOUS_LAYER = 1
+METAMORPHIC_LAYER = 2
+
+# Rock database list
+# Rocks are referenced everywhere by their integer rock id, which is their position within the database
+class RockDatabase:
+
+    def __init__(self):
+
+        # Entries in insertion order, a rocks id is its position within this list
+        self.entries = []
+
+        # Lookup of rock id by rock name
+        self.db = {}
+
+        # Debug layer
+        Debug = RockTableEntry("Debug", "red", "Sedimentary", 0.8, "Debug")
+
+        # Building the sedimentary layers
+        Dolomite = RockTableEntry("Dolomite", "#5B5B50", "Sedimentary", 0.60, "Marble")
+        Shale = RockTableEntry("Shale", "#56565B", "Sedimentary", 0.85, "Slate")
+        Limestone = RockTableEntry("Limestone", "#6A6A6B", "Sedimentary", 0.55, "Marble")
+        Siltstone = RockTableEntry("Siltstone", "#7F6C6B", "Sedimentary", 0.35, "Quartzite")
+
+        # Building the igneous layers
+        # Basalt forms the ocean floor, granite forms beneath the continents
+        Basalt = RockTableEntry("Basalt", "#3B3B3D", "Igneous", 0.90, "Amphibolite")
+        Granite = RockTableEntry("Granite", "#A59C94", "Igneous", 0.95, "Gneiss")
+
+        # Building the metamorphic layers
+        Marble = RockTableEntry("Marble", "#D9D6CF", "Metamorphic", 0.70, "Marble")
+        Slate = RockTableEntry("Slate", "#4B5459", "Metamorphic", 0.75, "Slate")
+        Quartzite = RockTableEntry("Quartzite", "#C9BFB2", "Metamorphic", 1.00, "Quartzite")
+        Amphibolite = RockTableEntry("Amphibolite", "#3F4A3C", "Metamorphic", 0.85, "Amphibolite")
+        Gneiss = RockTableEntry("Gneiss", "#8C8478", "Metamorphic", 0.90, "Gneiss")
+
+        for rock in [Debug, Dolomite, Shale, Limestone, Siltstone, Basalt, Granite, Marble, Slate, Quartzite, Amphibolite, Gneiss]:
+            self.addRockEntry(rock)
+
+        # Assigning a default list for the land-based rocks
+        self.land_default = [Dolomite.rock_id, Shale.rock_id, Siltstone.rock_id]
+
+        # Assigning some default values
+        self.defaultRock = Limestone.rock_id
+        self.oceanic_igneous = Basalt.rock_id
+        self.continental_igneous = Granite.rock_id
+
+        # Building the lookup arrays, indexed by rock id
+        self.hardness = np.array([rock.rock_hardness for rock in self.entries], dtype=np.float64)
+        self.colors = np.array([ImageColor.getrgb(rock.rock_color) for rock in self.entries], dtype=np.uint8)
+        self.types = np.array([rock_types.index(rock.rock_type) for rock in self.entries], dtype=np.int8)
+
+        # What every rock turns into under extreme pressure or heat
+        self.metamorphosis = np.array([self.db[rock.metamorphic_form] for rock in self.entries], dtype=np.int8)
+
+    def addRockEntry(self, rock):
+        rock.rock_id = len(self.entries)
+        self.entries.append(rock)
+        self.db[rock.rock_name] = rock.rock_id
+
+    def get_entry(self, rock_id):
+        return self.entries[rock_id]
+
+    def get_id(self, rock_name):
+        return self.db[rock_name]
+
+    def getDefaultLandRock(self, rng):
+        length = len(self.land_default)
+        random_index = rng.integers(0, length)
+        return_rock = self.land_default[random_index]
+        return return_rock
+
+    def getDefaultOceanRock(self):
+        return self.defaultRock
+
+# Entry class
+class RockTableEntry:
+
+    def __init__(self, rock_name, rock_color, rock_type, rock_hardness, metamorphic_form):
+
+        # Defining all of the inforamtion we need for a layer
+        self.rock_name = rock_name
+        self.rock_color = rock_color
+        self.rock_type = rock_type
+        self.rock_hardness = rock_hardness
+
+        # Name of the rock this one becomes under pressure
+        self.metamorphic_form = metamorphic_form
+
+        # Assigned when the entry is added to the database
+        self.rock_id = -1
+
+# Rock database shared by everything
+rockDatabase = RockDatabase()
+
+# Object that contains the rock layers of every region
+# Stored as an int8 matrix of rock ids with a row per region, layer 0 is the top layer and -1 marks an empty layer
+class RockLayerStack:
+
+    def __init__(self, region_count, depth=3):
+        self.layers = np.full((region_count, depth), -1, dtype=np.int8)
+
+    # Top rock of every region
+    def top(self):
+        return self.layers[:, SEDIMENTARY_LAYER]
+
+    # Hardness of every region at the given layer
+    def hardness(self, layer=SEDIMENTARY_LAYER, database=rockDatabase):
+        return database.hardness[self.layers[:, layer]]
+
+    # Function that fills in the strata below the top layer
+    # land is a boolean array of land regions, collision is a boolean array of regions where tectonic plates meet
+    def build_strata(self, land, collision, database=rockDatabase):
+        top = self.layers[:, SEDIMENTARY_LAYER]
+
+        # Igneous rock forms from cooled magma, basalt under the oceans and granite under the continents
+        igneous = np.where(land, database.continental_igneous, database.oceanic_igneous).astype(np.int8)
+        self.layers[:, IGNEOUS_LAYER] = igneous
+
+        # Metamorphic rock sits at the bottom, formed from the igneous layer above it
+        # Where tectonic plates meet the pressure is high enough to transform the sedimentary layer instead
+        self.layers[:, METAMORPHIC_LAYER] = np.where(collision, database.metamorphosis[top], database.metamorphosis[igneous])
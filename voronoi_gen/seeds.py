@@ -0,0 +1,40 @@
+# File that manages the random number streams used during generation
+# Every world has a tree of seeds. Each stage (and each plate within a stage) derives its own independent
+# numpy Generator from the root seed and a key, so changing one stage never perturbs another
+import zlib
+import numpy as np
+
+
+# Helper for turning a key (an integer or a name) into a spawn key value
+def key_value(key):
+    if isinstance(key, str):
+        return zlib.crc32(key.encode("utf-8"))
+
+    return int(key)
+
+
+class SeedTree:
+
+    def __init__(self, seed=None):
+
+        # Accepting another tree, a seed sequence, an integer, or nothing at all for fresh entropy
+        if isinstance(seed, SeedTree):
+            seed = seed.root
+
+        if isinstance(seed, np.random.SeedSequence):
+            self.root = seed
+        else:
+            self.root = np.random.SeedSequence(None if seed == "None" else seed)
+
+    # Seed sequence for the given keys, e.g. sequence("plate", 3)
+    def sequence(self, *keys):
+        spawn_key = self.root.spawn_key + tuple(key_value(key) for key in keys)
+        return np.random.SeedSequence(self.root.entropy, spawn_key=spawn_key)
+
+    # Sub tree for the given keys, everything derived from it is independent of the rest of the tree
+    def child(self, *keys):
+        return SeedTree(self.sequence(*keys))
+
+    # Fresh generator for the given keys, the same keys always give the same stream
+    def generator(self, *keys):
+        return np.random.Generator(np.random.PCG64(self.sequence(*keys)))
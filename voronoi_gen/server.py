@@ -0,0 +1,256 @@
+# Local tile and query server for saved worlds
+# Serves the worlds saved with python -m voronoi_gen --save-world DIR (or World.save) without regenerating them.
+# Worlds are memory-mapped when first asked for, tiles render on demand through tiles.py, and every response is kept
+# in a shared LRU cache so repeated requests never render twice. Requests are handled on a thread each.
+#
+#   python -m voronoi_gen.server worlds/ --port 8000
+#
+#   GET /                                      saved worlds
+#   GET /worlds/<name>                         size, region count, layers and zoom levels
+#   GET /worlds/<name>/tiles/<layer>/<z>/<x>/<y>.png
+#   GET /worlds/<name>/at?x=<x>&y=<y>          the region at a point
+#   GET /worlds/<name>/regions/<index>         every field of one region
+import argparse
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import threading
+from urllib.parse import urlparse, parse_qs
+
+from scipy.spatial import cKDTree
+
+from .layers import layers
+from .tiles import TileCache, TileRenderer
+from .world import World
+
+
+# Bounded in-memory cache of response bodies, dropping the least recently used past max_bytes
+class ResponseCache:
+
+    def __init__(self, max_bytes=64 << 20):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def put(self, key, value):
+        body = value[1]
+        with self.lock:
+            if key in self.entries:
+                self.size -= len(self.entries.pop(key)[1])
+            self.entries[key] = value
+            self.size += len(body)
+            while self.size > self.max_bytes and len(self.entries) > 1:
+                self.size -= len(self.entries.popitem(last=False)[1][1])
+
+
+# One loaded world along with everything built over it to answer requests
+class ServedWorld:
+
+    def __init__(self, name, world, tile_cache=None):
+        self.name = name
+        self.world = world
+        self.renderer = TileRenderer(world, cache=tile_cache)
+
+        # Regions are the voronoi cells of their points, so the region at a point is the one with the nearest point
+        self.tree = cKDTree(world["points"])
+
+    def region_at(self, x, y):
+        return int(self.tree.query((x, y))[1])
+
+    def region(self, index):
+        world = self.world
+        fields = {name: column[index].item() for name, column in world.columns.items()}
+        return {
+            "index": index,
+            "center": world["centers"][index].tolist(),
+            "edge": bool(world.columns["edge"][index]),
+            "vertices": world.vertices(index).tolist(),
+            "neighbors": sorted(world.neighbors(index).tolist()),
+            "fields": fields,
+        }
+
+    def info(self):
+        return {
+            "name": self.name,
+            "width": self.world.width,
+            "height": self.world.height,
+            "regions": len(self.world),
+            "layers": sorted(layers),
+            "tile_size": self.renderer.tile_size,
+            "max_zoom": self.renderer.max_zoom(),
+        }
+
+
+# The saved worlds of a directory, loaded the first time they are asked for
+# The directory is either a single saved world or holds one saved world per subdirectory
+class WorldStore:
+
+    def __init__(self, root, tile_cache_dir=None, max_tiles=4096):
+        self.root = root
+        self.tile_cache_dir = tile_cache_dir
+        self.max_tiles = max_tiles
+        self.loaded = {}
+        self.lock = threading.Lock()
+
+    def paths(self):
+        if os.path.exists(os.path.join(self.root, "world.json")):
+            return {os.path.basename(os.path.normpath(self.root)): self.root}
+        paths = {}
+        for name in sorted(os.listdir(self.root)):
+            path = os.path.join(self.root, name)
+            if os.path.exists(os.path.join(path, "world.json")):
+                paths[name] = path
+        return paths
+
+    def names(self):
+        return list(self.paths())
+
+    # The served world of a name, None when there is no such world
+    def get(self, name):
+        with self.lock:
+            if name not in self.loaded:
+                path = self.paths().get(name)
+                if path is None:
+                    return None
+                tile_cache = None
+                if self.tile_cache_dir is not None:
+                    tile_cache = TileCache(os.path.join(self.tile_cache_dir, name), self.max_tiles)
+                self.loaded[name] = ServedWorld(name, World.load(path), tile_cache)
+            return self.loaded[name]
+
+
+class NotFound(Exception):
+    pass
+
+
+class BadRequest(Exception):
+    pass
+
+
+class WorldRequestHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        key = url.path + ("?" + url.query if url.query else "")
+
+        response = self.server.responses.get(key)
+        if response is None:
+            try:
+                response = self.route(url.path.strip("/").split("/"), parse_qs(url.query))
+            except NotFound as error:
+                return self.send_json(404, {"error": str(error)})
+            except BadRequest as error:
+                return self.send_json(400, {"error": str(error)})
+            self.server.responses.put(key, response)
+
+        self.send(200, response[0], response[1])
+
+    def route(self, parts, query):
+        if parts == [""]:
+            return json_response({"worlds": self.server.store.names()})
+        if parts[0] != "worlds" or len(parts) < 2:
+            raise NotFound("No such path")
+
+        served = self.server.store.get(parts[1])
+        if served is None:
+            raise NotFound("No world " + parts[1])
+        rest = parts[2:]
+
+        if not rest:
+            return json_response(served.info())
+
+        if rest[0] == "tiles" and len(rest) == 5 and rest[4].endswith(".png"):
+            layer = rest[1]
+            if layer not in layers:
+                raise NotFound("No layer " + layer)
+            z, x, y = integers(rest[2], rest[3], rest[4][:-len(".png")])
+            try:
+                return "image/png", served.renderer.tile(layer, z, x, y)
+            except ValueError as error:
+                raise NotFound(str(error))
+
+        if rest == ["at"]:
+            if "x" not in query or "y" not in query:
+                raise BadRequest("at needs x and y")
+            try:
+                x, y = float(query["x"][0]), float(query["y"][0])
+            except ValueError:
+                raise BadRequest("x and y must be numbers")
+            return json_response(served.region(served.region_at(x, y)))
+
+        if rest[0] == "regions" and len(rest) == 2:
+            index = integers(rest[1])[0]
+            if not 0 <= index < len(served.world):
+                raise NotFound("No region " + str(index))
+            return json_response(served.region(index))
+
+        raise NotFound("No such path")
+
+    def send_json(self, status, value):
+        content_type, body = json_response(value)
+        self.send(status, content_type, body)
+
+    def send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            BaseHTTPRequestHandler.log_message(self, format, *args)
+
+
+def json_response(value):
+    return "application/json", json.dumps(value).encode()
+
+
+def integers(*values):
+    try:
+        return [int(value) for value in values]
+    except ValueError:
+        raise BadRequest("Expected integers, got " + "/".join(values))
+
+
+# Builds the server without starting it, serve_forever() runs it
+def make_server(root, host="127.0.0.1", port=8000, tile_cache_dir=None, max_tiles=4096, cache_bytes=64 << 20, verbose=False):
+    server = ThreadingHTTPServer((host, port), WorldRequestHandler)
+    server.store = WorldStore(root, tile_cache_dir, max_tiles)
+    server.responses = ResponseCache(cache_bytes)
+    server.verbose = verbose
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="voronoi_gen.server", description="Serve tiles and region queries of saved worlds")
+    parser.add_argument("worlds", help="a saved world, or a directory of saved worlds")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--tile-cache", default=None, metavar="DIR", help="also keep rendered tiles on disk in DIR")
+    parser.add_argument("--max-tiles", type=int, default=4096, help="tiles kept on disk per world")
+    parser.add_argument("--cache-mb", type=int, default=64, help="memory kept for cached responses")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.worlds, args.host, args.port, args.tile_cache, args.max_tiles, args.cache_mb << 20, args.verbose)
+    print("Serving " + args.worlds + " on http://" + args.host + ":" + str(server.server_address[1]))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
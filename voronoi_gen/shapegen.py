@@ -0,0 +1,199 @@
+# Imports
+import numpy as np
+
+
+debug = 0
+
+# Default shapes
+
+# Square
+square = [(0.2,0),(1,0),(1,1),(0,1)]
+
+# Diamond
+diamond = [(0.5,0),(1,0.5),(0.5,1),(0,0.5)]
+
+# Triangle
+triangle = [(0.2,1),(0.5,0),(1,1)]
+
+# List
+shapeList = [square, diamond, triangle]
+
+# Options for randomizing the position of the shape
+# Pretend this is a fraction, 'smaller' number = more centralized shapes
+center_power = (5, 7)
+
+# Helper for building a counter-clockwise rotation matrix, angle is in radians
+def rotation_matrix(angle):
+    return np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]])
+
+# Helper for building a matrix that stretches by value along the given angle (in degrees)
+# The perpendicular direction is squeezed by the same amount so the area of the shape is kept
+def stretch_matrix(angle, value):
+    direction = rotation_matrix(np.deg2rad(angle))
+    stretch = np.diag([np.sqrt(value), 1 / np.sqrt(value)])
+    return direction @ stretch @ direction.T
+
+# Class for containing shape information
+# The vertex list is an (N, 2) numpy array of points
+class Shape:
+
+    def __init__(self, volatility, scale, eschew, numSubdivisions, finalScaleRange, dimensions, tectonic, SEED):
+
+        # Generator used for building the shape itself
+        # SEED can be a seed value or a numpy Generator, usually the plates own stream from the worlds SeedTree
+        self.rng = np.random.default_rng(SEED)
+
+        # Generating a random shape
+        self.volatility = volatility
+        self.eschew = eschew
+        self.subdivision_count = 1
+        self.finalScaleRange = finalScaleRange
+        # Selecting a random shape
+        self.vertex_list = np.array(shapeList[self.rng.integers(0, len(shapeList))], dtype=np.float64)
+        self.shape_index = -1
+        self.tectonic = tectonic
+        self.dimensions = dimensions
+
+        self.base_rock = -1
+
+        # Subdividing
+        for x in range(0,numSubdivisions):
+            self.subdivide()
+
+        # Random rotation
+        randomRotation = self.rng.integers(0,360)
+
+        # Generating the random scale
+        randomScaleDirection = self.rng.integers(0,359)
+        if (finalScaleRange[0] == finalScaleRange[1]):
+            randomScaleValue = finalScaleRange[0]
+        else:
+            minVal = round(finalScaleRange[0] * 100)
+            maxVal = round(finalScaleRange[1] * 100)
+            randomScaleValue = self.rng.integers(minVal, maxVal)
+            randomScaleValue = randomScaleValue / 100
+
+        # Finally, randomly positioning our object within the range...
+        x_offset = self.rng.integers(-center_power[0] * round(dimensions[0] / center_power[1]), center_power[0] * round(dimensions[0] / center_power[1]))
+        y_offset = self.rng.integers(-center_power[0] * round(dimensions[1] / center_power[1]), center_power[0] * round(dimensions[1] / center_power[1]))
+
+        # Composing the rotation, the scale and the random scale into a single matrix around our center
+        # Loading to the middle and offsetting then just moves that center, so everything is applied at once
+        matrix = stretch_matrix(randomScaleDirection, randomScaleValue) @ (scale * rotation_matrix(np.deg2rad(randomRotation)))
+        target = (dimensions[0] / 2 + x_offset, dimensions[1] / 2 + y_offset)
+
+        self.transform(matrix, self.vertex_list.mean(axis=0), target)
+
+    def initSpecial(self, vertex_list, volatility, eschew):
+        self.vertex_list = np.array(vertex_list, dtype=np.float64)
+        self.volatility = volatility
+        self.eschew = eschew
+        self.subdivision_count = 1
+
+        if not hasattr(self, "rng"):
+            self.rng = np.random.default_rng()
+
+    def subdivide(self):
+        if (debug):
+            print(self.vertex_list)
+
+        # First we need to find all of the middlepoints, between every point and the one after it
+        start = self.vertex_list
+        end = np.roll(start, -1, axis=0)
+        middle = (start + end) / 2
+
+        # Calculating the inverse slope
+        rise = end[:, 1] - start[:, 1]
+        run = end[:, 0] - start[:, 0]
+
+        slope = np.full(len(start), 100.0)
+        np.divide(rise, run, out=slope, where=run != 0)
+
+        # Calculating the inverse
+        inverse_slope = np.full(len(start), 100.0)
+        np.divide(-1, slope, out=inverse_slope, where=slope != 0)
+
+        # Calculating V, from the middle to where the inverse line crosses x = 0
+        v = -middle[:, 0:1] * np.stack((np.ones(len(start)), inverse_slope), axis=1)
+
+        # Calculating U
+        bottom = np.hypot(v[:, 0], v[:, 1])
+        bottom[bottom == 0] = 0.001
+        u = v / bottom[:, np.newaxis]
+
+        # Calculating strength
+        strength = self.rng.integers(self.eschew[0], self.eschew[1], size=len(start)) / 10
+        strength[self.rng.integers(0, 100, size=len(start)) > 50] *= -1
+
+        middle += (strength * (self.volatility / self.subdivision_count))[:, np.newaxis] * u
+
+        # Interleaving the middles after each of their starting points
+        newpoints = np.empty((2 * len(start), 2))
+        newpoints[0::2] = start
+        newpoints[1::2] = middle
+
+        self.vertex_list = newpoints
+
+        self.subdivision_count = self.subdivision_count + 4
+
+    def draw(self):
+        # Matplotlib is only needed for the debug drawing, so it's only imported here
+        import matplotlib.pyplot as plt
+
+        # Closing the shape with the first point
+        x = np.append(self.vertex_list[:, 0], self.vertex_list[0, 0])
+        y = np.append(self.vertex_list[:, 1], self.vertex_list[0, 1])
+
+        # Plotting and showing the final amount
+        plt.plot(x,y)
+        plt.show()
+
+    # Function that applies an affine transform to every point
+    # Points are moved relative to origin by the matrix, and origin itself is placed at target
+    def transform(self, matrix, origin=(0, 0), target=None):
+        origin = np.asarray(origin, dtype=np.float64)
+        if target is None:
+            target = origin
+
+        self.vertex_list = (self.vertex_list - origin) @ np.asarray(matrix).T + target
+
+    def rotate(self, angle=3.14159/4):
+        # Rotating around the center
+        self.transform(rotation_matrix(angle), self.vertex_list.mean(axis=0))
+
+    def scale(self, scale):
+        # Scaling all points
+        self.transform(scale * np.identity(2))
+
+    def random_scale(self, rotation, value):
+        # Randomly scaling in a certain direction
+        if (debug):
+            print("Randomly scaling with angle of " + str(rotation) + " and strength of " + str(value))
+
+        # Stretching everything in the given angle by the given value, around our center
+        self.transform(stretch_matrix(rotation, value), self.vertex_list.mean(axis=0))
+
+    # Function that adds an offset value
+    def offset(self, x_offset, y_offset):
+        self.vertex_list = self.vertex_list + (x_offset, y_offset)
+
+    def load_to_zero(self):
+        # Taking the shape and ensuring the smallest numeric value is 0
+        smallest = self.vertex_list.min(axis=0)
+
+        # Allowing us to stay not perfectly close
+        smallest = smallest * 0.9
+
+        # Taking this information and offsetting everything
+        self.offset(-smallest[0], -smallest[1])
+
+    def load_to_middle(self):
+        # Taking the shape and moving its center to the middle of the dimensions
+        center = self.vertex_list.mean(axis=0)
+
+        # Loading the entire shape to the middle now
+        adjust_x = self.dimensions[0] / 2 - center[0]
+        adjust_y = self.dimensions[1] / 2 - center[1]
+
+        # Taking this information and offsetting everything
+        self.offset(adjust_x, adjust_y)
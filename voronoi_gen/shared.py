@@ -0,0 +1,60 @@
+# Numpy arrays living in shared memory
+# A SharedArray is created once by the parent, child processes attach to it by its descriptor and get a zero-copy view
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class SharedArray:
+
+    def __init__(self, memory, shape, dtype, owner):
+        self.memory = memory
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+
+        # Only the process that created the block unlinks it
+        self.owner = owner
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=memory.buf)
+
+    # New block holding a copy of the array (or an empty one of the given shape and dtype)
+    @classmethod
+    def create(cls, array=None, shape=None, dtype=None):
+        if array is not None:
+            array = np.ascontiguousarray(array)
+            shape, dtype = array.shape, array.dtype
+
+        dtype = np.dtype(dtype)
+        size = max(1, int(np.prod(shape)) * dtype.itemsize)
+        shared = cls(shared_memory.SharedMemory(create=True, size=size), shape, dtype, True)
+        if array is not None:
+            shared.array[...] = array
+        return shared
+
+    # Attaches to a block from its descriptor, e.g. within a child process
+    @classmethod
+    def attach(cls, descriptor):
+        name, shape, dtype = descriptor
+        return cls(shared_memory.SharedMemory(name=name), shape, dtype, False)
+
+    # Small picklable description of the block, all a child needs to attach to it
+    def descriptor(self):
+        return (self.memory.name, self.shape, self.dtype.str)
+
+    # Views taken from the array point into the block, they must not be used after closing it
+    def close(self):
+        self.array = None
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Closes every shared array of a dictionary
+def close_all(shared):
+    for array in shared.values():
+        array.close()
@@ -0,0 +1,236 @@
+# Slippy-map tiles of a generated world
+# The world is cut into a z/x/y pyramid of square tiles: zoom 0 is a single tile over the whole map, every zoom level
+# doubles the tiles along both axes, and the last level renders at (at least) one pixel per world unit.
+# Tiles are only rendered when asked for, from the regions a grid index finds within their bounds, and every rendered
+# tile goes into an on-disk cache that forgets the least recently used tiles once it is full.
+#
+#   renderer = TileRenderer(World.from_wrapper(m.v), cache=TileCache("output/tiles"))
+#   png = renderer.tile("biome", 3, 2, 5)
+from collections import OrderedDict
+import io
+import math
+import os
+import threading
+
+from PIL import Image, ImageDraw
+import numpy as np
+
+from .layers import get_layer
+
+default_tile_size = 256
+
+
+# Side of the square the pyramid covers, worlds that aren't square leave the rest of it as background
+def pyramid_extent(width, height):
+    return max(width, height)
+
+
+# The zoom level at which tiles reach one pixel per world unit
+def max_zoom(width, height, tile_size=default_tile_size):
+    return max(0, int(math.ceil(math.log2(pyramid_extent(width, height) / tile_size))))
+
+
+# World bounds of a tile, (x0, y0, x1, y1)
+def tile_bounds(width, height, z, x, y):
+    side = pyramid_extent(width, height) / (1 << z)
+    return x * side, y * side, (x + 1) * side, (y + 1) * side
+
+
+def valid_tile(width, height, z, x, y, tile_size=default_tile_size):
+    return 0 <= z <= max_zoom(width, height, tile_size) and 0 <= x < (1 << z) and 0 <= y < (1 << z)
+
+
+# Bounding box (x0, y0, x1, y1) of every region from the flat vertex arrays
+# Regions without vertices get an empty box that nothing intersects
+def region_boxes(offsets, coords):
+    offsets = np.asarray(offsets)
+    coords = np.asarray(coords)
+    present = np.flatnonzero(np.diff(offsets) > 0)
+
+    boxes = np.empty((len(offsets) - 1, 4), dtype=np.float64)
+    boxes[:, :2] = np.inf
+    boxes[:, 2:] = -np.inf
+    if len(present) > 0:
+        starts = offsets[present]
+        boxes[present, 0] = np.minimum.reduceat(coords[:, 0], starts)
+        boxes[present, 1] = np.minimum.reduceat(coords[:, 1], starts)
+        boxes[present, 2] = np.maximum.reduceat(coords[:, 0], starts)
+        boxes[present, 3] = np.maximum.reduceat(coords[:, 1], starts)
+    return boxes
+
+
+# Uniform grid over the bounding boxes of the regions, finds every region that can intersect an area
+class RegionIndex:
+
+    def __init__(self, offsets, coords, width, height, cell_size=None):
+        region_count = len(offsets) - 1
+        present = np.flatnonzero(np.diff(offsets) > 0)
+        self.boxes = region_boxes(offsets, coords)
+
+        # Cells a few regions across by default
+        if cell_size is None:
+            cell_size = 4 * math.sqrt(width * height / max(1, region_count))
+        self.cell_size = cell_size
+        self.grid_x = max(1, int(math.ceil(width / cell_size)))
+        self.grid_y = max(1, int(math.ceil(height / cell_size)))
+
+        # Every region goes into each cell its box touches
+        cx0, cy0 = self.cells(self.boxes[present, 0], self.boxes[present, 1])
+        cx1, cy1 = self.cells(self.boxes[present, 2], self.boxes[present, 3])
+        span_x = cx1 - cx0 + 1
+        cell_counts = span_x * (cy1 - cy0 + 1)
+
+        region = np.repeat(present, cell_counts)
+        local = np.arange(cell_counts.sum()) - np.repeat(np.cumsum(cell_counts) - cell_counts, cell_counts)
+        span_x = np.repeat(span_x, cell_counts)
+        cell = (np.repeat(cy0, cell_counts) + local // span_x) * self.grid_x + np.repeat(cx0, cell_counts) + local % span_x
+
+        order = np.argsort(cell, kind="stable")
+        self.cell_regions = region[order]
+        self.cell_offsets = np.concatenate(([0], np.cumsum(np.bincount(cell, minlength=self.grid_x * self.grid_y))))
+
+    # Grid cell of world positions, clamped to the grid
+    def cells(self, x, y):
+        cx = np.clip(np.floor(np.asarray(x) / self.cell_size).astype(np.int64), 0, self.grid_x - 1)
+        cy = np.clip(np.floor(np.asarray(y) / self.cell_size).astype(np.int64), 0, self.grid_y - 1)
+        return cx, cy
+
+    # Every region whose bounding box intersects the bounds, in region order
+    def query(self, x0, y0, x1, y1):
+        cx0, cy0 = self.cells(x0, y0)
+        cx1, cy1 = self.cells(x1, y1)
+
+        found = []
+        for cy in range(int(cy0), int(cy1) + 1):
+            first = cy * self.grid_x
+            found.append(self.cell_regions[self.cell_offsets[first + cx0]:self.cell_offsets[first + cx1 + 1]])
+        regions = np.unique(np.concatenate(found))
+
+        boxes = self.boxes[regions]
+        inside = (boxes[:, 0] <= x1) & (boxes[:, 2] >= x0) & (boxes[:, 1] <= y1) & (boxes[:, 3] >= y0)
+        return regions[inside]
+
+
+# On-disk tile cache, keeping at most max_tiles tiles and dropping the least recently used ones past that
+# Tiles are stored as directory/layer/z/x/y.png, a directory belongs to a single world
+class TileCache:
+
+    def __init__(self, directory, max_tiles=4096):
+        self.directory = directory
+        self.max_tiles = max_tiles
+        self.lock = threading.Lock()
+
+        # Tiles already on disk are picked back up, oldest first
+        self.entries = OrderedDict()
+        found = []
+        for root, dirs, files in os.walk(directory):
+            for name in files:
+                if name.endswith(".png"):
+                    path = os.path.join(root, name)
+                    found.append((os.path.getmtime(path), path))
+        for mtime, path in sorted(found):
+            self.entries[path] = True
+        self.evict()
+
+    def path(self, layer, z, x, y):
+        return os.path.join(self.directory, layer, str(z), str(x), str(y) + ".png")
+
+    def get(self, layer, z, x, y):
+        path = self.path(layer, z, x, y)
+        with self.lock:
+            if path not in self.entries:
+                return None
+            self.entries.move_to_end(path)
+        try:
+            with open(path, "rb") as file:
+                return file.read()
+        except FileNotFoundError:
+            with self.lock:
+                self.entries.pop(path, None)
+            return None
+
+    def put(self, layer, z, x, y, data):
+        path = self.path(layer, z, x, y)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Written aside and moved into place, so readers never see half a tile
+        temporary = path + "." + str(threading.get_ident()) + ".tmp"
+        with open(temporary, "wb") as file:
+            file.write(data)
+        os.replace(temporary, path)
+
+        with self.lock:
+            self.entries[path] = True
+            self.entries.move_to_end(path)
+            self.evict()
+
+    def evict(self):
+        while len(self.entries) > self.max_tiles:
+            path, _ = self.entries.popitem(last=False)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def __len__(self):
+        return len(self.entries)
+
+
+# Renders the tiles of every layer of a World on demand
+class TileRenderer:
+
+    def __init__(self, world, tile_size=default_tile_size, cache=None):
+        self.world = world
+        self.tile_size = tile_size
+        self.cache = cache
+        self.index = RegionIndex(world["vertex_offsets"], world["vertex_coords"], world.width, world.height)
+
+        # Region colors of every layer asked for so far
+        self.colors = {}
+        self.lock = threading.Lock()
+
+    def max_zoom(self):
+        return max_zoom(self.world.width, self.world.height, self.tile_size)
+
+    def layer_colors(self, layer):
+        with self.lock:
+            if layer.name not in self.colors:
+                self.colors[layer.name] = [tuple(color) for color in layer.colors(self.world).tolist()]
+            return self.colors[layer.name]
+
+    # Renders one tile into an image
+    def render(self, layer_name, z, x, y):
+        if not valid_tile(self.world.width, self.world.height, z, x, y, self.tile_size):
+            raise ValueError("No tile " + str(z) + "/" + str(x) + "/" + str(y) + " in a pyramid of " + str(self.max_zoom() + 1) + " levels")
+        layer = get_layer(layer_name)
+        colors = self.layer_colors(layer)
+
+        x0, y0, x1, y1 = tile_bounds(self.world.width, self.world.height, z, x, y)
+        scale = self.tile_size / (x1 - x0)
+
+        im = Image.new("RGB", (self.tile_size, self.tile_size), layer.background)
+        draw = ImageDraw.Draw(im)
+
+        # Every region within the tile, moved into tile pixels
+        offsets = self.world["vertex_offsets"]
+        coords = self.world["vertex_coords"]
+        for region in self.index.query(x0, y0, x1, y1).tolist():
+            vertices = ((coords[offsets[region]:offsets[region + 1]] - (x0, y0)) * scale).tolist()
+            draw.polygon([(vertex[0], vertex[1]) for vertex in vertices], fill=colors[region])
+
+        return im
+
+    # PNG bytes of one tile, from the cache when it has it
+    def tile(self, layer_name, z, x, y):
+        if self.cache is not None:
+            data = self.cache.get(layer_name, z, x, y)
+            if data is not None:
+                return data
+
+        buffer = io.BytesIO()
+        self.render(layer_name, z, x, y).save(buffer, format="PNG")
+        data = buffer.getvalue()
+
+        if self.cache is not None:
+            self.cache.put(layer_name, z, x, y, data)
+        return data
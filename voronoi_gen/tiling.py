@@ -0,0 +1,323 @@
+# Tiled, sharded mesh generation
+# A single Voronoi/Delaunay over the whole map caps worlds at a few hundred thousand cells, so large worlds are split
+# into a grid of shards instead. Every shard generates its own points from its own seed stream, relaxes and meshes
+# them in a separate process along with a halo of its neighbors points, and keeps only the regions it owns.
+# The shards are then stitched into one global numbering (shard by shard, in order) and one adjacency matrix.
+#
+# Points never cross between shards, a shard can regenerate any neighbors points from the seed tree, so the only thing
+# sent between processes are the relaxed points of the neighbors before meshing. With a halo of a few cells more than
+# the relaxation count the owned regions match a single global mesh of the relaxed points. Only a few cells on the map
+# border can differ, where a single mesh has vertices from triangles far larger than any halo.
+#
+# The adjacency matches the delaunay triangulation of all the points exactly. A shard only keeps the triangles whose
+# circumcircle stays within its halo, nothing it can't see could fall inside those. The long thin triangles along the
+# map border have circles far larger than any halo, they come from one more triangulation of a strip of points
+# around the border.
+from concurrent.futures import ProcessPoolExecutor
+import math
+
+import numpy as np
+from scipy import sparse
+from scipy.spatial import Voronoi
+from scipy.spatial import Delaunay
+
+from .seeds import SeedTree
+from .voronoi import clamp_vertices, point_region_vertices, region_geometry
+
+
+# The grid of shards of a world
+class ShardPlan:
+
+    def __init__(self, width, height, count, shards_x, shards_y, halo=None, relaxation_count=0):
+        self.width = width
+        self.height = height
+        self.count = count
+        self.shards_x = shards_x
+        self.shards_y = shards_y
+        self.shard_count = shards_x * shards_y
+
+        # The halo is given in mean cell spacings, by default a few more than the relaxation passes can move a cell
+        self.spacing = math.sqrt(width * height / count)
+        if halo is None or halo <= 0:
+            halo = relaxation_count + 3
+        self.halo = halo * self.spacing
+
+        # Integer shard boundaries, so the integer points of two shards never overlap
+        self.xs = np.round(np.linspace(0, width, shards_x + 1)).astype(np.int64)
+        self.ys = np.round(np.linspace(0, height, shards_y + 1)).astype(np.int64)
+
+        # Points are handed out by area, the remainders going to the shards with the largest fractions
+        areas = np.array([self.area(shard) for shard in range(0, self.shard_count)], dtype=np.float64)
+        share = areas / areas.sum() * count
+        counts = np.floor(share).astype(np.int64)
+        remainder = count - int(counts.sum())
+        counts[np.argsort(-(share - counts), kind="stable")[:remainder]] += 1
+        self.counts = counts
+        self.offsets = np.concatenate(([0], np.cumsum(counts)))
+
+    def bounds(self, shard):
+        x, y = shard % self.shards_x, shard // self.shards_x
+        return int(self.xs[x]), int(self.ys[y]), int(self.xs[x + 1]), int(self.ys[y + 1])
+
+    def area(self, shard):
+        x0, y0, x1, y1 = self.bounds(shard)
+        return (x1 - x0) * (y1 - y0)
+
+    def halo_bounds(self, shard):
+        x0, y0, x1, y1 = self.bounds(shard)
+        return x0 - self.halo, y0 - self.halo, x1 + self.halo, y1 + self.halo
+
+    # Every other shard whose points can fall within our halo
+    def neighbors(self, shard):
+        hx0, hy0, hx1, hy1 = self.halo_bounds(shard)
+        neighbors = []
+        for other in range(0, self.shard_count):
+            if other == shard:
+                continue
+            x0, y0, x1, y1 = self.bounds(other)
+            if x0 < hx1 and hx0 < x1 and y0 < hy1 and hy0 < y1:
+                neighbors.append(other)
+        return neighbors
+
+
+# The integer points of a shard, drawn from the shards own stream so any process can regenerate them
+def shard_points(plan, seeds, shard):
+    x0, y0, x1, y1 = plan.bounds(shard)
+    rng = seeds.generator("shard", shard, "points")
+    xpos = rng.integers(x0, x1, size=plan.counts[shard])
+    ypos = rng.integers(y0, y1, size=plan.counts[shard])
+    points = np.column_stack((xpos, ypos)).astype(np.float64)
+
+    # Duplicate points would share a single region and be left out of the triangulation
+    # They are redrawn from the same stream until every point is unique
+    while True:
+        unique = np.unique(points, axis=0, return_index=True)[1]
+        if len(unique) == len(points):
+            return points
+        duplicate = np.setdiff1d(np.arange(len(points)), unique)
+        points[duplicate, 0] = rng.integers(x0, x1, size=len(duplicate))
+        points[duplicate, 1] = rng.integers(y0, y1, size=len(duplicate))
+
+
+# Mask of the points within the bounds
+def within(points, bounds):
+    x0, y0, x1, y1 = bounds
+    return (points[:, 0] >= x0) & (points[:, 0] < x1) & (points[:, 1] >= y0) & (points[:, 1] < y1)
+
+
+# One lloyd step, moving every point to the mean of its regions vertices
+# Vertices at infinity count as the far corners of the map, the same way VoronoiWrapper.lloyds_relaxation does
+# Returns the new points along with the mask of points whose region reached infinity
+def lloyd_step(points, width, height):
+    vor = Voronoi(points)
+    clamp_vertices(vor.vertices, width, height)
+    flat, owner = point_region_vertices(vor)
+
+    finite = flat >= 0
+    values = np.zeros((len(flat), 2), dtype=np.float64)
+    values[finite] = vor.vertices[flat[finite]]
+
+    corners = points[owner[~finite]]
+    values[~finite, 0] = np.where(corners[:, 0] > 0.5 * width, width, 0)
+    values[~finite, 1] = np.where(corners[:, 1] > 0.5 * height, height, 0)
+
+    counts = np.bincount(owner, minlength=len(points))
+    x = np.bincount(owner, weights=values[:, 0], minlength=len(points))
+    y = np.bincount(owner, weights=values[:, 1], minlength=len(points))
+
+    infinite = np.zeros(len(points), dtype=bool)
+    infinite[owner[~finite]] = True
+    return np.column_stack((x / counts, y / counts)), infinite
+
+
+# Mask of the points along the edges of a shards halo that lie within the map
+# Their regions reach infinity only because the halo ends there, so they aren't moved like the true map edges are
+def halo_rim(plan, shard, points):
+    hx0, hy0, hx1, hy1 = plan.halo_bounds(shard)
+    margin = 2 * plan.spacing
+
+    rim = np.zeros(len(points), dtype=bool)
+    if hx0 > 0:
+        rim |= points[:, 0] < hx0 + margin
+    if hy0 > 0:
+        rim |= points[:, 1] < hy0 + margin
+    if hx1 < plan.width:
+        rim |= points[:, 0] > hx1 - margin
+    if hy1 < plan.height:
+        rim |= points[:, 1] > hy1 - margin
+    return rim
+
+
+# Both directions of every edge of the triangles, as rows and columns
+def triangle_edges(simplices):
+    rows = np.concatenate((simplices[:, 0], simplices[:, 1], simplices[:, 2], simplices[:, 1], simplices[:, 2], simplices[:, 0]))
+    cols = np.concatenate((simplices[:, 1], simplices[:, 2], simplices[:, 0], simplices[:, 0], simplices[:, 1], simplices[:, 2]))
+    return rows, cols
+
+
+# Circumcircle centers and radii of the triangles, degenerate triangles get nan
+def circumcircles(points, simplices):
+    a = points[simplices[:, 0]]
+    b = points[simplices[:, 1]] - a
+    c = points[simplices[:, 2]] - a
+    b_length = b[:, 0] * b[:, 0] + b[:, 1] * b[:, 1]
+    c_length = c[:, 0] * c[:, 0] + c[:, 1] * c[:, 1]
+    d = 2 * (b[:, 0] * c[:, 1] - b[:, 1] * c[:, 0])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ux = (c[:, 1] * b_length - b[:, 1] * c_length) / d
+        uy = (b[:, 0] * c_length - c[:, 0] * b_length) / d
+    return a + np.column_stack((ux, uy)), np.hypot(ux, uy)
+
+
+# Mask of the triangles whose circumcircle, within the map, stays inside the bounds
+# Every point in there is known, so the circle of such a triangle is empty for the whole map as well
+def circles_within(circle_centers, circle_radii, width, height, bounds):
+    x0, y0, x1, y1 = bounds
+    cx, cy = circle_centers[:, 0], circle_centers[:, 1]
+    return ((np.maximum(cx - circle_radii, 0) > x0) & (np.minimum(cx + circle_radii, width) < x1) &
+            (np.maximum(cy - circle_radii, 0) > y0) & (np.minimum(cy + circle_radii, height) < y1))
+
+
+# Delaunay edges along the border of the map, from the points within a halo of it
+# Only triangles whose circumcircle misses the inside of the map (where the strip has no points) are kept
+def border_edges(plan, points):
+    margin = plan.halo
+    x0, y0, x1, y1 = margin, margin, plan.width - margin, plan.height - margin
+    inside = (points[:, 0] > x0) & (points[:, 0] < x1) & (points[:, 1] > y0) & (points[:, 1] < y1)
+    strip = np.flatnonzero(~inside)
+
+    simplices = Delaunay(points[strip]).simplices
+    if x1 > x0 and y1 > y0:
+        circle_centers, circle_radii = circumcircles(points[strip], simplices)
+        dx = np.maximum(np.maximum(x0 - circle_centers[:, 0], circle_centers[:, 0] - x1), 0)
+        dy = np.maximum(np.maximum(y0 - circle_centers[:, 1], circle_centers[:, 1] - y1), 0)
+        simplices = simplices[np.hypot(dx, dy) > circle_radii]
+
+    rows, cols = triangle_edges(simplices)
+    return strip[rows], strip[cols]
+
+
+# Owned points followed by the halo points of every neighbor, along with their global indexes
+def gather(plan, shard, points_of):
+    halo_bounds = plan.halo_bounds(shard)
+    own = points_of(shard)
+    points = [own]
+    ids = [np.arange(plan.offsets[shard], plan.offsets[shard + 1])]
+
+    for other in plan.neighbors(shard):
+        other_points = points_of(other)
+        inside = np.flatnonzero(within(other_points, halo_bounds))
+        points.append(other_points[inside])
+        ids.append(plan.offsets[other] + inside)
+
+    return np.concatenate(points), np.concatenate(ids), len(own)
+
+
+# Process side of the relaxation, returns the relaxed points owned by the shard
+def relax_shard(job):
+    plan, seed, shard, relaxation_count = job
+    seeds = SeedTree(seed)
+    points, ids, owned = gather(plan, shard, lambda other: shard_points(plan, seeds, other))
+
+    # Every pass spreads the error of the halo rim one cell further in, the halo is wide enough to keep it from our own
+    for x in range(0, relaxation_count):
+        relaxed, infinite = lloyd_step(points, plan.width, plan.height)
+        frozen = infinite & halo_rim(plan, shard, points)
+        relaxed[frozen] = points[frozen]
+        points = relaxed
+
+    return points[:owned]
+
+
+# Process side of the meshing, returns the geometry of the owned regions and their delaunay edges as global indexes
+def mesh_shard(job):
+    plan, shard, relaxed = job
+    points, ids, owned = gather(plan, shard, lambda other: relaxed[other])
+
+    vor = Voronoi(points)
+    clamp_vertices(vor.vertices, plan.width, plan.height)
+    edge, offsets, coords, centers = region_geometry(vor)
+
+    # Keeping the edges that start at one of our own regions, from the triangles whose circle the halo fully covers
+    # Near the rim of the halo the local hull bridges cells that aren't neighbors at all, those triangles are left out
+    simplices = Delaunay(points).simplices
+    circle_centers, circle_radii = circumcircles(points, simplices)
+    simplices = simplices[circles_within(circle_centers, circle_radii, plan.width, plan.height, plan.halo_bounds(shard))]
+    rows, cols = triangle_edges(simplices)
+    mine = rows < owned
+
+    return {
+        "edge": edge[:owned],
+        "offsets": offsets[:owned + 1],
+        "coords": coords[:offsets[owned]],
+        "centers": centers[:owned],
+        "rows": ids[rows[mine]],
+        "cols": ids[cols[mine]],
+    }
+
+
+# A stitched mesh, every array is indexed by global region index
+# offsets index into coords, the flat array of every regions finite vertices
+class TiledMesh:
+
+    def __init__(self, plan, points, edge, offsets, coords, centers, adjacency):
+        self.plan = plan
+        self.points = points
+        self.edge = edge
+        self.offsets = offsets
+        self.coords = coords
+        self.centers = centers
+        self.adjacency = adjacency
+
+        # The shard every region came from
+        self.shard = np.repeat(np.arange(plan.shard_count), plan.counts)
+
+    def __len__(self):
+        return len(self.points)
+
+
+def run_jobs(function, jobs, workers):
+    if workers is not None and workers <= 1:
+        return [function(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(function, jobs))
+
+
+# Generates a sharded mesh of count cells, workers is the number of processes (None for one per core, 1 to stay in process)
+def generate_mesh(width, height, count, relaxation_count, seed, shards_x, shards_y, halo=None, workers=None, progress=None):
+    plan = ShardPlan(width, height, count, shards_x, shards_y, halo, relaxation_count)
+    seed = SeedTree(seed).sequence()
+
+    if progress is not None:
+        progress.event("tiling", "Relaxing shards", shards=plan.shard_count)
+    relaxed = run_jobs(relax_shard, [(plan, seed, shard, relaxation_count) for shard in range(0, plan.shard_count)], workers)
+
+    if progress is not None:
+        progress.event("tiling", "Meshing shards", shards=plan.shard_count)
+    shards = run_jobs(mesh_shard, [(plan, shard, relaxed) for shard in range(0, plan.shard_count)], workers)
+
+    # Stitching the shards together in order, the vertex offsets of every shard move up by the vertices before it
+    vertex_base = np.cumsum([0] + [len(shard["coords"]) for shard in shards])
+    offsets = np.concatenate([shards[0]["offsets"][:1]] + [shard["offsets"][1:] + base for shard, base in zip(shards, vertex_base)])
+
+    # Every edge a shard kept is a true delaunay edge, the border strip adds the ones along the map border
+    points = np.concatenate(relaxed)
+    border_rows, border_cols = border_edges(plan, points)
+    rows = np.concatenate([shard["rows"] for shard in shards] + [border_rows])
+    cols = np.concatenate([shard["cols"] for shard in shards] + [border_cols])
+    adjacency = sparse.csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(count, count))
+    adjacency = (adjacency + adjacency.T).tocsr()
+    adjacency.data[:] = 1
+
+    if progress is not None:
+        progress.event("tiling", "Stitched shards", regions=count, edges=adjacency.nnz // 2)
+
+    return TiledMesh(
+        plan,
+        points,
+        np.concatenate([shard["edge"] for shard in shards]),
+        offsets,
+        np.concatenate([shard["coords"] for shard in shards]),
+        np.concatenate([shard["centers"] for shard in shards]),
+        adjacency,
+    )
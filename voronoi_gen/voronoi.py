@@ -1,19 +1,23 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.spatial import Voronoi, voronoi_plot_2d
+from scipy.spatial import Voronoi
 from scipy.spatial import Delaunay
-from collections import defaultdict
-import itertools
-import random
+from scipy import sparse
 import math
-from biome import Biome
-from rock import RockDatabase
-from rock import RockLayer
-from ocean import Ocean
-from mountain_range import MountainRange
-from mountain_range import Mountain
-from wind import Wind
-import noise
+import itertools
+from .biome import Biome
+from .rock import rockDatabase
+from .rock import RockLayerStack
+from .ocean import Ocean
+from .mountain_range import MountainRange
+from .mountain_range import Mountain
+from .wind import Wind
+from .plates import PlateMembership
+from .seeds import SeedTree
+from .config import WorldConfig
+from .progress import Progress
+from .profiling import StageProfiler
+from .parallel import StencilRunner
+from .boundaries import Boundaries
 
 # Debug variable
 # Debug variable can be changed to speficy exact amount of verbosity
@@ -21,84 +25,11 @@ import noise
 # Lowest, as of now, is 2
 debug = 0
 debug_display = 0
-status = 1
-
-# Variables controlling oceanic generation
-ocean_size_threshold = 1
-ocean_merge_threshold = 15
-
-# Variables for controlling elevation generation
-water_height_limit = 15
-
-# This value controls how powerful the tectonic plate adjustment is
-# A lower value results in a less powerful heights from tectonic plate collision
-tectonic_elevation_multiplier = 2.5
-immune_threshold = 85
-
-# Mountain growth variables
-mountain_offset_angle = 20
-mountain_offset_adjustment_angle = 45
-mountain_strength_decay = 0.05
-mountain_strength_limit = 0.1
-mountain_failure_index = 5
-max_mountain_neighbor = 2
-
-# Value that controls the elevation control of our mountains
-# Lower value makes mountains not as important
-mountain_adjustment_strength = 0.4
-
-# Building the rock database since it is used
-rockDatabase = RockDatabase()
-defaultRock = rockDatabase.defaultRock
-
-# Cycle limits
-temp_lower_cycle_limit = 0.5
-temp_upper_cycle_limit = 1.5
-
-temp_lower_amplitude = 0.6
-temp_upper_amplitude = 1.4
-
-# This is the temperature base level
-# Note that we evaluate on a 100-based scale, so this number can, at most, be 100
-# A lower number means the average temperature of the world is lower, vice versa applies
-# Range is 0 - 100, lower = cooler planet, higher = hotter
-temp_base_level = 50
-
-# Modifier that is used to control amplitude
-# Higher value means a smaller amplitude
-temp_height_division_factor = 16
-
-# Trending factor that lets us control the temperature of the oceans
-# Value == 1 is no trend
-# Greater than 1 is a downward trend
-# Below 1 is an upward trend
-ocean_temp_downward_trend = 1.1
 
-# Humidity options
-humidity_threshold = 2
-
-# Source threshold, used during random number generation
-# This is an absolute value !!! Check before you change (relative to the random number gen)
-humidity_source_threshold = 15000
-
-# Fraction defining chance to be a humidity source
-humidity_source_chance = (2, 10)
-
-# Ocean wind variables
-# Variance in value, in degrees
-ocean_wind_variance = 25
-ocean_wind_chance = (1, 10)
-
-# Degree of tolerance for selecting adjacent wind to blow into
-wind_range = 35
-wind_loss_strength = 15
-wind_strength_limit = 10
-wind_gen_count = 100
-
-# Factor that the difference between regions has on the new wind strength
-# It is a numeric percentage
-wind_difference_factor = 1.4
+# Default rock used by regions outside of any tectonic plate
+defaultRock = rockDatabase.defaultRock
 
+# Every other generation variable lives within the WorldConfig (config.py)
 
 # PI variable
 PI = 3.14159
@@ -108,23 +39,49 @@ PI = 3.14159
 # This class provides all of the tools to generate a relaxed Voronoi graph of points
 class VoronoiWrapper:
 
-    def __init__(self, width, height, count, relaxation_count=0, SEED="None"):
+    def __init__(self, width, height, count, relaxation_count=0, SEED="None", config=None, progress=None, profiler=None, mesh=None, workers=None):
 
         # We initialiez all the data
+        # Every generation variable comes from the config, the defaults are used when none is given
+        self.config = config if config is not None else WorldConfig()
         self.width = width
         self.height = height
         self.count = count
         self.relaxation_count = relaxation_count
         self.ocean_set = {}
 
+        # Every stage reports through the progress object, which is silent unless given a sink
+        self.progress = progress if progress is not None else Progress()
+
+        # Stages and their counters are recorded by the profiler, which is disabled unless given one
+        self.profiler = profiler if profiler is not None else StageProfiler(enabled=False)
+
+        # Number of processes the neighbor stencils may use on large worlds, None for one per core
+        self.workers = workers
+        self.stencil_runner = None
+
+        # Ridges between the regions, found the first time a boundary is asked for (boundaries.py)
+        self.region_boundaries = None
+
         # Setting seed
+        # SEED can also be a SeedTree, every stage draws from its own generator within the tree
         self.seed = SEED
+        self.seeds = SeedTree(SEED)
+
+        # A mesh that was already generated (e.g. stitched from shards by tiling.py) skips straight to the regions
+        if mesh is not None:
+            self.random_points = mesh.points
+            self.voronoi_points = None
+            with self.profiler.stage("final_system"):
+                self.build_regions(mesh.points, mesh.edge, mesh.offsets, mesh.coords, mesh.centers, mesh.adjacency)
+            return
 
         # Now we generate the function
-        self.generate()
+        with self.profiler.stage("points"):
+            self.generate()
 
-        # Now to run the minimization function on the points
-        self.maxmin()
+            # Now to run the minimization function on the points
+            self.maxmin()
 
         if (debug >= 2):
             print ("Points: ")
@@ -142,15 +99,16 @@ class VoronoiWrapper:
         if (debug_display): self.display()
 
         # Now to run lloyds relaxation
-        for x in range(0,self.relaxation_count):
-            if status:
-                print("Running Lloyds # " + str(x))
+        with self.profiler.stage("relaxation"):
+            for x in range(0,self.relaxation_count):
+                self.progress.update("relaxation", x + 1, self.relaxation_count)
 
-            self.lloyds_relaxation()
-            self.maxmin()
+                self.lloyds_relaxation()
+                self.maxmin()
 
         # Running neighbors and finalize the connections
-        self.genFinalSystem()
+        with self.profiler.stage("final_system"):
+            self.genFinalSystem()
 
         # Displaying if debug
         if (debug_display): self.display()
@@ -158,69 +116,25 @@ class VoronoiWrapper:
     def maxmin(self):
         # This function is desgined to take all the voronoi co-ordinates that have
         # positions > or < width/height
-        # Counting verticies
-        vert_count = 0
-
-        if status:
-            print("MaxMin Running")
-
-        for vert in self.voronoi_points.vertices:
-            # Checking height and width of first
-            x = vert[0]
-            if (self.width < x):
-                x = self.width
-            elif (x < 0):
-                x = 0
-
-            y = vert[1]
-            if (self.height < y):
-                y = self.height
-            elif (y < 0):
-                y = 0
-
-            # Adjusting
-            if (debug == 1): print("Changing ", end = "")
-            if (debug == 1): print (vert, end = ", to ")
-            if (debug == 1): print((x,y), end="\n")
-
-            self.voronoi_points.vertices[vert_count] = (x,y)
-            vert_count+=1
-
-        if status:
-            print ("MaxMin Complete")
+        clamp_vertices(self.voronoi_points.vertices, self.width, self.height)
 
     def generate(self):
 
         # First we will generate a list of random points
-        self.random_points = []
-
-        # Setting seed
-        if (self.seed != "None"):
-            np.random.seed(self.seed)
+        rng = self.seeds.generator("points")
 
         # Generating self.count number of points
-        for x in range(0,self.count):
-
-            if (status):
-                if x == self.count / 4:
-                    print("Point Generation: 25% Completed")
-                if x == self.count / 2:
-                    print("Point Generation: 50% Completed")
+        xpos = rng.integers(0, self.width, size=self.count)
+        ypos = rng.integers(0, self.height, size=self.count)
 
-            # Generating a random point
-            xpos = np.random.randint(0,self.width)
-            ypos = np.random.randint(0,self.height)
+        # After we have generated the points, we put them into self.random_points for use with voronoi
+        self.random_points = np.column_stack((xpos, ypos))
 
-            # After we have generated a point, we add it into self.random_points for use with voronoi
-            self.random_points.append((xpos,ypos))
-
-        if status:
-            print("Point Generation: Complete")
+        self.progress.event("points", "Point generation complete", count=self.count)
         # Now we will generate the Voronoi graph
         self.voronoi_points = Voronoi(self.random_points)
 
-        if status:
-            print("Voronoi Generation Complete")
+        self.progress.event("points", "Voronoi generation complete")
 
     # Outdated functionality that is now handled within genFinalSystem
 
@@ -334,405 +248,238 @@ class VoronoiWrapper:
         self.voronoi_points = Voronoi(self.random_points)
 
     def display(self):
+        # Matplotlib is only needed for the debug display, so it's only imported here
+        import matplotlib.pyplot as plt
+        from scipy.spatial import voronoi_plot_2d
 
         # Plotting it first
-        if status:
-            print("Draw: Plotting display")
+        self.progress.event("display", "Plotting display")
         voronoi_plot_2d(self.voronoi_points)
 
-        if status:
-            print("Draw: Colorizing")
+        self.progress.event("display", "Colorizing")
         # colorize
         for region in self.voronoi_points.regions:
             if not -1 in region:
                 polygon = [self.voronoi_points.vertices[i] for i in region]
                 plt.fill(*zip(*polygon))
 
-        if status:
-            print("Draw: Showing")
+        self.progress.event("display", "Showing")
 
         plt.show()
 
     def genFinalSystem(self):
 
-        #print(self.voronoi_points.regions)
-        #print(self.voronoi_points.vertices)
-        #print(self.voronoi_points.points)
-        #print(self.voronoi_points.point_region)
-
         # Overall idea
         # Point_region contains the mapping of index to regions
         # This lets us determine which region is which index
+        # Every point becomes a region holding the finite vertices of its voronoi region, its neighbors come
+        # from the delaunay triangulation of the points
+        edge, offsets, coords, centers = region_geometry(self.voronoi_points)
 
-        # Construct a duplicate of regions, but remove the empty set
-        # Iterate on every value in point_region
-        # Grab the vertices from every value within the respective region
-
-        # point_region contains a mapping of index -> region that represents that index
-        # This value, our relative_index keeps track of where we are within point_region
-        # Remember, point region goes from 0 to max regions BUT it can be out of order!
-        # And we need the in-order to get the center value
-
-        # Newer, also broken system
-
-        # voronoi_output = {}
-        # point_region_counter = 0
-        # for point in self.voronoi_points.point_region:
-        #
-        #     #print("Building point with index of " + str(point))
-        #     # Grabbing the respective region
-        #
-        #     respective_region = self.voronoi_points.regions[point]
-        #     #print("Our region is " + str(respective_region))
-        #
-        #     # Grabbing the center for this indexed value
-        #     region_center = self.voronoi_points.points[point_region_counter]
-        #     #print("Our center is " + str(region_center))
-        #
-        #     # Building the voronoi object
-        #     # Point represents the value we are on in point_region
-        #     # Region center is our center
-        #     tmp_voronoi = VoronoiRegion(region_center, point)
-        #
-        #     # Assigning the point list. Note, we are going to simply take the given value
-        #     tmp_voronoi.vertex_list_index = respective_region
-        #
-        #     # Determining our vertex list of indices
-        #     # This requires us to actually iterate on the values
-        #     vertex_list_value = []
-        #     for point_vertex in respective_region:
-        #         if point_vertex != -1:
-        #             vertex_list_value.append(self.voronoi_points.vertices[point_vertex])
-        #
-        #     #print(vertex_list_value)
-        #     tmp_voronoi.vertex_list_value = vertex_list_value
-        #
-        #     # Incrementing our point_region counter
-        #     point_region_counter = point_region_counter + 1
-        #
-        #     voronoi_output[point] = tmp_voronoi
-        #
-        # # Finding the index of the empty set
-        # count = 0
-        # for point_region in self.voronoi_points.regions:
-        #     if len(point_region) <= 0:
-        #         break
-        #     count = count + 1
-        #
-        # # Fixing the empty set problem
-        # fixed_voronoi_output = [None] * len(self.voronoi_points.point_region)
-        # #print("Fixing empty set problem with value of " + str(count))
-        # for key in voronoi_output:
-        #     region = voronoi_output[key]
-        #
-        #     new_key = key
-        #     if new_key > count:
-        #         new_key = new_key - 1
-        #
-        #     fixed_voronoi_output[new_key] = region
-        #
-        # #print(fixed_voronoi_output)
-        # self.voronoi = fixed_voronoi_output
-
-        # Old broken system
-
-        # First we are going to generate the Voronoi Region Hashtable List
-        # The key will be a tuple representing the center
-        voronoiRegionList = []
-
-        # Iterating on all regions and creating them
+        # The vertex index list is taken by region position rather than through point_region, kept as it always was
+        vertex_indices = [self.voronoi_points.regions[index] for index in range(0, len(offsets) - 1)]
 
-        # Keeping track of what index we have iterated on
-        count = 0
+        self.build_regions(self.voronoi_points.points, edge, offsets, coords, centers, delaunay_adjacency(self.random_points), vertex_indices)
 
-        # Keeping track of whether or not we have reached the [] index...
-        invalid_index_flag = 0
+    # Builds every region object from the arrays of a mesh, shared by genFinalSystem and meshes built elsewhere (tiling.py)
+    # offsets index into coords, the flat array of every regions finite vertices in order
+    def build_regions(self, points, edge, offsets, coords, centers, adjacency, vertex_indices=None):
+        region_count = len(offsets) - 1
+        edge = edge.tolist()
+        centers = centers.tolist()
 
-        for x in self.voronoi_points.points:
+        voronoiRegionList = []
+        for count in range(0, region_count):
 
             # Creating the new empty object
-            tmpRegion = VoronoiRegion(x, count)
-
-            # Getting the current region object
-            point_region_index = self.voronoi_points.point_region[count + invalid_index_flag]
-            current_region = self.voronoi_points.regions[point_region_index]
-
-            if current_region == []:
-                invalid_index_flag = 1
-                point_region_index = self.voronoi_points.point_region[count + invalid_index_flag]
-                current_region = self.voronoi_points.regions[point_region_index]
-
-            # Getting a proper edge
-            if -1 in current_region:
-                tmpRegion.edge = 1
-
-            # We have obtained the 'current region'
-            # Now we need to take this information and grab all of the vertex information
-
-            vertex_list_value = []
-            for point in current_region:
-                if point != -1:
-                    vertex_list_value.append(self.voronoi_points.vertices[point])
+            tmpRegion = VoronoiRegion(points[count], count)
+            tmpRegion.edge = int(edge[count])
 
-            # Assigning the values to current_region
-            tmpRegion.vertex_list_value = vertex_list_value
-            tmpRegion.vertex_list_index = self.voronoi_points.regions[count + invalid_index_flag]
+            # Assigning the vertex values and the center
+            tmpRegion.vertex_list_value = list(coords[offsets[count]:offsets[count + 1]])
+            tmpRegion.vertex_list_index = vertex_indices[count] if vertex_indices is not None else []
+            tmpRegion.center = tuple(centers[count])
 
-            # Appending the object to the list
             voronoiRegionList.append(tmpRegion)
 
-            # Incrementing count
-            count = count + 1
-
         # Assigning the list to ourselves
         self.voronoi = voronoiRegionList
 
-        # Secondly we are going to calculate all of the neighbors
-
-        # Using Delaunay to generate the neighbors from our random points
-        tri = Delaunay(self.random_points)
-        neiList = defaultdict(set)
-        for p in tri.vertices:
-            for i, j in itertools.combinations(p, 2):
-                neiList[i].add(j)
-                neiList[j].add(i)
-
-        #print(neiList)
-
-        if debug:
-            print("Printing the neighbor information")
-            print("Our vertex set: ")
-            print(self.voronoi_points.points)
-
-        # Tracking index
-        index = 0
-
-        for key in sorted(neiList.items()):
-            # Lets assign the points
-            neighbors_index = key[1]
-
-            # Assigning neighbors index
-            self.voronoi[index].neighbors_index = neighbors_index
-            self.voronoi[index].index = index
-
-            # Incrementing count
-            index = index + 1
-
-        #self.debug_region()
-
-        # Finally, regenerating the centers
-        for v in self.voronoi:
-            # Determining the center
-            x = 0
-            y = 0
-            count = 0
-
-            for point in v.vertex_list_value:
-                count = count + 1
-                x = x + point[0]
-                y = y + point[1]
-
-            x_center = x / count
-            y_center = y / count
-            v.center = (x_center, y_center)
-
-        #self.debug_region()
+        # Keeping the flat vertex arrays as well, offsets index into coords (world.py shares them across processes)
+        self.vertex_offsets = np.asarray(offsets, dtype=np.int64)
+        self.vertex_coords = np.asarray(coords, dtype=np.float64)
+
+        # Tracking which tectonic plates every region belongs to
+        self.plates = PlateMembership(region_count)
+
+        # Every region starts out on the default rock until the tectonic plates are placed
+        self.rock_layers = RockLayerStack(region_count)
+        self.rock_layers.layers[:, 0] = defaultRock
+
+        # The sparse adjacency matrix of the regions, used by the vectorized stages
+        self.adjacency = adjacency
+
+        # Assigning the neighbors from the rows of the adjacency matrix
+        indptr = adjacency.indptr
+        indices = adjacency.indices.tolist()
+        for index in range(0, region_count):
+            self.voronoi[index].neighbors_index = set(indices[indptr[index]:indptr[index + 1]])
+
+        # The neighbor sets flattened in their own iteration order, the stencils add neighbors up in this order
+        lengths = np.fromiter((len(region.neighbors_index) for region in self.voronoi), dtype=np.int64, count=region_count)
+        self.neighbor_offsets = np.concatenate(([0], np.cumsum(lengths)))
+        self.neighbor_flat = np.fromiter(itertools.chain.from_iterable(region.neighbors_index for region in self.voronoi), dtype=np.int64, count=int(lengths.sum()))
+
+    # Function that returns a boolean array marking every land region, indexed by region index
+    def land_mask(self):
+        return np.fromiter((region.biome.land_type == "Land" for region in self.voronoi), dtype=bool, count=len(self.voronoi))
+
+    # Array of every regions center, indexed by region index
+    def center_array(self):
+        return np.array([region.center for region in self.voronoi], dtype=np.float64).reshape(-1, 2)
+
+    # Every per-region field as a column array indexed by region index
+    # Stages that haven't run yet leave their defaults, regions without wind have a direction and strength of -1
+    def region_columns(self):
+        region_count = len(self.voronoi)
+        columns = {
+            "elevation": np.fromiter((region.elevation for region in self.voronoi), dtype=np.float64, count=region_count),
+            "biome": np.fromiter((region.biome.biome_index for region in self.voronoi), dtype=np.int64, count=region_count),
+            "land": self.land_mask(),
+            "edge": np.fromiter((region.edge for region in self.voronoi), dtype=bool, count=region_count),
+            "ocean_index": np.fromiter((region.ocean_index for region in self.voronoi), dtype=np.int64, count=region_count),
+            "ocean_distance": np.fromiter((region.ocean_distance for region in self.voronoi), dtype=np.int64, count=region_count),
+            "temperature": np.fromiter((region.relative_normalized_temperature for region in self.voronoi), dtype=np.float64, count=region_count),
+            "humidity": np.fromiter((region.base_humidity for region in self.voronoi), dtype=np.float64, count=region_count),
+            "mountain": np.fromiter((region.is_mountain for region in self.voronoi), dtype=bool, count=region_count),
+            "rock": self.rock_layers.top().copy(),
+            "wind_direction": np.full(region_count, -1, dtype=np.float64),
+            "wind_strength": np.full(region_count, -1, dtype=np.float64),
+        }
+
+        # Winds are drawn in order, so a region with several winds takes the last one like the wind map does
+        for wind in getattr(self, "winds", {}).values():
+            columns["wind_direction"][wind.region.index] = wind.direction
+            columns["wind_strength"][wind.region.index] = wind.strength
+
+        return columns
 
     # This function will load all the shape-based biomes
     # Effectively determining what is water and what is not
     def gen_shape_land(self, shapeList):
-        if (status):
-            print("Generating shapelist based land")
+        self.progress.event("plates", "Generating shapelist based land", shapes=len(shapeList))
 
-        voronoi_count = len(self.voronoi)
-        count = 0
+        # Checking if the positional data has already been set
+        candidates = np.flatnonzero(np.fromiter((region.biome.biome_index != 2 for region in self.voronoi), dtype=bool, count=len(self.voronoi)))
+        centers = self.center_array()[candidates]
+        self.profiler.count("regions_visited", len(candidates) * len(shapeList))
 
-        for voronoi in self.voronoi:
-            count = count + 1
+        land = np.zeros(len(self.voronoi), dtype=bool)
+        for shape in shapeList:
+            inside = candidates[points_within_polygon(centers[:, 0], centers[:, 1], shape.vertex_list)]
 
-            if (count == 1 * (round(voronoi_count) / 4)):
-                print("Land Generation: 25% Complete")
-            elif (count == 2 * (round(voronoi_count) / 4)):
-                print("Land Generation: 50% Complete")
-            elif (count == 3 * (round(voronoi_count) / 4)):
-                print("Land Generation: 75% Complete")
-
-            # Checking if the positional data has already been set
-            if (voronoi.biome.biome_index == 2):
-                continue
-
-            for shape in shapeList:
-                points = shape.vertex_list
-
-                if (check_point_within_polygon(voronoi.center[0], voronoi.center[1], points)):
-                    # Reloading the index to land
-                    voronoi.biome.reload_index(2)
-
-                    # Updating this voronois overlap region
-                    voronoi.shape_list.append(shape.shape_index)
+            # Updating the overlap region of every voronoi within the shape
+            self.plates.add(shape.shape_index, inside)
+            land[inside] = True
 
+        # Reloading the index to land
+        for index in np.flatnonzero(land).tolist():
+            self.voronoi[index].biome.reload_index(2)
 
     # This function will load all the shape-based biomes
     # Effectively determining what is water and what is not
     def gen_shape_water(self, shapeList):
-        if (status):
-            print("Generating shapelist based water")
-
-        voronoi_count = len(self.voronoi)
-        count = 0
-
-        for voronoi in self.voronoi:
-            count = count + 1
+        self.progress.event("plates", "Generating shapelist based water", shapes=len(shapeList))
 
-            if (count == 1 * (round(voronoi_count) / 4) ):
-                print("Water Generation: 25% Complete")
-            elif (count == 2 * (round(voronoi_count) / 4) ):
-                print("Water Generation: 50% Complete")
-            elif (count == 3 * (round(voronoi_count) / 4) ):
-                print("Water Generation: 75% Complete")
+        # Checking if the positional data has already been set
+        candidates = np.flatnonzero(np.fromiter((region.biome.biome_index != 1 for region in self.voronoi), dtype=bool, count=len(self.voronoi)))
+        centers = self.center_array()[candidates]
+        self.profiler.count("regions_visited", len(candidates) * len(shapeList))
 
-            # Checking if the positional data has already been set
-            if (voronoi.biome.biome_index == 1):
-                continue
-
-            for shape in shapeList:
-                points = shape.vertex_list
+        water = np.zeros(len(self.voronoi), dtype=bool)
+        for shape in shapeList:
+            inside = candidates[points_within_polygon(centers[:, 0], centers[:, 1], shape.vertex_list)]
 
-                if (check_point_within_polygon(voronoi.center[0], voronoi.center[1], points)):
-                    voronoi.biome.reload_index(1)
-
-                    # Updating this voronois overlap region
-                    voronoi.shape_list.append(shape.shape_index)
+            # Updating the overlap region of every voronoi within the shape
+            self.plates.add(shape.shape_index, inside)
+            water[inside] = True
 
+        for index in np.flatnonzero(water).tolist():
+            self.voronoi[index].biome.reload_index(1)
 
     # Function for generating the voronoi tectonic stone type from the tectonic plate values
+    # Regions take the base rock of one of their tectonic plates, picked at random when they overlap several
     def genRegionRock(self, shapeList):
-        for voronoi in self.voronoi:
+        tectonic = np.array([shape.tectonic for shape in shapeList], dtype=bool)
+        base_rock = np.array([shape.base_rock for shape in shapeList], dtype=np.int8)
 
-            if len(voronoi.shape_list) <= 0:
-                # No given shapes...
-                voronoi.rock_layer = RockLayer(defaultRock)
+        # Number of tectonic plates every region belongs to, and which one of them we will be using
+        tectonic_count = self.plates.count(tectonic)
+        rng = self.seeds.generator("rock")
+        choice = (rng.random(len(self.voronoi)) * tectonic_count).astype(np.int64)
 
-            elif len(voronoi.shape_list) == 1:
-                # Simply use the given one
-                shape_object = shapeList[voronoi.shape_list[0]]
+        # Regions without any tectonic plates use the default option
+        top = np.full(len(self.voronoi), defaultRock, dtype=np.int8)
 
-                if shape_object.tectonic == 1:
-                    new_rock_layer = RockLayer(shapeList[voronoi.shape_list[0]].base_rock)
-                    voronoi.rock_layer = new_rock_layer
+        # Walking the tectonic plates, every region takes its rock from the plate matching its choice
+        seen = np.zeros(len(self.voronoi), dtype=np.int64)
+        for plate in np.flatnonzero(tectonic).tolist():
+            member = self.plates.mask(plate)
+            top[member & (seen == choice)] = base_rock[plate]
+            seen += member
 
-                else:
-                    # Not tectonic? Shit I don't know what to do here, guess its part of the non-tectonic group
-                    # Meaning we will use the default option here
-                    #print("Assigning non-tectonic region")
-                    new_rock_layer = RockLayer(defaultRock)
-                    voronoi.rock_layer = new_rock_layer
-
-            else:
-                # Generating a random index
-                # Assembling list of all the tectonic options, and randomly selecting from them
-                tectonic_list = []
+        self.rock_layers.layers[:, 0] = top
 
-                for shape in voronoi.shape_list:
-                    if shapeList[shape].tectonic:
-                        tectonic_list.append(shapeList[shape])
+        # Filling in the deeper layers, plates collide where a region overlaps more than one tectonic plate
+        self.rock_layers.build_strata(self.land_mask(), tectonic_count > 1)
 
-                # Checking if none of them were tectonic first
-                if len(tectonic_list) <= 0:
-                    voronoi.rock_layer = RockLayer(defaultRock)
+    # Runs the neighbor stencils, in process or across partitions on large worlds (parallel.py)
+    def stencils(self):
+        if self.stencil_runner is None:
+            self.stencil_runner = StencilRunner(self.neighbor_offsets, self.neighbor_flat, self.center_array(), self.workers)
+        return self.stencil_runner
 
-                else:
-                    randomIndex = random.randrange(0, len(tectonic_list))
-                    new_rock = tectonic_list[randomIndex].base_rock
-                    new_rock_layer = RockLayer(new_rock)
-                    voronoi.rock_layer = new_rock_layer
+    # Coastlines, ocean borders and plate boundaries as polylines, from the current state of the regions
+    def boundaries(self):
+        if self.region_boundaries is None:
+            self.region_boundaries = Boundaries(self)
+        return self.region_boundaries
 
     # Function for making one pass on averaging the base heights
-    def gen_voronoi_heightmap_average(self, noise, strength):
-        print("Performing heightmap averaging function")
+    # Every pass draws from its own stream, pass_index tells them apart
+    def gen_voronoi_heightmap_average(self, noise, strength, pass_index=0):
+        self.gen_voronoi_erosion(noise, strength, 1, pass_index)
+
+    # Function for making pass_count passes of averaging the base heights
+    # Pass x draws from the same stream a single gen_voronoi_heightmap_average call with pass_index x would
+    def gen_voronoi_erosion(self, noise, strength, pass_count, first_pass=0):
+        self.progress.event("heightmap_average", "Performing heightmap averaging function", passes=pass_count)
 
         # We have two input parameters, noise and strength
         # Strength is used to determine the amount of power we want to give our averaging tool
         # For example, if our neighboring average is 90 and we are 80, the difference is 10
         # Strength is a multiplier that determines how much we are going to move towards the average
-
         # Noise is a random variance always applied, between [-noise,noise]
+        region_count = len(self.voronoi)
+        noise_values = np.array([self.seeds.generator("heightmap_average", first_pass + x).integers(-noise, noise, size=region_count)
+                                 for x in range(0, pass_count)]).reshape(pass_count, region_count)
+        self.profiler.count("regions_visited", region_count * pass_count)
 
-        new_heightmap_list = []
-
-        for region in self.voronoi:
-
-            # Checking if we are an immune region
-            if region.elevation > immune_threshold:
-                #print("HIT IMMUNE THRESHOLD")
-                new_region_elevation = region.elevation
-                new_region_elevation = new_region_elevation + random.randrange(-noise, noise)
-
-                biome_type = region.biome.land_type
-                if (biome_type == "Water"):
-                    # Checking upper/lower bounds
-                    if (new_region_elevation > water_height_limit):
-                        new_region_elevation = water_height_limit
-                if (biome_type == "Land"):
-                    if (new_region_elevation <= water_height_limit):
-                        new_region_elevation = water_height_limit + 1
-
-                if (region.elevation <= 0):
-                    new_region_elevation = 1
-
-                new_heightmap_list.append(new_region_elevation)
-                continue
-
-            # Getting the neighboring elevation
-            neighbor_elevation = 0
-            neighbor_count = len(region.neighbors_index)
-            for neighbor in region.neighbors_index:
-                neighbor_elevation = neighbor_elevation + self.voronoi[neighbor].elevation
-
-            # Determining the average
-            neighbor_elevation_average = neighbor_elevation / neighbor_count
-
-            # Now we calculate the difference
-            neighbor_elevation_difference = neighbor_elevation_average - region.elevation
+        params = {"strength": strength, "immune_threshold": self.config.immune_threshold, "water_height_limit": self.config.water_height_limit}
+        elevation = np.array([region.elevation for region in self.voronoi], dtype=np.float64)
+        elevation = self.stencils().run("heightmap", elevation, pass_count, static={"land": self.land_mask()}, per_pass={"noise": noise_values}, params=params)
 
-            # Using our strength
-            neighbor_elevation_adjustment = neighbor_elevation_difference * strength
-
-            if (debug):
-                print("Neighboring average of " + str(neighbor_elevation_average) + ", ours is " + str(region.elevation) + " with difference of " + str(neighbor_elevation_difference) + ". Adjusting by " + str(neighbor_elevation_adjustment))
-            new_region_elevation = region.elevation + round(neighbor_elevation_adjustment)
-
-            # Getting our noise in
-            new_region_elevation = new_region_elevation + random.randrange(-noise, noise)
-
-            # Finally, making some sanity checks over here
-            biome_type = region.biome.land_type
-            if (biome_type == "Water"):
-                # Checking upper/lower bounds
-                if (new_region_elevation > water_height_limit):
-                    new_region_elevation = water_height_limit
-            if (biome_type == "Land"):
-                if (new_region_elevation <= water_height_limit):
-                    new_region_elevation = water_height_limit + 1
-
-            if (region.elevation <= 0):
-                new_region_elevation = 1
-
-            new_region_elevation = round(new_region_elevation)
-            new_heightmap_list.append(new_region_elevation)
-
-        # Now that we've build the new heightmaps lets assign
-        count = 0
-        for region in self.voronoi:
-
-            region.elevation = new_heightmap_list[count]
-            count = count + 1
+        # Averaged regions come out as whole numbers, only immune regions that had fractional heights keep them
+        for region, value in zip(self.voronoi, elevation.tolist()):
+            region.elevation = int(value) if value.is_integer() else value
 
     # Function for building cool mountain ranges
     # Hopefully this ends up being somewhat realistic, because god knows how many times this doesnt work
     def gen_mountain_ranges(self, mountain_range_count, mountain_height_noise, mountain_range_length_dimension):
 
-        print("Building mountain ranges")
+        self.progress.event("mountains", "Building mountain ranges", count=mountain_range_count)
+        rng = self.seeds.generator("mountains")
+
         # Building the mountain set
         mountain_set = {}
 
@@ -754,14 +501,14 @@ class VoronoiWrapper:
             if len(land_key_set) <= 0:
                 break
 
-            random_index = random.randrange(0, len(land_key_set))
+            random_index = int(rng.integers(0, len(land_key_set)))
             mountain_root = land_set[land_key_set[random_index]]
             land_key_set.pop(random_index)
 
             # Selecting a random, non-oceanic tile to be used.
             # Selecting a random angle
-            random_angle = random.randrange(0, 360)
-            mountain_set[count] = MountainRange(count, mountain_root, random_angle)
+            random_angle = int(rng.integers(0, 360))
+            mountain_set[count] = MountainRange(count, mountain_root, random_angle, rng)
 
         # Okay we've built our mountain set
         # Lets begin growing each mountain
@@ -769,9 +516,11 @@ class VoronoiWrapper:
         # Grown tiles will be ignroed, not grown tiles will grow in their growth direction
         # Hitting water, etc will change the growth direction
         mountain_failure = 0
+        growth_pass = 0
         while 1 == 1:
 
-            print("Growing mountains")
+            growth_pass = growth_pass + 1
+            self.profiler.count("growth_iterations")
 
             # Flag to track mountain growth
             # When we no longer grow anything, its time to stop
@@ -784,7 +533,8 @@ class VoronoiWrapper:
                 # Now iterating on all possible tiles that have not been grown yet
                 mountain_growth_set = []
 
-                print(len(mountain_range.mountains))
+                self.progress.update("mountains", growth_pass, growth_pass=growth_pass, range_index=mountain_range_index, size=len(mountain_range.mountains))
+                self.profiler.count("mountains_visited", len(mountain_range.mountains))
                 for mountain_index in mountain_range.mountains:
                     # print("Iterating on mountain with index of " + str(mountain_index))
                     mountain = mountain_range.mountains[mountain_index]
@@ -794,7 +544,7 @@ class VoronoiWrapper:
                         continue
 
                     # Checking for strength decay
-                    if mountain.mountain_strength < mountain_strength_limit:
+                    if mountain.mountain_strength < self.config.mountain_strength_limit:
                         mountain.grown = 1
                         continue
 
@@ -824,7 +574,7 @@ class VoronoiWrapper:
                             if neighbor.is_mountain:
                                 neighbor_mountain_count = neighbor_mountain_count + 1
 
-                            if neighbor_mountain_count > max_mountain_neighbor:
+                            if neighbor_mountain_count > self.config.max_mountain_neighbor:
                                 break
 
                             # Okay lets get the angle from the center of our growth mountain to us...
@@ -862,8 +612,8 @@ class VoronoiWrapper:
                         # Checking if any are close enough...
                         for neighbor_index in neighbor_angle_set:
                             growth_angle = mountain.growth_angle
-                            growth_range_min = growth_angle - mountain_offset_angle
-                            growth_range_max = growth_angle + mountain_offset_angle
+                            growth_range_min = growth_angle - self.config.mountain_offset_angle
+                            growth_range_max = growth_angle + self.config.mountain_offset_angle
 
                             # Checking for funky stuff
                             neighbor = self.voronoi[neighbor_index]
@@ -897,7 +647,7 @@ class VoronoiWrapper:
                             if growth_flag > 0:
                                 # Adding this mountain to the mountain set
                                 growth_angle = mountain.growth_angle
-                                new_mountain_tile = Mountain(neighbor, growth_angle, mountain_range, mountain.mountain_strength - mountain_strength_decay)
+                                new_mountain_tile = Mountain(neighbor, growth_angle, mountain_range, mountain.mountain_strength - self.config.mountain_strength_decay)
                                 mountain_growth_set.append(new_mountain_tile)
                                 neighbor.is_mountain = 1
                                 mountain.grown = mountain.grown + 1
@@ -906,9 +656,9 @@ class VoronoiWrapper:
                             else:
                                 # Growth angle adjustment
                                 growth_angle = mountain.growth_angle
-                                growth_range_min = growth_angle - mountain_offset_adjustment_angle
-                                growth_range_max = growth_angle + mountain_offset_adjustment_angle
-                                new_growth_angle = random.randrange(growth_range_min, growth_range_max)
+                                growth_range_min = growth_angle - self.config.mountain_offset_adjustment_angle
+                                growth_range_max = growth_angle + self.config.mountain_offset_adjustment_angle
+                                new_growth_angle = int(rng.integers(growth_range_min, growth_range_max))
 
                                 # Fixing boundary problems
                                 if new_growth_angle < 0:
@@ -928,8 +678,7 @@ class VoronoiWrapper:
                 else:
                     # If we are a new mountain range, lets just fucking randomize our range
                     if len(mountain_range.mountains) <= 1:
-                        print("Randomizing mountain angles")
-                        random_angle = random.randrange(0, 360)
+                        random_angle = int(rng.integers(0, 360))
                         mountain_range.base_growth_angle = random_angle
 
                         for mountain_index in mountain_range.mountains:
@@ -938,10 +687,9 @@ class VoronoiWrapper:
 
 
             if did_grow_mountain == 0:
-                print("Mountain growth failed")
                 mountain_failure = mountain_failure + 1
 
-            if mountain_failure > mountain_failure_index:
+            if mountain_failure > self.config.mountain_failure_index:
                 break
 
         # Fixing mountain sizes
@@ -958,7 +706,7 @@ class VoronoiWrapper:
 
             for mountain_tile_index in mountain_range.mountains:
                 mountain = mountain_range.mountains[mountain_tile_index]
-                mountain.mountain_strength = mountain.mountain_strength + mountain_strength_limit - min_strength
+                mountain.mountain_strength = mountain.mountain_strength + self.config.mountain_strength_limit - min_strength
 
             for mountain_tile_index in mountain_range.mountains:
                 mountain = mountain_range.mountains[mountain_tile_index]
@@ -971,7 +719,7 @@ class VoronoiWrapper:
                     else:
                         mountain = mountain_range.mountains[mountain_tile_index]
 
-                        absolute_strength = int(round( (mountain.mountain_strength - mountain_strength_limit) * 100))
+                        absolute_strength = int(round( (mountain.mountain_strength - self.config.mountain_strength_limit) * 100))
 
                         neighbor.elevation = absolute_strength
 
@@ -993,130 +741,72 @@ class VoronoiWrapper:
                 relative_value = 100 - mountain.region.elevation
                 relative_adjustment_value = relative_value / 100
                 adjustment_value = relative_adjustment_value * absolute_strength
-                adjustment_value = adjustment_value * mountain_adjustment_strength
+                adjustment_value = adjustment_value * self.config.mountain_adjustment_strength
 
                 mountain.region.elevation = mountain.region.elevation + adjustment_value
 
         # Finished!
         self.mountain_set = mountain_set
-        print("Finished building mountain ranges")
+        self.progress.event("mountains", "Finished building mountain ranges", growth_passes=growth_pass)
 
     # Function for generating the voronoi heightmap...
     def gen_voronoi_base_height(self, height_noise, shape_list_size):
-        print("Generating voronoi heightmap")
+        self.progress.event("base_height", "Generating voronoi heightmap")
 
         # Functionally this will process things in the following manner
-        # We will iterate on all voronoi regions, and assign them a height based on the following
+        # We will take all voronoi regions at once, and assign them a height based on the following
         # their number of shapes in the shapelist / total number of shapes * 100 + random number between -/+ height_noise
 
         # There will be a limit however: water biomes will have a limit of being between [0,15]
         # land biomes will have a limit between [15,99]
+        region_count = len(self.voronoi)
+        land = self.land_mask()
 
-        for region in self.voronoi:
-
-            # Getting the shape list count
-            num_shape = len(region.shape_list)
-            mult = tectonic_elevation_multiplier * num_shape / shape_list_size
-
-            if (mult >= 1):
-                mult = 1
+        # Getting the shape list count of every region
+        num_shape = self.plates.count().astype(np.float64)
 
-            val = 100 * mult
+        mult = np.minimum(self.config.tectonic_elevation_multiplier * num_shape / shape_list_size, 1)
+        val = 100 * mult
 
-            # Limit checking, this will happen twice
-            biome_type = region.biome.land_type
-            if (biome_type == "Water"):
-                # Checking upper/lower bounds
-                if (val > water_height_limit):
-                    val = water_height_limit
-            if (biome_type == "Land"):
-                if (val <= water_height_limit):
-                    val = water_height_limit + 1
+        # Limit checking, this will happen twice
+        val = clamp_elevation(val, land, self.config.water_height_limit)
 
-            # Applying our noise
-            val = val + random.randrange(-height_noise, height_noise)
+        # Applying our noise
+        rng = self.seeds.generator("base_height")
+        val = val + rng.integers(-height_noise, height_noise, size=region_count)
+        val[val <= 0] = 1
 
-            if (val <= 0):
-                val = 1
+        # Applying the rock layer based height modification
+        # Adding the minimum value to help increase variance
+        rock_value = np.sqrt(self.rock_layers.hardness()) + 0.1
+        val = np.round(rock_value * val)
 
-            # Applying the rock layer based height modification
-            rock_value = region.rock_layer.rock_layer_list[0].rock_hardness
-            rock_value = math.sqrt(rock_value)
+        # Making the adjustments a second time
+        val = clamp_elevation(val, land, self.config.water_height_limit).astype(np.int64)
 
-            # Adding the minimum value to help increase variance
-            rock_value = rock_value + 0.1
+        for region, elevation in zip(self.voronoi, val.tolist()):
+            region.elevation = elevation
 
-            val = rock_value * val
-            val = round(val)
+    # Function that weathers away thin land bridges into water tiles
+    # Every pass is a couple of sparse products on the adjacency matrix, the biomes are only touched once at the end
+    def gen_experimental_weathering(self, pass_count=1):
+        self.progress.event("weathering", "Performing experimental weathering", passes=pass_count)
 
-            # Making the adjustments a second time
-            # Limit checking, this will happen twice
-            biome_type = region.biome.land_type
-            if (biome_type == "Water"):
-                # Checking upper/lower bounds
-                if (val > water_height_limit):
-                    val = water_height_limit
-            if (biome_type == "Land"):
-                if (val <= water_height_limit):
-                    val = water_height_limit + 1
+        # Only land tiles with 2 to 4 water neighbors that don't touch each other are weathered (parallel.weathering_kernel)
+        # Weathered tiles are applied at the end of every pass so they dont affect other tiles as we go
+        land = self.land_mask()
+        weathered = land & ~self.stencils().run("weathering", land, pass_count)
+        self.profiler.count("weathered", int(weathered.sum()))
 
-            region.elevation = val
-
-    def gen_experimental_weathering(self):
-        print("Performing experimental weathering")
-
-        adjustment_region_set = []
-
-        for region in self.voronoi:
-
-            # If we are already water, skipping
-            if region.biome.land_type == "Water":
-                continue
-
-            # Iterating on all regions, first checking how many water tiles are adjacent
-            water_count = 0
-            water_list = []
-            water_neighbor_index_list = []
-
-            for neighbor in region.neighbors_index:
-                neighbor_region = self.voronoi[neighbor]
-
-                if neighbor_region.biome.land_type == "Water":
-                    water_count = water_count + 1
-                    water_list.append(neighbor_region)
-                    water_neighbor_index_list.append(neighbor_region.index)
-
-            if water_count < 2 or water_count > 4:
-                continue
-
-            # Checking neighbor adjacency
-            neighbor_count = 0
-
-            for neighbor_region in water_list:
-                # Taking our neighbor regions, their neighbor lists and checking if their index matches anyone else
-
-                neighbor_list = neighbor_region.neighbors_index
-                for nl in neighbor_list:
-                    for wnil in water_neighbor_index_list:
-                        if nl == wnil:
-                            neighbor_count = neighbor_count + 1
-
-                            # Can comment out break for more relaxed neighbor levels
-                            break
-
-            if neighbor_count <= 0:
-                # We have a weathered tile
-                adjustment_region_set.append(region.index)
-
-
-        # Finally doing the final adjustment. At the end so weathering doesnt affect other tiles as we go
-        for index in adjustment_region_set:
+        # Finally doing the final adjustment on the regions themselves
+        for index in np.flatnonzero(weathered).tolist():
             self.voronoi[index].biome.reload_index(1)
 
     # Function for 'building' our oceanic regions
     def build_ocean_regions(self, ocean_reduction_count):
         # This function is desgined to build the oceanic regions
-        print("Building ocean regions")
+        self.progress.event("oceans", "Building ocean regions")
+        rng = self.seeds.generator("oceans")
 
         ocean_set = {}
         for region in self.voronoi:
@@ -1179,7 +869,7 @@ class VoronoiWrapper:
                     deletion_set[region.index] = 1
 
                 # Checking if we are deleting lonesome guys underneath the ocean threshold
-                elif existing_neighbor_flag == 0 and count < ocean_size_threshold:
+                elif existing_neighbor_flag == 0 and count < self.config.ocean_size_threshold:
                     deletion_set[region.index] = 1
 
             for key in deletion_set:
@@ -1190,7 +880,7 @@ class VoronoiWrapper:
                 ocean_set.pop(key)
 
         # Succesful reduction
-        print("Successful oceanic reduction, expanding ocean set (with " + str(len(ocean_set)) + " oceans)")
+        self.progress.event("oceans", "Successful oceanic reduction, expanding ocean set", oceans=len(ocean_set))
 
         # Now to build the oceans by expanding outwards from the core positions
         ocean_obj = []
@@ -1204,7 +894,7 @@ class VoronoiWrapper:
             region.ocean_index = ocean_count
 
             new_ocean = Ocean(ocean_count)
-            new_ocean.color = (random.randrange(0,255), random.randrange(0,255), random.randrange(0,255))
+            new_ocean.color = tuple(rng.integers(0, 255, size=3).tolist())
 
             # Setting the root tile
             new_ocean.root_tile = self.voronoi[tile]
@@ -1219,9 +909,13 @@ class VoronoiWrapper:
         # Now that we've assembled it, lets begin building it...
         # Continuous looping until all ocean sets have been expanded permanently
 
+        expansion_pass = 0
         while 1 == 1:
             # Taking each ocean
             visit_ocean = 0
+            expansion_pass = expansion_pass + 1
+            self.progress.update("oceans", expansion_pass, expansion_pass=expansion_pass)
+            self.profiler.count("expansion_passes")
             for ocean in ocean_obj:
 
                 # print("Expanding ocean " + str(ocean.ocean_index))
@@ -1238,6 +932,7 @@ class VoronoiWrapper:
 
                 did_expand_ocean = 0
                 append_set = []
+                self.profiler.count("regions_visited", len(ocean.region_set))
 
                 # Keeping track of merge status
                 merge_break = 0
@@ -1272,9 +967,7 @@ class VoronoiWrapper:
 
                         # Allowing mergers if our oceans are small enough
                         # Basically will only happen in early stages
-                        elif neighbor.ocean_index > 0 and len(ocean.region_set) < ocean_merge_threshold and neighbor.ocean_index != ocean.ocean_index:
-
-                            print("2 Performing merger on ocean index " + str(neighbor.ocean_index) + " from " + str(ocean.ocean_index))
+                        elif neighbor.ocean_index > 0 and len(ocean.region_set) < self.config.ocean_merge_threshold and neighbor.ocean_index != ocean.ocean_index:
 
                             # Interesting, an ocean tile next to us at a very young age
                             # Lets merge them together
@@ -1319,13 +1012,16 @@ class VoronoiWrapper:
                 break
 
         self.ocean_set = ocean_obj
-        print("Finished expanding base-state oceans. Beginning final stage ocean expansion")
+        self.progress.event("oceans", "Finished expanding base-state oceans. Beginning final stage ocean expansion")
 
         # Finally we want to expand to the final set of tiles that we have
         while 1 == 1:
 
             # Taking each ocean
             visit_ocean = 0
+            expansion_pass = expansion_pass + 1
+            self.progress.update("oceans", expansion_pass, expansion_pass=expansion_pass)
+            self.profiler.count("expansion_passes")
             for ocean in self.ocean_set:
 
                 # print("Expanding ocean " + str(ocean.ocean_index))
@@ -1339,6 +1035,7 @@ class VoronoiWrapper:
 
                 did_expand_ocean = 0
                 append_set = []
+                self.profiler.count("regions_visited", len(ocean.region_set))
                 for tile in ocean.region_set:
 
                     # Iterating on each tile
@@ -1368,9 +1065,7 @@ class VoronoiWrapper:
 
                         # Allowing mergers if our oceans are small enough
                         # Basically will only happen in early stages
-                        elif neighbor.ocean_index > 0 and len(ocean.region_set) < ocean_merge_threshold and neighbor.ocean_index != ocean.ocean_index:
-
-                            print("1 Performing merger on ocean index " + str(neighbor.ocean_index) + " from " + str(ocean.ocean_index))
+                        elif neighbor.ocean_index > 0 and len(ocean.region_set) < self.config.ocean_merge_threshold and neighbor.ocean_index != ocean.ocean_index:
 
                             # Interesting, an ocean tile next to us at a very young age
                             # Lets merge them together
@@ -1406,7 +1101,7 @@ class VoronoiWrapper:
                 break
 
     def oceanic_land_analysis(self, percentage_threshold):
-        print("Beginning land-based analysis")
+        self.progress.event("oceans", "Beginning land-based analysis")
         # Checking how many land neighbors each ocean has
         for ocean_index in self.ocean_set:
 
@@ -1437,6 +1132,7 @@ class VoronoiWrapper:
                 unvisited_water[region.index] = region
 
         # Okay our structure that contains all of the unvisited water tiles is complete
+        water_total = len(unvisited_water)
         # We will continually build fresh water from whats left...
         while len(unvisited_water) > 0:
 
@@ -1522,14 +1218,16 @@ class VoronoiWrapper:
                 if region_index in unvisited_water:
                     unvisited_water.pop(region.index)
 
-            print("Built freshwater ocean")
             self.ocean_set.append(fresh_ocean)
+            self.profiler.count("lakes")
+            self.profiler.count("regions_visited", len(visited_set))
+            self.progress.update("freshwater", water_total - len(unvisited_water), water_total)
 
     # Function that will fix oceanic generation
     # Accomplishes this by deleting all the 'empty' oceans
     def fix_ocean_gen(self):
 
-        print("Fixing ocean set...")
+        self.progress.event("oceans", "Fixing ocean set")
 
         new_ocean_set = {}
         for ocean in self.ocean_set:
@@ -1540,7 +1238,6 @@ class VoronoiWrapper:
                 continue_flag = 1
                 for region in self.voronoi:
                     if region.ocean_index == ocean.ocean_index:
-                        print("Fixed oceanic region with messed up tracking...")
                         ocean.region_set.append(region)
                         continue_flag = 0
 
@@ -1557,7 +1254,8 @@ class VoronoiWrapper:
     # Does this by first generating an planetary tilt and amplitude to make things a little more interesting
     # Also uses a final noise value
     def gen_base_temperature(self, noise, start_noise, oceanic_averaging_count):
-        print("Generating base temperature value set")
+        self.progress.event("temperature", "Generating base temperature value set")
+        rng = self.seeds.generator("temperature")
 
         # Getting start value information to build the temperature gradiant equation
         cycle_middle = self.height / 2
@@ -1567,19 +1265,19 @@ class VoronoiWrapper:
 
             lower_limit = cycle_middle - (cycle_middle * start_noise)
             upper_limit = cycle_middle + (cycle_middle * start_noise)
-            cycle_middle = random.randrange(lower_limit, upper_limit)
+            cycle_middle = int(rng.integers(int(lower_limit), int(upper_limit)))
 
         # Okay we have our middle
         # Now we need to generate the cycle period and the cycle strength
         # Think of it as a sin wave
-        cycle_count = random.randrange( int(100 * temp_lower_cycle_limit), int( 100 * temp_upper_cycle_limit)) / 100
+        cycle_count = int(rng.integers( int(100 * self.config.temp_lower_cycle_limit), int( 100 * self.config.temp_upper_cycle_limit))) / 100
         cycle_width = self.width / cycle_count * 0.2
 
         # Using a cycle height modifier, which is basically half the height of our map
-        cycle_height_modifier = self.height / temp_height_division_factor
-        cycle_amplitude = random.randrange( int(round(temp_lower_amplitude * cycle_height_modifier)), int(round(temp_upper_amplitude * cycle_height_modifier)))
+        cycle_height_modifier = self.height / self.config.temp_height_division_factor
+        cycle_amplitude = int(rng.integers( int(round(self.config.temp_lower_amplitude * cycle_height_modifier)), int(round(self.config.temp_upper_amplitude * cycle_height_modifier))))
 
-        cycle_shift = random.randrange(-self.width, self.width)
+        cycle_shift = int(rng.integers(-self.width, self.width))
 
         # Calculating our maximum and minimum ranges
         # These ranges should really just be the amplitudes
@@ -1594,8 +1292,9 @@ class VoronoiWrapper:
 
         # We have our cycle width and our cycle amplitude
         # Now we will begin our cyclic temperature process
-        print("Beginning cyclic temperature evaluation with following values: " + str(cycle_count) + ", " + str(cycle_width) + ", " + str(cycle_amplitude) + ", " + str(cycle_middle))
-        print("Boundary: " + str(max_lower_distance) + ", " + str(max_upper_distance) + ", max of " + str(max_range))
+        self.progress.event("temperature", "Beginning cyclic temperature evaluation", cycle_count=cycle_count, cycle_width=cycle_width, cycle_amplitude=cycle_amplitude, cycle_middle=cycle_middle, max_range=max_range)
+
+        temp_noise_values = rng.integers(-noise, +noise, size=len(self.voronoi)).tolist()
 
         for region in self.voronoi:
 
@@ -1610,43 +1309,31 @@ class VoronoiWrapper:
 
             # This is our absolute distance
             # We will now build the relative distance
-            random_temp_adjustment = random.randrange(-noise, +noise)
+            random_temp_adjustment = temp_noise_values[region.index]
 
-            relative_distance = (distance / max_range) * temp_base_level
+            relative_distance = (distance / max_range) * self.config.temp_base_level
             relative_distance = relative_distance + random_temp_adjustment
 
             # Checking limits
             if relative_distance < 0:
                 relative_distance = 0
-            elif relative_distance > temp_base_level:
-                relative_distance = temp_base_level
+            elif relative_distance > self.config.temp_base_level:
+                relative_distance = self.config.temp_base_level
 
-            relative_distance = temp_base_level - round(relative_distance)
+            relative_distance = self.config.temp_base_level - round(relative_distance)
             region.relative_normalized_temperature = relative_distance
 
         # Oceans have fairly averaged temperatures, going to do that
-        print("Averaging oceanic temperatures")
-        for count in range(0, oceanic_averaging_count):
-
-            adjustment_set = {}
-            for region in self.voronoi:
+        self.progress.event("temperature", "Averaging oceanic temperatures", passes=oceanic_averaging_count)
+        # Every water region takes the sum of itself and its neighbors over its neighbor count plus the downward trend
+        if oceanic_averaging_count > 0:
+            land = self.land_mask()
+            temperature = np.array([region.relative_normalized_temperature for region in self.voronoi], dtype=np.float64)
+            temperature = self.stencils().run("ocean_temperature", temperature, oceanic_averaging_count,
+                                              static={"land": land}, params={"trend": self.config.ocean_temp_downward_trend})
 
-                if region.biome.land_type == "Land":
-                    continue
-
-                temperature_count = region.relative_normalized_temperature
-                neighbor_count = len(region.neighbors_index)
-
-                for neighbor_index in region.neighbors_index:
-                    temperature_count = temperature_count + self.voronoi[neighbor_index].relative_normalized_temperature
-
-                adjustment_temp = temperature_count / (neighbor_count + ocean_temp_downward_trend)
-
-                # Still keeping some noise
-                adjustment_set[region.index] = adjustment_temp
-
-            for key in adjustment_set:
-                self.voronoi[key].relative_normalized_temperature = adjustment_set[key]
+            for index in np.flatnonzero(~land).tolist():
+                self.voronoi[index].relative_normalized_temperature = float(temperature[index])
 
     # Function that provides the distance from a point to the temperature equator
     def temp_equ_distance(self, cyle_width, cycle_amplitude, cycle_middle, cycle_shift, point):
@@ -1662,7 +1349,13 @@ class VoronoiWrapper:
     # Higher temp = higher humidity
     def gen_humidity_source(self):
 
-        print("Generating humidity source tiles")
+        self.progress.event("humidity", "Generating humidity source tiles")
+
+        # Drawing the random values of every region up front
+        rng = self.seeds.generator("humidity")
+        random_chances = (rng.integers(0, 100000, size=len(self.voronoi)) + self.config.humidity_source_threshold).tolist()
+        random_results = rng.integers(0, self.config.humidity_source_chance[1], size=len(self.voronoi)).tolist()
+
         for region in self.voronoi:
 
             if region.biome.land_type == "Land":
@@ -1681,19 +1374,19 @@ class VoronoiWrapper:
                 region.base_humidity = temp / 10
 
             # Below a certain value we ignore humidity
-            if region.base_humidity < humidity_threshold:
+            if region.base_humidity < self.config.humidity_threshold:
                 region.base_humidity = 0
                 continue
 
             # Deciding if this is going to be a humidity source tile
             humid_chance = temp * temp * temp
-            random_chance = random.randrange(0, 100000) + humidity_source_threshold
+            random_chance = random_chances[region.index]
 
             if humid_chance > random_chance:
 
                 # Lets check its final randomizer
-                random_result = random.randrange(0, humidity_source_chance[1])
-                if random_result <= humidity_source_chance[0]:
+                random_result = random_results[region.index]
+                if random_result <= self.config.humidity_source_chance[0]:
 
                     # We have a humidity source tile!
                     # Upping the humidity of course, and indicating its humidity level
@@ -1712,7 +1405,8 @@ class VoronoiWrapper:
 
     # Function for generating oceanic wind sources
     def gen_oceanic_wind_sources(self):
-        print("Generating oceanic wind source tiles")
+        self.progress.event("winds", "Generating oceanic wind source tiles")
+        rng = self.seeds.generator("ocean_winds")
 
         ocean_base_wind_set = {}
         ocean_wind_set = {}
@@ -1737,8 +1431,8 @@ class VoronoiWrapper:
 
                         # Should be an ocean tile
                         # Lets randomly select if its not
-                        random_select_wind = random.randrange(0,ocean_wind_chance[1])
-                        if random_select_wind > ocean_wind_chance[0]:
+                        random_select_wind = rng.integers(0,self.config.ocean_wind_chance[1])
+                        if random_select_wind > self.config.ocean_wind_chance[0]:
                             continue
 
                         # Mismatching oceanic indexes, must be a wind source here
@@ -1756,7 +1450,7 @@ class VoronoiWrapper:
                             degree = self.get_angle_between_points(ocean_root_alpha, ocean_root_beta)
 
                             # Determine if we are going to use the inverse or normal
-                            random_select = random.randrange(0, 100)
+                            random_select = rng.integers(0, 100)
                             if random_select <= 50:
                                 # Using the inverse
                                 degree = degree - 180
@@ -1765,7 +1459,7 @@ class VoronoiWrapper:
 
                             # Alright we have our degree, putting it within our set
                             # Using some variance here
-                            variance = random.randrange(-ocean_wind_variance, ocean_wind_variance)
+                            variance = int(rng.integers(-self.config.ocean_wind_variance, self.config.ocean_wind_variance))
                             degree = degree + variance
 
                             if degree < 0:
@@ -1785,12 +1479,13 @@ class VoronoiWrapper:
                             ocean_wind_double_check_set[neighbor_index] = 0
 
         self.ocean_wind_set = ocean_wind_set
-        print(ocean_base_wind_set)
+        self.progress.event("winds", "Built oceanic wind sources", sources=len(ocean_wind_set))
 
     # Experimental function for generating oceanic winds...
     # This could get tricky
     def gen_winds(self):
-        print("Generating winds...")
+        self.progress.event("winds", "Generating winds")
+        rng = self.seeds.generator("winds")
 
         # Continuously grow each wind source
         wind_set = {}
@@ -1801,7 +1496,7 @@ class VoronoiWrapper:
 
         # Growing
         val = 0
-        while val < wind_gen_count:
+        while val < self.config.wind_gen_count:
 
             growth_set = {}
             for wind_index in wind_set:
@@ -1810,7 +1505,7 @@ class VoronoiWrapper:
                 if wind.grown:
                     continue
 
-                if wind.strength < wind_strength_limit:
+                if wind.strength < self.config.wind_strength_limit:
                     continue
 
                 # Getting a possible neighbor to select for growth
@@ -1822,8 +1517,8 @@ class VoronoiWrapper:
 
                     # Getting the angle between the two points, checking if it matches the wind degrees
                     angle = self.get_angle_between_points(neighbor.center, wind.region.center)
-                    range_min = wind.direction - wind_range
-                    range_max = wind.direction + wind_range
+                    range_min = wind.direction - self.config.wind_range
+                    range_max = wind.direction + self.config.wind_range
 
                     grow_flag = 0
 
@@ -1857,12 +1552,12 @@ class VoronoiWrapper:
                             elevation_loss = -10
 
                         else:
-                            elevation_loss = elevation * wind_loss_strength
+                            elevation_loss = elevation * self.config.wind_loss_strength
 
                         # Calculating angle difference...
                         wind_difference = abs(int(round(self.get_angular_difference(wind.direction, angle)))) + 2
-                        adjustment = random.randrange(int(round(wind.direction - (wind_difference_factor * wind_difference))),
-                                                      int(round(wind.direction + (wind_difference_factor * wind_difference))))
+                        adjustment = int(rng.integers(int(round(wind.direction - (self.config.wind_difference_factor * wind_difference))),
+                                                      int(round(wind.direction + (self.config.wind_difference_factor * wind_difference)))))
 
                         if adjustment > 360:
                             adjustment = adjustment - 360
@@ -1872,8 +1567,8 @@ class VoronoiWrapper:
                         new_wind_direction = adjustment
 
                         new_wind_strength = wind.strength - elevation_loss
-                        if new_wind_strength < wind_strength_limit:
-                            new_wind_strength = wind_strength_limit - random.randrange(-wind_strength_limit/2, wind_strength_limit/2)
+                        if new_wind_strength < self.config.wind_strength_limit:
+                            new_wind_strength = self.config.wind_strength_limit - int(rng.integers(-self.config.wind_strength_limit // 2, self.config.wind_strength_limit // 2))
 
                         neighbor.is_wind = 1
                         new_wind = Wind(neighbor.index, neighbor, int(round(new_wind_direction)), new_wind_strength)
@@ -1884,6 +1579,7 @@ class VoronoiWrapper:
 
             for wind_growth_index in growth_set:
                 wind_set[growth_set[wind_growth_index]] = growth_set[wind_growth_index]
+            self.profiler.observe("wind_front", len(growth_set))
 
             val = val + 1
 
@@ -1891,14 +1587,15 @@ class VoronoiWrapper:
 
     # Function for fixing regions with duplicate wind values
     def average_remove_wind(self):
-        print("Averaging winds and removing duplicates")
+        self.progress.event("winds", "Averaging winds and removing duplicates")
 
         #TODO: Determine if we should do this
 
     # Function for widening the winds
     # Fills out the rest of the map with wind, basically
     def grow_wind_width(self):
-        print("Growing wind width, filling rest of map with wind basically")
+        self.progress.event("winds", "Growing wind width, filling rest of map with wind basically")
+        rng = self.seeds.generator("wind_width")
 
         growth = 1
         while growth:
@@ -1924,12 +1621,12 @@ class VoronoiWrapper:
                         continue
 
                     elevation = (neighbor.elevation / 100)
-                    elevation_loss = elevation * wind_loss_strength
+                    elevation_loss = elevation * self.config.wind_loss_strength
 
                     new_wind_strength = wind.strength - elevation_loss
-                    if new_wind_strength < wind_strength_limit:
-                        new_wind_strength = wind_strength_limit - random.randrange(-wind_strength_limit / 2,
-                                                                                   wind_strength_limit / 2)
+                    if new_wind_strength < self.config.wind_strength_limit:
+                        new_wind_strength = self.config.wind_strength_limit - int(rng.integers(-self.config.wind_strength_limit // 2,
+                                                                                   self.config.wind_strength_limit // 2))
 
                     # Making this a new windy dude
                     neighbor.is_wind = 1
@@ -1942,6 +1639,7 @@ class VoronoiWrapper:
             for growth_index in growth_set:
                 did_grow = 1
                 self.winds[growth_index] = growth_set[growth_index]
+            self.profiler.observe("wind_front", len(growth_set))
 
             if not did_grow:
                 growth = 0
@@ -2027,12 +1725,8 @@ class VoronoiRegion:
         # Assigning empty values to the neighbors
         copy_region.neighbors_index = self.neighbors_index
 
-        # Constructing a shape list
-        copy_region.shape_list = self.shape_list
-
         # Assigning a deep water biome as default, will be set later hopefully...
         copy_region.biome = self.biome
-        copy_region.rock_layer = self.rock_layer
         copy_region.elevation = self.elevation
         copy_region.ocean_distance = self.ocean_distance
         copy_region.ocean_index = self.ocean_index
@@ -2065,12 +1759,8 @@ class VoronoiRegion:
         # Assigning empty values to the neighbors
         self.neighbors_index = []
 
-        # Constructing a shape list
-        self.shape_list = []
-
         # Assigning a deep water biome as default, will be set later hopefully...
         self.biome = Biome(1)
-        self.rock_layer = RockLayer(defaultRock)
         self.elevation = 0
 
         # Ocean distance
@@ -2099,23 +1789,88 @@ class VoronoiRegion:
 
         self.is_wind = 0
 
-# Helper function for checking if a point is within a polygon
-# Ray tracing
-def check_point_within_polygon(x,y,poly):
-
-    n = len(poly)
-    inside = False
-
-    p1x,p1y = poly[0]
-    for i in range(n+1):
-        p2x,p2y = poly[i % n]
-        if y > min(p1y,p2y):
-            if y <= max(p1y,p2y):
-                if x <= max(p1x,p2x):
-                    if p1y != p2y:
-                        xints = (y-p1y)*(p2x-p1x)/(p2y-p1y)+p1x
-                    if p1x == p2x or x <= xints:
-                        inside = not inside
-        p1x,p1y = p2x,p2y
-
-    return inside
\ No newline at end of file
+# Clamps every vertex of a voronoi diagram into the map, in place
+def clamp_vertices(vertices, width, height):
+    np.clip(vertices[:, 0], 0, width, out=vertices[:, 0])
+    np.clip(vertices[:, 1], 0, height, out=vertices[:, 1])
+
+
+# Vertex index lists of every point of a voronoi diagram, flattened in point order
+# Returns the flat vertex indices (-1 for the vertex at infinity) and the region every entry belongs to
+def point_region_vertices(vor):
+    region_vertices = [vor.regions[region] for region in vor.point_region.tolist()]
+    lengths = np.fromiter((len(region) for region in region_vertices), dtype=np.int64, count=len(region_vertices))
+    flat = np.fromiter(itertools.chain.from_iterable(region_vertices), dtype=np.int64, count=int(lengths.sum()))
+    owner = np.repeat(np.arange(len(region_vertices)), lengths)
+    return flat, owner
+
+
+# Geometry of every region of a voronoi diagram, in point order
+# Returns the edge flags (regions reaching infinity), offsets into the flat array of finite vertices, that array,
+# and every regions center as the mean of its finite vertices
+def region_geometry(vor):
+    region_count = len(vor.point_region)
+    flat, owner = point_region_vertices(vor)
+
+    finite = flat >= 0
+    edge = np.zeros(region_count, dtype=bool)
+    edge[owner[~finite]] = True
+
+    counts = np.bincount(owner[finite], minlength=region_count)
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    coords = vor.vertices[flat[finite]]
+
+    # The vertices are summed one position at a time so every center adds up in the same order as a plain loop would
+    sums = np.zeros((region_count, 2), dtype=np.float64)
+    for position in range(0, int(counts.max()) if region_count else 0):
+        has = counts > position
+        sums[has] += coords[offsets[:-1][has] + position]
+    centers = sums / counts[:, None]
+
+    return edge, offsets, coords, centers
+
+
+# Sparse adjacency matrix of the delaunay triangulation of the points
+# Every triangle contributes its three edges, in both directions
+def delaunay_adjacency(points):
+    points = np.asarray(points, dtype=np.float64)
+    simplices = Delaunay(points).simplices
+    rows = np.concatenate((simplices[:, 0], simplices[:, 1], simplices[:, 2], simplices[:, 1], simplices[:, 2], simplices[:, 0]))
+    cols = np.concatenate((simplices[:, 1], simplices[:, 2], simplices[:, 0], simplices[:, 0], simplices[:, 1], simplices[:, 2]))
+    adjacency = sparse.csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(len(points), len(points)))
+
+    # Shared edges get summed up, we only care whether the two regions touch
+    adjacency.data[:] = 1
+    return adjacency
+
+
+# Helper function for keeping elevations within the limits of their land type
+# Water regions are capped at the water height limit, land regions are kept above it
+def clamp_elevation(elevation, land, water_height_limit):
+    elevation = np.where(~land & (elevation > water_height_limit), water_height_limit, elevation)
+    elevation = np.where(land & (elevation <= water_height_limit), water_height_limit + 1, elevation)
+    return elevation
+
+# Helper function for checking which points are within a polygon, by ray tracing
+# Returns a boolean array telling which of the points (xs[i], ys[i]) are within the polygon
+def points_within_polygon(xs, ys, poly):
+    poly = np.asarray(poly, dtype=np.float64)
+    inside = np.zeros(len(xs), dtype=bool)
+
+    # Casting a ray from every point and flipping for every edge it crosses
+    for p1, p2 in zip(poly, np.roll(poly, -1, axis=0)):
+        p1x, p1y = p1
+        p2x, p2y = p2
+
+        # Horizontal edges are never crossed
+        if p1y == p2y:
+            continue
+
+        crossing = (ys > min(p1y, p2y)) & (ys <= max(p1y, p2y)) & (xs <= max(p1x, p2x))
+        if p1x != p2x:
+            xints = (ys - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
+            crossing &= xs <= xints
+
+        inside ^= crossing
+
+    return inside
@@ -0,0 +1,161 @@
+# Generated worlds as flat arrays
+# A World holds the region columns, mesh and adjacency of a generated world as arrays indexed by region index.
+#
+# Pickling VoronoiWrapper.voronoi means pickling every VoronoiRegion along with its Biome and rock layers, so
+# render and analysis workers get the world as flat arrays in shared memory instead.
+# The parent publishes the world once, every child attaches to it from the small picklable descriptor and reads
+# zero-copy numpy views of the same blocks:
+#
+#   world = SharedWorld.publish(m.v)
+#   pool.map(work, [(world.descriptor(), job) for job in jobs])
+#
+#   def work(args):
+#       with SharedWorld.attach(args[0]) as world:
+#           elevation = world.columns["elevation"]
+#
+# The parent closes the world once every child is done, which frees the blocks.
+import json
+import os
+
+import numpy as np
+from scipy import sparse
+
+from .shared import SharedArray, close_all
+
+# Mesh arrays kept along with the region columns, indexed by region index (vertex_coords by vertex_offsets)
+mesh_arrays = ("points", "centers", "vertex_offsets", "vertex_coords")
+
+# The adjacency matrix is shared as its three csr arrays
+adjacency_arrays = ("adjacency_data", "adjacency_indices", "adjacency_indptr")
+
+
+# The flat arrays of a generated VoronoiWrapper, region columns along with the mesh and adjacency arrays
+def world_arrays(wrapper):
+    adjacency = wrapper.adjacency.tocsr()
+    arrays = {
+        "points": np.asarray(wrapper.random_points, dtype=np.float64),
+        "centers": wrapper.center_array(),
+        "vertex_offsets": wrapper.vertex_offsets,
+        "vertex_coords": wrapper.vertex_coords,
+        "adjacency_data": adjacency.data,
+        "adjacency_indices": adjacency.indices,
+        "adjacency_indptr": adjacency.indptr,
+    }
+    arrays.update(wrapper.region_columns())
+    return arrays
+
+
+# A generated world as flat arrays indexed by region index
+# Everything past generation (tiles, layers, the server) reads worlds through this, whatever holds the arrays
+class World:
+
+    def __init__(self, width, height, arrays):
+        self.width = width
+        self.height = height
+        self.arrays = arrays
+
+        # Region columns are every array that isn't part of the mesh or the adjacency
+        self.columns = {name: array for name, array in arrays.items() if name not in mesh_arrays and name not in adjacency_arrays}
+        self.matrix = None
+
+    # The world of a generated VoronoiWrapper, copying its arrays in process
+    @classmethod
+    def from_wrapper(cls, wrapper):
+        return cls(wrapper.width, wrapper.height, world_arrays(wrapper))
+
+    # Writes the world into a directory, one .npy file per array along with world.json
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name, array in self.arrays.items():
+            np.save(os.path.join(directory, name + ".npy"), np.asarray(array))
+        with open(os.path.join(directory, "world.json"), "w") as file:
+            json.dump({"width": self.width, "height": self.height, "arrays": sorted(self.arrays)}, file, indent=2)
+
+    # Loads a saved world, memory-mapping its arrays by default so only the pages that are read are ever loaded
+    @classmethod
+    def load(cls, directory, mmap=True):
+        with open(os.path.join(directory, "world.json")) as file:
+            meta = json.load(file)
+        mode = "r" if mmap else None
+        arrays = {name: np.load(os.path.join(directory, name + ".npy"), mmap_mode=mode) for name in meta["arrays"]}
+        return cls(meta["width"], meta["height"], arrays)
+
+    def __len__(self):
+        return len(self["centers"])
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    # The finite vertices of one region
+    def vertices(self, index):
+        offsets = self["vertex_offsets"]
+        return self["vertex_coords"][offsets[index]:offsets[index + 1]]
+
+    # The adjacency matrix over the csr arrays, without copying them
+    def adjacency(self):
+        if self.matrix is None:
+            count = len(self)
+            self.matrix = sparse.csr_matrix((self["adjacency_data"], self["adjacency_indices"], self["adjacency_indptr"]), shape=(count, count), copy=False)
+        return self.matrix
+
+    # The neighbors of one region
+    def neighbors(self, index):
+        indptr = self["adjacency_indptr"]
+        return self["adjacency_indices"][indptr[index]:indptr[index + 1]]
+
+    def close(self):
+        self.columns = {}
+        self.matrix = None
+        self.arrays = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# A world whose arrays live in shared memory blocks
+class SharedWorld(World):
+
+    def __init__(self, width, height, shared):
+        self.shared = shared
+        World.__init__(self, width, height, {name: array.array for name, array in shared.items()})
+
+    # Copies the region columns, mesh and adjacency of a generated VoronoiWrapper into shared memory
+    @classmethod
+    def publish(cls, wrapper):
+        shared = {}
+        try:
+            for name, array in world_arrays(wrapper).items():
+                shared[name] = SharedArray.create(array)
+        except BaseException:
+            close_all(shared)
+            raise
+        return cls(wrapper.width, wrapper.height, shared)
+
+    # Attaches to a published world from its descriptor, e.g. within a child process
+    @classmethod
+    def attach(cls, descriptor):
+        shared = {}
+        try:
+            for name, array in descriptor["arrays"].items():
+                shared[name] = SharedArray.attach(array)
+        except BaseException:
+            close_all(shared)
+            raise
+        return cls(descriptor["width"], descriptor["height"], shared)
+
+    # Small picklable description of the world, all a child needs to attach to it
+    def descriptor(self):
+        return {
+            "width": self.width,
+            "height": self.height,
+            "arrays": {name: array.descriptor() for name, array in self.shared.items()},
+        }
+
+    # Drops every view and detaches, the publishing process also frees the blocks
+    def close(self):
+        World.close(self)
+        close_all(self.shared)
+        self.shared = {}